@@ -18,7 +18,7 @@ login_manager.init_app(app)
 oauth.init_app(app)
 mail.init_app(app)
 
-from models import User, Vehicle, Tire, Notification, AlertType, PressureReading, Role
+from models import User, Vehicle, Tire, Notification, AlertType, PressureReading, PressureRollup, Role, DeviceKey, UserAlertCounter, TokenRevocation, EmailOutbox, AlertEvent
 
 # Create schema, tables, and seed data
 with app.app_context():
@@ -27,8 +27,15 @@ with app.app_context():
         db.session.execute(db.text('CREATE SCHEMA IF NOT EXISTS tire_pressure'))
         db.session.commit()
 
-        # Create tables
+        # Create tables, and add the columns older databases are missing
         db.create_all()
+        from services import schema_service
+        schema_service.upgrade()
+
+        # Create upcoming pressure_reading partitions
+        from services import partition_service
+        if partition_service.is_enabled():
+            partition_service.ensure_partitions()
 
         # Seed data
         from db import seed_data
@@ -46,8 +53,16 @@ app.register_blueprint(user_profile_bp)
 app.register_blueprint(tire_bp)
 app.register_blueprint(vehicle_bp)
 app.register_blueprint(notification_bp)
+app.register_blueprint(dashboard_bp)
+app.register_blueprint(event_bp)
 app.register_blueprint(admin_bp, url_prefix='/admin')
 app.register_blueprint(iot_bp, url_prefix='/iot')
 
+# Registering CLI commands
+from commands import readings_cli, emails_cli, schema_cli
+app.cli.add_command(readings_cli)
+app.cli.add_command(emails_cli)
+app.cli.add_command(schema_cli)
+
 if __name__ == '__main__':
     app.run()
\ No newline at end of file
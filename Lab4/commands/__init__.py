@@ -0,0 +1,3 @@
+from commands.readings_commands import readings_cli
+from commands.emails_commands import emails_cli
+from commands.schema_commands import schema_cli
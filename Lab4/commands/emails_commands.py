@@ -0,0 +1,35 @@
+import click
+from flask.cli import AppGroup
+
+emails_cli = AppGroup('emails', help='Transactional email outbox commands.')
+
+
+@emails_cli.command('send')
+def send_emails() -> None:
+    """
+    Send all due emails of the outbox now and exit.
+
+    Useful against a local debugging SMTP server, or when no worker is running.
+    """
+    from services import email_outbox
+
+    total = 0
+    while attempted := email_outbox.send_due():
+        total += attempted
+    metrics = email_outbox.get_metrics()
+    click.echo(f"Attempted {total} emails: {metrics['sent']} sent, {metrics['retried']} to retry, "
+               f"{metrics['failed']} failed.")
+
+
+@emails_cli.command('purge')
+@click.option('--days', default=30, show_default=True, help='Keep sent and failed emails this many days.')
+def purge_emails(days: int) -> None:
+    """
+    Delete old sent and failed emails from the outbox.
+
+    Meant to run from cron, e.g. daily.
+    """
+    from services import email_outbox
+
+    deleted = email_outbox.purge(days)
+    click.echo(f"Deleted {deleted} emails.")
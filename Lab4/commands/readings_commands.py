@@ -0,0 +1,353 @@
+import csv
+import gzip
+import io
+import json
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from db import db
+from utils import Validator
+
+readings_cli = AppGroup('readings', help='Pressure reading maintenance commands.')
+
+
+@readings_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'ndjson']),
+              help='Input format, detected from the file extension by default.')
+@click.option('--chunk-size', default=50000, show_default=True,
+              help='Rows sent per COPY chunk; bounds memory use.')
+def import_readings(path: str, file_format: str | None, chunk_size: int) -> None:
+    """
+    Bulk-load historical readings from a CSV or NDJSON file (optionally .gz).
+
+    Every record needs sensor_code, pressure_value, pressure_unit and
+    measured_at. Rows are converted to the tire's unit and streamed into
+    pressure_reading with COPY in one transaction. Afterwards each affected
+    tire's last-reading snapshot and current_alert_type are recomputed from
+    its newest reading and its rollups are rebuilt.
+    """
+    from models import Tire, PressureReading
+    from services import rollup_service
+
+    if file_format is None:
+        file_format = 'ndjson' if path.removesuffix('.gz').endswith(('.ndjson', '.jsonl')) else 'csv'
+
+    tires = {
+        code: (tire_id, unit)
+        for code, tire_id, unit in db.session.query(Tire.sensor_code, Tire.tire_id, Tire.pressure_unit)
+    }
+
+    copy_sql = (
+        f"COPY {PressureReading.__table__.fullname} (reading_id, tire_id, pressure_value, created_at) "
+        f"FROM STDIN WITH (FORMAT csv)"
+    )
+    connection = db.engine.raw_connection()
+    imported, rejected = 0, 0
+    affected_tires = set()
+    try:
+        cursor = connection.cursor()
+        chunk = io.StringIO()
+        chunk_rows = 0
+        chunk_timestamps = set()
+        for line_number, record in _read_records(path, file_format):
+            try:
+                tire_id, pressure_value, measured_at = _convert_record(record, tires)
+            except ValueError as ve:
+                rejected += 1
+                if rejected <= 20:
+                    click.echo(f"Line {line_number}: {str(ve)}", err=True)
+                continue
+
+            chunk.write(f"{uuid.uuid4()},{tire_id},{pressure_value:.2f},{measured_at.isoformat()}\n")
+            chunk_rows += 1
+            chunk_timestamps.add(measured_at)
+            affected_tires.add(tire_id)
+
+            if chunk_rows >= chunk_size:
+                imported += _copy_chunk(cursor, copy_sql, chunk, chunk_timestamps)
+                chunk, chunk_rows, chunk_timestamps = io.StringIO(), 0, set()
+                click.echo(f"Imported {imported} readings...")
+
+        if chunk_rows:
+            imported += _copy_chunk(cursor, copy_sql, chunk, chunk_timestamps)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    refresh_snapshots(affected_tires)
+    updated = recompute_alert_types(affected_tires)
+    rollups = rollup_service.rebuild(affected_tires) if affected_tires else 0
+    click.echo(
+        f"Imported {imported} readings, rejected {rejected}, updated alert type of {updated} tires, "
+        f"wrote {rollups} rollup rows."
+    )
+
+
+@readings_cli.command('export')
+@click.argument('output', type=click.Path(dir_okay=False, writable=True))
+@click.option('--format', 'file_format', type=click.Choice(['csv.gz', 'arrow', 'parquet']),
+              help='Output format, detected from the file extension by default.')
+@click.option('--tire', 'tire_id', type=click.UUID, help='Export one tire.')
+@click.option('--vehicle', 'vehicle_id', type=click.UUID, help='Export one vehicle.')
+@click.option('--user', 'user_id', type=click.UUID, help='Export one user.')
+@click.option('--from', 'from_at', help='ISO 8601 timestamp, inclusive lower bound.')
+@click.option('--to', 'to_at', help='ISO 8601 timestamp, exclusive upper bound.')
+@click.option('--batch-size', default=50000, show_default=True, help='Rows fetched per cursor batch.')
+def export_readings(output: str, file_format: str | None, tire_id, vehicle_id, user_id,
+                    from_at: str | None, to_at: str | None, batch_size: int) -> None:
+    """
+    Export readings to a CSV.gz, Arrow IPC stream or Parquet file.
+
+    Without --tire, --vehicle or --user every reading is exported. Arrow and
+    Parquet need pyarrow.
+    """
+    from services import export_service
+
+    if file_format is None:
+        file_format = next(
+            (name for name, (extension, _) in export_service.FORMATS.items() if output.endswith('.' + extension)),
+            'csv.gz'
+        )
+    try:
+        export_service.check_format(file_format)
+        from_at, to_at = Validator.validate_timestamp(from_at), Validator.validate_timestamp(to_at)
+    except ValueError as ve:
+        raise click.ClickException(str(ve))
+
+    batches = export_service.open_batches(user_id=user_id, tire_id=tire_id, vehicle_id=vehicle_id,
+                                          from_at=from_at, to_at=to_at, batch_rows=batch_size)
+    size = 0
+    with open(output, 'wb') as file:
+        for chunk in export_service.encode(file_format, batches):
+            file.write(chunk)
+            size += len(chunk)
+    click.echo(f"Wrote {size} bytes to {output} ({file_format}).")
+
+
+@readings_cli.command('rebuild-rollups')
+@click.option('--tire', 'tire_ids', multiple=True, type=click.UUID, help='Tire to rebuild; repeatable (default: all).')
+@click.option('--since', help='ISO 8601 date; only buckets from that UTC day on are rebuilt.')
+def rebuild_rollups(tire_ids: tuple, since: str | None) -> None:
+    """
+    Recompute the minute/hour/day rollups from raw readings.
+
+    Needed after loading readings outside the API, or to repair rollups.
+    """
+    from services import rollup_service
+
+    try:
+        since_at = Validator.validate_timestamp(since)
+    except ValueError as ve:
+        raise click.BadParameter(str(ve), param_hint='--since')
+
+    written = rollup_service.rebuild(list(tire_ids) or None, since_at)
+    click.echo(f"Wrote {written} rollup rows.")
+
+
+@readings_cli.command('refresh-snapshots')
+@click.option('--tire', 'tire_ids', multiple=True, type=click.UUID, help='Tire to refresh; repeatable (default: all).')
+def refresh_snapshots_command(tire_ids: tuple) -> None:
+    """
+    Backfill or repair the last-reading snapshot columns of tires.
+
+    Run once after adding the columns to an existing database, and after
+    deleting readings or dropping partitions by hand.
+    """
+    refreshed = refresh_snapshots(list(tire_ids) or None)
+    click.echo(f"Refreshed the last-reading snapshot of {refreshed} tires.")
+
+
+@readings_cli.command('rebuild-alert-counters')
+@click.option('--user', 'user_ids', multiple=True, type=click.UUID, help='User to rebuild; repeatable (default: all).')
+def rebuild_alert_counters(user_ids: tuple) -> None:
+    """
+    Recompute the per-user tires-per-alert-type counters from tire.current_alert_type.
+
+    Run once after adding the table to an existing database, or to repair drift.
+    """
+    from services import alert_counters
+
+    written = alert_counters.rebuild(list(user_ids) or None)
+    click.echo(f"Wrote {written} alert counter rows.")
+
+
+@readings_cli.command('dispatch-alerts')
+def dispatch_alerts() -> None:
+    """
+    Turn all undispatched alert events into notifications now and exit.
+
+    Workers do this in the background; useful after a bulk load or when no worker is running.
+    """
+    from services import alert_dispatcher
+
+    total = 0
+    while dispatched := alert_dispatcher.dispatch():
+        total += dispatched
+    click.echo(f"Dispatched {total} alert events.")
+
+
+@readings_cli.command('purge-alert-events')
+@click.option('--days', default=7, show_default=True, help='Keep dispatched alert events this many days.')
+def purge_alert_events(days: int) -> None:
+    """
+    Delete old dispatched alert events; their notifications are kept.
+
+    Meant to run from cron, e.g. daily.
+    """
+    from services import alert_dispatcher
+
+    deleted = alert_dispatcher.purge(datetime.now(timezone.utc) - timedelta(days=days))
+    click.echo(f"Deleted {deleted} alert events.")
+
+
+@readings_cli.command('partitions')
+@click.option('--ahead', type=int, help='Future months to create (default: PARTITION_MONTHS_AHEAD).')
+@click.option('--retention', type=int, help='Months of history to keep (default: READING_RETENTION_MONTHS).')
+@click.option('--detach', is_flag=True, help='Detach expired partitions instead of dropping them.')
+def maintain_partitions(ahead: int | None, retention: int | None, detach: bool) -> None:
+    """
+    Create upcoming monthly partitions and remove expired ones.
+
+    Meant to run from cron, e.g. daily.
+    """
+    from services import partition_service
+
+    if not partition_service.is_enabled():
+        raise click.ClickException("PRESSURE_READING_PARTITIONED is not enabled.")
+
+    created = partition_service.ensure_partitions(ahead)
+    click.echo(f"Partitions ensured: {', '.join(created)}")
+
+    removed = partition_service.apply_retention(retention, detach)
+    action = 'Detached' if detach else 'Dropped'
+    click.echo(f"{action} {len(removed)} expired partitions{': ' + ', '.join(removed) if removed else ''}")
+
+
+def refresh_snapshots(tire_ids=None) -> int:
+    """
+    Recompute the last-reading snapshot of tires from their newest stored reading.
+
+    Tires without readings get an empty snapshot.
+
+    Args:
+        tire_ids: Tires to refresh (default: all)
+
+    Returns:
+        int: Number of tires whose snapshot changed
+    """
+    scope, params = "", {}
+    if tire_ids is not None:
+        scope = "WHERE tire.tire_id = ANY(:tire_ids)"
+        params['tire_ids'] = list(tire_ids)
+
+    result = db.session.execute(db.text(f"""
+        UPDATE tire_pressure.tire AS t
+        SET last_pressure_value = latest.pressure_value,
+            last_reading_at = latest.created_at,
+            last_reading_id = latest.reading_id
+        FROM (
+            SELECT tire.tire_id, newest.reading_id, newest.pressure_value, newest.created_at
+            FROM tire_pressure.tire
+            LEFT JOIN LATERAL (
+                SELECT r.reading_id, r.pressure_value, r.created_at
+                FROM tire_pressure.pressure_reading r
+                WHERE r.tire_id = tire.tire_id
+                ORDER BY r.created_at DESC, r.reading_id DESC
+                LIMIT 1
+            ) newest ON TRUE
+            {scope}
+        ) latest
+        WHERE t.tire_id = latest.tire_id
+          AND t.last_reading_id IS DISTINCT FROM latest.reading_id
+    """), params)
+    db.session.commit()
+    return result.rowcount
+
+
+def recompute_alert_types(tire_ids) -> int:
+    """
+    Set current_alert_type of the given tires from their last-reading snapshot.
+
+    No notifications are sent; this is meant for backfilled history.
+
+    Returns:
+        int: Number of tires whose alert type changed
+    """
+    from models import Tire, Vehicle
+    from services import reference_cache, alert_counters, alert_hysteresis
+
+    if not tire_ids:
+        return 0
+
+    updated = 0
+    deltas = Counter()
+    tires = db.session.query(Tire, Vehicle.user_id) \
+        .join(Vehicle) \
+        .filter(Tire.tire_id.in_(tire_ids), Tire.last_pressure_value.isnot(None)) \
+        .all()
+    for tire, user_id in tires:
+        alert = reference_cache.classify_deviation(float(tire.last_pressure_value) / float(tire.optimal_pressure))
+        if alert and alert.alert_type != tire.current_alert_type:
+            alert_counters.track_change(deltas, user_id, tire.current_alert_type, alert.alert_type)
+            tire.current_alert_type = alert.alert_type
+            alert_hysteresis.reset(tire)
+            updated += 1
+
+    alert_counters.apply(deltas)
+    db.session.commit()
+    return updated
+
+
+def _read_records(path: str, file_format: str):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as file:
+        if file_format == 'csv':
+            # Header is line 1
+            for line_number, record in enumerate(csv.DictReader(file), start=2):
+                yield line_number, record
+        else:
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError:
+                    yield line_number, None
+
+
+def _convert_record(record: dict | None, tires: dict) -> tuple:
+    if not isinstance(record, dict):
+        raise ValueError("Malformed record")
+
+    Validator.validate_required_fields(record, ['sensor_code', 'pressure_value', 'pressure_unit', 'measured_at'])
+    tire = tires.get(str(record['sensor_code']).strip().upper())
+    if not tire:
+        raise ValueError(f"Unknown sensor code '{record['sensor_code']}'")
+
+    tire_id, tire_unit = tire
+    pressure_value = Validator.validate_pressure(record['pressure_value'], record['pressure_unit'], tire_unit)
+    measured_at = Validator.validate_timestamp(record['measured_at'])
+    # History has no age limit, but nothing can have been measured in the future
+    Validator.validate_timestamp_window(
+        measured_at, max_ahead=timedelta(seconds=current_app.config['READING_MAX_CLOCK_SKEW_SECONDS'])
+    )
+    return tire_id, pressure_value, measured_at
+
+
+def _copy_chunk(cursor, copy_sql: str, chunk: io.StringIO, timestamps: set) -> int:
+    from services import partition_service
+
+    # Created on the import connection itself; another connection would wait on our COPY locks
+    if partition_service.is_enabled():
+        for month in sorted(partition_service.months_of(timestamps)):
+            cursor.execute(partition_service.create_partition_sql(month))
+    chunk.seek(0)
+    cursor.copy_expert(copy_sql, chunk)
+    return cursor.rowcount
@@ -0,0 +1,36 @@
+import click
+from flask.cli import AppGroup
+
+schema_cli = AppGroup('schema', help='Database schema maintenance commands.')
+
+
+@schema_cli.command('upgrade')
+@click.option('--backfill/--no-backfill', default=True, show_default=True,
+              help='Fill the added tire snapshot columns, rollups and alert counters from existing data.')
+def upgrade_schema(backfill: bool) -> None:
+    """
+    Upgrade a database created by an older version of the application.
+
+    db.create_all() creates missing tables but never alters existing ones.
+    This adds the missing columns, the (tire_id, message_id) unique
+    constraint and the reading index, then backfills derived data:
+
+    \b
+      flask schema upgrade
+
+    The app applies the same schema changes at startup, but does not
+    backfill; run this once during the upgrade, ideally before starting the
+    new version. Adding the constraint and index locks pressure_reading
+    against writes while they build.
+    """
+    from services import schema_service, rollup_service, alert_counters
+    from commands.readings_commands import refresh_snapshots
+
+    changes = schema_service.upgrade()
+    click.echo(f"Schema: {', '.join(changes) if changes else 'up to date'}.")
+    if not backfill:
+        return
+
+    click.echo(f"Refreshed the last-reading snapshot of {refresh_snapshots()} tires.")
+    click.echo(f"Wrote {rollup_service.rebuild()} rollup rows.")
+    click.echo(f"Wrote {alert_counters.rebuild()} alert counter rows.")
@@ -11,11 +11,116 @@ class Config:
     DEBUG = True
 
     FORCE_DB_RESET = os.getenv('FORCE_DB_RESET', 'False').lower() == 'true'
+
+    # Authenticated principals (user_id, role, email_confirmed) cached per worker
+    PRINCIPAL_CACHE_TTL = int(os.getenv('PRINCIPAL_CACHE_TTL', '60'))
+    PRINCIPAL_CACHE_SIZE = int(os.getenv('PRINCIPAL_CACHE_SIZE', '10000'))
+
+    # JWT lifetimes and how often each worker reloads the revocation list
+    ACCESS_TOKEN_TTL = int(os.getenv('ACCESS_TOKEN_TTL', '900'))
+    REFRESH_TOKEN_TTL = int(os.getenv('REFRESH_TOKEN_TTL', str(30 * 24 * 3600)))
+    TOKEN_REVOCATION_REFRESH_SECONDS = int(os.getenv('TOKEN_REVOCATION_REFRESH_SECONDS', '30'))
+    # Alert types and roles are cached per worker; changes to those rows are picked up within this interval
+    REFERENCE_CACHE_REFRESH_SECONDS = int(os.getenv('REFERENCE_CACHE_REFRESH_SECONDS', '60'))
+
+    # Password hashing runs on a process pool per worker (0 workers: inline);
+    # hashes made with another method are upgraded on the next login
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', '16'))
+    PASSWORD_HASH_TIMEOUT = int(os.getenv('PASSWORD_HASH_TIMEOUT', '10'))
+    PASSWORD_HASH_RETRY_AFTER = int(os.getenv('PASSWORD_HASH_RETRY_AFTER', '2'))
+
+    # IoT ingestion
+    IOT_BATCH_MAX_SIZE = int(os.getenv('IOT_BATCH_MAX_SIZE', '500'))
+    DEVICE_KEY_CACHE_TTL = int(os.getenv('DEVICE_KEY_CACHE_TTL', '300'))
+    IOT_STREAM_BATCH_SIZE = int(os.getenv('IOT_STREAM_BATCH_SIZE', '200'))
+    IOT_STREAM_MAX_LINE = int(os.getenv('IOT_STREAM_MAX_LINE', '65536'))
+
+    # Recently stored (tire_id, message_id) keys remembered to drop sensor retries early
+    DEDUP_CACHE_SIZE = int(os.getenv('DEDUP_CACHE_SIZE', '100000'))
+    DEDUP_WINDOW_SECONDS = int(os.getenv('DEDUP_WINDOW_SECONDS', '3600'))
+    # Bounds of a reading's measured_at: device clock skew tolerated ahead of server time, and maximum
+    # age (0 = no limit; keep it within READING_RETENTION_MONTHS when retention is enabled)
+    READING_MAX_CLOCK_SKEW_SECONDS = int(os.getenv('READING_MAX_CLOCK_SKEW_SECONDS', '300'))
+    READING_MAX_AGE_DAYS = int(os.getenv('READING_MAX_AGE_DAYS', '90'))
+
+    # Deadband filtering: readings that barely move are not stored, only heartbeat ones
+    DEADBAND_ENABLED = os.getenv('DEADBAND_ENABLED', 'False').lower() == 'true'
+    DEADBAND_ABSOLUTE = float(os.getenv('DEADBAND_ABSOLUTE', '0.05'))
+    DEADBAND_PERCENT = float(os.getenv('DEADBAND_PERCENT', '1.0'))
+    DEADBAND_HEARTBEAT_SECONDS = int(os.getenv('DEADBAND_HEARTBEAT_SECONDS', '900'))
+
+    # Monthly range partitioning of pressure_reading (applies to newly created tables). Partitions are
+    # created at startup and by `flask readings partitions` (run daily); other months go to a DEFAULT partition
+    PRESSURE_READING_PARTITIONED = os.getenv('PRESSURE_READING_PARTITIONED', 'False').lower() == 'true'
+    PARTITION_MONTHS_AHEAD = int(os.getenv('PARTITION_MONTHS_AHEAD', '3'))
+    READING_RETENTION_MONTHS = int(os.getenv('READING_RETENTION_MONTHS', '0'))
+
+    # Reading history pages (keyset pagination)
+    HISTORY_PAGE_SIZE = int(os.getenv('HISTORY_PAGE_SIZE', '100'))
+    HISTORY_MAX_PAGE_SIZE = int(os.getenv('HISTORY_MAX_PAGE_SIZE', '1000'))
+
+    # Rows serialized per chunk of a streamed JSON response
+    STREAM_CHUNK_ROWS = int(os.getenv('STREAM_CHUNK_ROWS', '500'))
+
+    # Rows fetched per server-side cursor batch when exporting readings
+    EXPORT_BATCH_ROWS = int(os.getenv('EXPORT_BATCH_ROWS', '50000'))
+
+    # Window of /tire/stats and /vehicle/stats when no 'from' is given
+    STATS_DEFAULT_DAYS = int(os.getenv('STATS_DEFAULT_DAYS', '30'))
+
+    # Slow-leak prediction: exponentially weighted trend toward low_pressure_critical
+    LEAK_HALF_LIFE_HOURS = float(os.getenv('LEAK_HALF_LIFE_HOURS', '72'))
+    LEAK_MIN_WEIGHT = float(os.getenv('LEAK_MIN_WEIGHT', '5'))
+    LEAK_MIN_SPAN_HOURS = float(os.getenv('LEAK_MIN_SPAN_HOURS', '2'))
+    LEAK_HORIZON_HOURS = float(os.getenv('LEAK_HORIZON_HOURS', '72'))
+
+    # Resolution=auto picks the coarsest rollup giving at least this many points
+    ROLLUP_TARGET_POINTS = int(os.getenv('ROLLUP_TARGET_POINTS', '200'))
+
+    # Alert hysteresis: a tire leaves its alert type only once readings are outside its band
+    # widened by ALERT_HYSTERESIS_MARGIN (a deviation ratio) for ALERT_CONFIRM_READINGS
+    # consecutive readings or ALERT_CONFIRM_SECONDS (0: readings only); escalations to
+    # ALERT_IMMEDIATE_SEVERITY or above apply at once. Margin 0 and 1 reading disable it.
+    ALERT_HYSTERESIS_MARGIN = float(os.getenv('ALERT_HYSTERESIS_MARGIN', '0.02'))
+    ALERT_CONFIRM_READINGS = int(os.getenv('ALERT_CONFIRM_READINGS', '3'))
+    ALERT_CONFIRM_SECONDS = int(os.getenv('ALERT_CONFIRM_SECONDS', '300'))
+    ALERT_IMMEDIATE_SEVERITY = int(os.getenv('ALERT_IMMEDIATE_SEVERITY', '2'))
+
+    # Alert events are turned into notifications by a background dispatcher per worker
+    ALERT_DISPATCH_INTERVAL_MS = int(os.getenv('ALERT_DISPATCH_INTERVAL_MS', '1000'))
+    ALERT_DISPATCH_BATCH_SIZE = int(os.getenv('ALERT_DISPATCH_BATCH_SIZE', '500'))
+
+    # Server-sent events (/events): each open stream occupies a worker thread, so run
+    # threaded workers (e.g. gunicorn --threads) sized for SSE_MAX_CONNECTIONS per worker
+    EVENTS_ENABLED = os.getenv('EVENTS_ENABLED', 'True').lower() == 'true'
+    SSE_MAX_CONNECTIONS = int(os.getenv('SSE_MAX_CONNECTIONS', '50'))
+    SSE_HEARTBEAT_SECONDS = int(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+    SSE_QUEUE_SIZE = int(os.getenv('SSE_QUEUE_SIZE', '1000'))
+    SSE_RESUME_LIMIT = int(os.getenv('SSE_RESUME_LIMIT', '1000'))
+    SSE_RETRY_MS = int(os.getenv('SSE_RETRY_MS', '3000'))
+
+    # Write-behind ingestion: readings are queued and bulk-inserted by a background flusher
+    INGEST_BUFFER_ENABLED = os.getenv('INGEST_BUFFER_ENABLED', 'False').lower() == 'true'
+    INGEST_BUFFER_CAPACITY = int(os.getenv('INGEST_BUFFER_CAPACITY', '10000'))
+    INGEST_FLUSH_INTERVAL_MS = int(os.getenv('INGEST_FLUSH_INTERVAL_MS', '500'))
+    INGEST_FLUSH_MAX_ROWS = int(os.getenv('INGEST_FLUSH_MAX_ROWS', '500'))
     
-    # Email configuration
-    MAIL_SERVER = 'smtp.gmail.com'
-    MAIL_PORT = 587
-    MAIL_USE_TLS = True
+    # Transactional emails are queued in email_outbox and sent by a background thread per worker
+    EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv('EMAIL_OUTBOX_POLL_SECONDS', '5'))
+    EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', '50'))
+    EMAIL_MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', '8'))
+    EMAIL_RETRY_BASE_SECONDS = int(os.getenv('EMAIL_RETRY_BASE_SECONDS', '30'))
+    EMAIL_RETRY_MAX_SECONDS = int(os.getenv('EMAIL_RETRY_MAX_SECONDS', '3600'))
+    # Same template to the same recipient is not queued again within this window
+    EMAIL_THROTTLE_SECONDS = int(os.getenv('EMAIL_THROTTLE_SECONDS', '300'))
+
+    # Email configuration (e.g. MAIL_SERVER=localhost MAIL_PORT=1025 MAIL_USE_TLS=False
+    # against a local debugging SMTP server)
+    MAIL_SERVER = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
+    MAIL_PORT = int(os.getenv('MAIL_PORT', '587'))
+    MAIL_USE_TLS = os.getenv('MAIL_USE_TLS', 'True').lower() == 'true'
     MAIL_USERNAME = os.getenv('MAIL_USERNAME')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_SENDER_NAME'), os.getenv('MAIL_DEFAULT_SENDER')
\ No newline at end of file
@@ -86,6 +86,9 @@ def seed_data(force: bool = False) -> None:
                 db.session.add(alert)
             db.session.commit()
 
+        from services import reference_cache
+        reference_cache.invalidate()
+
         print("Database seeded successfully")
     except Exception as e:
         db.session.rollback()
@@ -4,4 +4,10 @@ from models.vehicle_model import Vehicle
 from models.alert_type_model import AlertType
 from models.tire_model import Tire
 from models.pressure_reading_model import PressureReading
+from models.pressure_rollup_model import PressureRollup
 from models.notification_model import Notification
+from models.alert_event_model import AlertEvent
+from models.device_key_model import DeviceKey
+from models.user_alert_counter_model import UserAlertCounter
+from models.token_revocation_model import TokenRevocation
+from models.email_outbox_model import EmailOutbox
@@ -0,0 +1,32 @@
+from db import db
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+
+class AlertEvent(db.Model):
+    """
+    Outbox of tire alert events, written in the transaction that changes the tire state.
+
+    The alert dispatcher turns undispatched events into notifications and
+    other deliveries in batches, outside the ingest request. The increasing
+    event_id orders events for consumers.
+    """
+    __tablename__ = 'alert_event'
+    __table_args__ = (
+        db.Index('ix_alert_event_undispatched', 'event_id', postgresql_where=db.text('dispatched_at IS NULL')),
+        db.Index('ix_alert_event_user', 'user_id', 'event_id'),
+    )
+
+    event_id = db.Column(db.BigInteger, db.Identity(), primary_key=True)
+    tire_id = db.Column(UUID(as_uuid=True), db.ForeignKey('tire.tire_id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('user.user_id', ondelete='CASCADE'), nullable=False)
+    event_type = db.Column(db.String(30), nullable=False)
+    old_alert_type = db.Column(db.String(50))
+    new_alert_type = db.Column(db.String(50))
+    payload = db.Column(JSONB, nullable=False, default=dict)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
+    dispatched_at = db.Column(db.DateTime(timezone=True))
+    # Notification materialized from the event, if any
+    notification_id = db.Column(UUID(as_uuid=True), db.ForeignKey('notification.notification_id', ondelete='SET NULL'))
+
+    notification = db.relationship('Notification')
@@ -0,0 +1,162 @@
+from db import db
+from sqlalchemy.dialects.postgresql import UUID
+import uuid, secrets
+from sqlalchemy.sql import func
+from flask import jsonify, Response
+from utils import ErrorHandler, Validator
+from models.vehicle_model import Vehicle
+
+
+class DeviceKey(db.Model):
+    __tablename__ = 'device_key'
+
+    key_id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    vehicle_id = db.Column(UUID(as_uuid=True), db.ForeignKey('vehicle.vehicle_id', ondelete='CASCADE'), nullable=False)
+    label = db.Column(db.String(100))
+    key_hash = db.Column(db.String(64), nullable=False)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
+    revoked_at = db.Column(db.DateTime(timezone=True))
+
+    vehicle = db.relationship('Vehicle', back_populates='device_keys')
+
+
+    @classmethod
+    def issue_key(cls, user_id: str, data: dict) -> tuple[Response, int]:
+        """
+        Issue a gateway key for a vehicle. The plain key is returned only once.
+
+        Args:
+            user_id: UUID of the user
+            data: {
+                'vehicle_id': UUID of the vehicle,
+                'label': str  # Optional
+            }
+
+        Returns:
+            tuple: (JSON response, HTTP status code)
+        """
+        try:
+            from services.device_auth_service import hash_secret
+
+            Validator.validate_required_fields(data, ['vehicle_id'])
+
+            vehicle = Vehicle.query.get(uuid.UUID(data['vehicle_id']))
+            if not vehicle:
+                return ErrorHandler.handle_error(
+                    None,
+                    message=f"Vehicle {data['vehicle_id']} not found",
+                    status_code=404
+                )
+
+            # Check if the vehicle belongs to the user
+            if vehicle.user_id != user_id:
+                return jsonify({"error": "Forbidden: You do not own this vehicle"}), 403
+
+            secret = secrets.token_urlsafe(32)
+            device_key = cls(
+                key_id=uuid.uuid4(),
+                vehicle_id=vehicle.vehicle_id,
+                label=(data.get('label') or '').strip() or None,
+                key_hash=hash_secret(secret)
+            )
+
+            db.session.add(device_key)
+            db.session.commit()
+
+            return jsonify({
+                "message": "Device key issued successfully. Store it now, it will not be shown again",
+                "key_id": str(device_key.key_id),
+                "device_key": f"{device_key.key_id}.{secret}"
+            }), 201
+
+        except ValueError as ve:
+            db.session.rollback()
+            return ErrorHandler.handle_validation_error(str(ve))
+        except Exception as e:
+            db.session.rollback()
+            return ErrorHandler.handle_error(e, "Failed to issue device key"), 500
+
+
+    @classmethod
+    def get_vehicle_keys(cls, user_id: str, vehicle_id: str) -> tuple[Response, int]:
+        """
+        Get all device keys issued for a vehicle (without secrets).
+
+        Args:
+            user_id: UUID of the user
+            vehicle_id: UUID of the vehicle
+
+        Returns:
+            tuple: (JSON response, HTTP status code)
+        """
+        try:
+            vehicle = Vehicle.query.get(uuid.UUID(vehicle_id))
+            if not vehicle:
+                return ErrorHandler.handle_error(
+                    None,
+                    message=f"Vehicle {vehicle_id} not found",
+                    status_code=404
+                )
+
+            # Check if the vehicle belongs to the user
+            if vehicle.user_id != user_id:
+                return jsonify({"error": "Forbidden: You do not own this vehicle"}), 403
+
+            keys = cls.query.filter_by(vehicle_id=vehicle.vehicle_id).order_by(cls.created_at).all()
+
+            keys_data = [{
+                "key_id": str(k.key_id),
+                "label": k.label,
+                "created_at": k.created_at.isoformat(),
+                "revoked_at": k.revoked_at.isoformat() if k.revoked_at else None
+            } for k in keys]
+
+            return jsonify({"device_keys": keys_data}), 200
+
+        except ValueError as ve:
+            return ErrorHandler.handle_validation_error(str(ve))
+        except Exception as e:
+            return ErrorHandler.handle_error(e, "Failed to get device keys"), 500
+
+
+    @classmethod
+    def revoke_key(cls, user_id: str, key_id: str) -> tuple[Response, int]:
+        """
+        Revoke a device key.
+
+        Args:
+            user_id: UUID of the user
+            key_id: UUID of the device key
+
+        Returns:
+            tuple: (JSON response, HTTP status code)
+        """
+        try:
+            from services.device_auth_service import evict_key
+
+            device_key = cls.query.get(uuid.UUID(key_id))
+            if not device_key:
+                return ErrorHandler.handle_error(
+                    None,
+                    message=f"Device key {key_id} not found",
+                    status_code=404
+                )
+
+            # Check if the vehicle belongs to the user
+            if device_key.vehicle.user_id != user_id:
+                return jsonify({"error": "Forbidden: You do not own this device key"}), 403
+
+            if not device_key.revoked_at:
+                device_key.revoked_at = func.now()
+                db.session.commit()
+
+            evict_key(key_id)
+
+            return jsonify({"message": f"Device key {key_id} revoked successfully"}), 200
+
+        except ValueError as ve:
+            db.session.rollback()
+            return ErrorHandler.handle_validation_error(str(ve))
+        except Exception as e:
+            db.session.rollback()
+            return ErrorHandler.handle_error(e, "Failed to revoke device key"), 500
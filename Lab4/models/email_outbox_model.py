@@ -0,0 +1,32 @@
+from db import db
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from sqlalchemy.sql import func
+
+
+class EmailOutbox(db.Model):
+    """
+    A transactional email waiting to be sent, or the record of one that was.
+
+    Bodies are cleared once the email is sent, since they may contain
+    credentials (e.g. a generated password).
+    """
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        db.Index('ix_email_outbox_due', 'status', 'next_attempt_at'),
+        db.Index('ix_email_outbox_recipient_template', 'recipient', 'template', 'created_at'),
+    )
+
+    email_id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    template = db.Column(db.String(50), nullable=False)
+    recipient = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(200), nullable=False)
+    body = db.Column(db.Text)
+    html = db.Column(db.Text)
+    # pending -> sent, or failed after EMAIL_MAX_ATTEMPTS
+    status = db.Column(db.String(10), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
+    sent_at = db.Column(db.DateTime(timezone=True))
@@ -2,10 +2,12 @@ from db import db
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
 from utils import ErrorHandler, Validator
-from flask import jsonify, Response
+from utils.streaming import stream_json
+from flask import jsonify, Response, current_app
 from sqlalchemy.sql import func
 from typing import List, Optional, Any
 from sqlalchemy import desc
+from sqlalchemy.orm import contains_eager
 
 
 class Notification(db.Model):
@@ -79,13 +81,14 @@ class Notification(db.Model):
             return ErrorHandler.handle_error(e, "Failed to add notification"), 500
 
     @classmethod
-    def get_user_notifications(cls, user_id: str,limit: str = "10") -> tuple[Response, int]:
+    def get_user_notifications(cls, user_id: str, limit: str = "10", stream: bool = False) -> tuple[Response, int]:
         """
         Get notifications for a user
 
         Args:
             user_id: UUID of the user
             limit: Maximum number of notifications to return (as string)
+            stream: Stream the notifications as chunked JSON through a server-side cursor
 
         Returns:
             tuple: (JSON response, HTTP status code)
@@ -95,26 +98,32 @@ class Notification(db.Model):
 
             Validator.validate_limit(limit)
 
+            # The tire is already joined for the filter; load it from the same row for vehicle_id
             notifications = cls.query \
                 .join(Tire) \
                 .join(Vehicle) \
-                .filter(Vehicle.user_id == uuid.UUID(user_id)) \
+                .options(contains_eager(cls.tire)) \
+                .filter(Vehicle.user_id == uuid.UUID(str(user_id))) \
                 .order_by(desc(cls.sent_at)) \
-                .limit(limit) \
-                .all()
-
-            notifications_data = [{
-                "notification_id": str(n.notification_id),
-                "tire_id": str(n.tire_id),
-                "vehicle_id": str(n.tire.vehicle_id),
-                "old_alert_type": n.old_alert_type,
-                "new_alert_type": n.new_alert_type,
-                "title": n.title,
-                "body": n.body,
-                "sent_at": n.sent_at.isoformat()
-            } for n in notifications]
-
-            return jsonify({"notifications": notifications_data}), 200
+                .limit(limit)
+
+            def serialize(n):
+                return {
+                    "notification_id": str(n.notification_id),
+                    "tire_id": str(n.tire_id),
+                    "vehicle_id": str(n.tire.vehicle_id),
+                    "old_alert_type": n.old_alert_type,
+                    "new_alert_type": n.new_alert_type,
+                    "title": n.title,
+                    "body": n.body,
+                    "sent_at": n.sent_at.isoformat()
+                }
+
+            if stream:
+                rows = iter(notifications.yield_per(current_app.config['STREAM_CHUNK_ROWS']))
+                return stream_json({}, 'notifications', rows, serialize), 200
+
+            return jsonify({"notifications": [serialize(n) for n in notifications.all()]}), 200
 
         except ValueError as ve:
             return ErrorHandler.handle_validation_error(str(ve))
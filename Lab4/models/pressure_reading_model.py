@@ -1,12 +1,35 @@
-from typing import Any
+import base64
+import json
+from collections import Counter
+from typing import Any, NamedTuple
 from db import db
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
+from sqlalchemy import select, or_, tuple_
 from sqlalchemy.sql import func
-from flask import jsonify, Response
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from flask import jsonify, Response, current_app, stream_with_context
 from datetime import datetime, timedelta, timezone
 from utils import ErrorHandler, Validator
-from services.notification_service import send_alert_type_change_notification
+from utils.streaming import stream_json
+from services import dedup_cache, deadband_filter, leak_predictor, alert_counters, alert_dispatcher, alert_hysteresis, event_hub
+from services.deadband_filter import StoredReading
+from services import rollup_service
+from config import Config
+
+# A partitioned table needs the partition key in its primary key and every unique constraint
+PARTITIONED = Config.PRESSURE_READING_PARTITIONED
+DEDUP_COLUMNS = ['tire_id', 'message_id', 'created_at'] if PARTITIONED else ['tire_id', 'message_id']
+
+
+class ReadingEntry(NamedTuple):
+    """A reading to store together with the scope it was authenticated for."""
+    user_id: Any
+    vehicle_id: Any
+    data: dict
+    reading_id: uuid.UUID | None = None
+    received_at: datetime | None = None
+
 
 class PressureReading(db.Model):
     __tablename__ = 'pressure_reading'
@@ -14,98 +37,600 @@ class PressureReading(db.Model):
     reading_id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tire_id = db.Column(UUID(as_uuid=True), db.ForeignKey('tire.tire_id', ondelete='CASCADE'), nullable=False)
     pressure_value = db.Column(db.Numeric(5, 2), nullable=False)
-    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), primary_key=PARTITIONED)
+    message_id = db.Column(db.String(100))
 
     tire = db.relationship('Tire', back_populates='pressure_readings')
 
+    __table_args__ = (
+        db.UniqueConstraint(*DEDUP_COLUMNS, name='uq_pressure_reading_tire_message'),
+        # Serves history pages, latest-per-tire lookups and rollup rebuilds
+        db.Index('ix_pressure_reading_tire_created', 'tire_id', 'created_at', 'reading_id'),
+        {'postgresql_partition_by': 'RANGE (created_at)'} if PARTITIONED else {},
+    )
+
 
     @classmethod
-    def add_reading(cls, user_id, data: dict) -> tuple[Response, int]:
+    def add_reading(cls, user_id, data: dict, vehicle_id=None) -> tuple[Response, int]:
         """
         Add a new pressure reading for a tire.
 
+        When INGEST_BUFFER_ENABLED is set the reading is only validated and
+        queued for the background flusher, and 202 is returned.
+
         Args:
              user_id: UUID of the user
              data: {
                 'tire_id': UUID of the tire
                 'pressure_value': float,
                 'pressure_unit': str ('bar', 'psi', 'kPa'),
+                'measured_at': str, ISO 8601 timestamp  # Optional
+                'message_id': str, client ID making retries idempotent  # Optional
             }
+             vehicle_id: UUID of the vehicle the reading is restricted to (device key auth)
 
         Returns:
             tuple: (JSON response, HTTP status code)
         """
         try:
-            from models import Tire, AlertType, Notification
-
-            # Validate input
-            Validator.validate_required_fields(data, ['pressure_value', 'tire_id', 'pressure_unit'])
-
-            tire_id = data['tire_id']
-            tire = Tire.query.get(uuid.UUID(tire_id))
-            if not tire:
-                return ErrorHandler.handle_error(
-                    None,
-                    message=f"Tire {tire_id} not found",
-                    status_code=404
-                )
+            if current_app.config['INGEST_BUFFER_ENABLED']:
+                result = cls.buffer_readings(user_id, [data], vehicle_id)[0]
+            else:
+                result = cls.store_readings(user_id, [data], vehicle_id)[0]
 
-            # Validate pressure value
-            pressure_value = Validator.validate_pressure(
-                value=data['pressure_value'],
-                unit=data['pressure_unit'],
-                desired_unit=tire.pressure_unit
-            )
+            if result['status'] in (404, 503):
+                db.session.rollback()
+                return ErrorHandler.handle_error(None, message=result['error'], status_code=result['status'])
+            if result['status'] == 400:
+                raise ValueError(result['error'])
 
-            # Calculate deviation from optimal pressure
-            optimal_pressure = float(tire.optimal_pressure)
-            deviation_ratio = pressure_value / optimal_pressure
-            old_alert_type = tire.current_alert_type
+            db.session.commit()
 
-            # Get all alert types from database ordered by severity
-            alert_types = AlertType.query.order_by(AlertType.severity_level.desc()).all()
+            response = {
+                201: {"message": "Pressure reading added successfully"},
+                202: {"message": "Pressure reading accepted for processing"},
+                200: {"message": "Duplicate reading ignored", "duplicate": True}
+            }[result['status']]
+            response.update({
+                key: result[key]
+                for key in ('reading_id', 'pressure_value', 'created_at', 'suppressed') if key in result
+            })
+            return jsonify(response), result['status']
 
-            # Determine new alert status based on deviation ranges
-            new_alert_type = 'normal'  # default value
-            for alert in alert_types:
-                if (alert.deviation_min <= deviation_ratio <= alert.deviation_max):
-                    new_alert_type = alert.alert_type
-                    break
+        except ValueError as ve:
+            db.session.rollback()
+            return ErrorHandler.handle_validation_error(str(ve))
+        except Exception as e:
+            db.session.rollback()
+            return ErrorHandler.handle_error(e, "Failed to add pressure reading"), 500
 
-            # Create reading
-            reading = cls(
-                tire_id=tire.tire_id,
-                pressure_value=pressure_value
-            )
-            db.session.add(reading)
 
-            # Update tire status if changed
-            notification = None
-            if new_alert_type != old_alert_type:
-                tire.current_alert_type = new_alert_type
-                db.session.commit()
+    @classmethod
+    def add_readings_batch(cls, user_id, items: list, vehicle_id=None) -> tuple[Response, int]:
+        """
+        Add a batch of pressure readings in a single transaction.
 
-                send_alert_type_change_notification(user_id, tire, old_alert_type, new_alert_type)
+        Args:
+            user_id: UUID of the user
+            items: [{
+                'tire_id': UUID of the tire,
+                'pressure_value': float,
+                'pressure_unit': str ('bar', 'psi', 'kPa'),
+                'measured_at': str, ISO 8601 timestamp  # Optional
+                'message_id': str, client ID making retries idempotent  # Optional
+            }, ...]
+            vehicle_id: UUID of the vehicle the readings are restricted to (device key auth)
 
-            db.session.commit()
+        Returns:
+            tuple: (JSON response with per-item results, HTTP status code)
+                - 201 (202 when buffered) if every reading was accepted or a duplicate,
+                  207 if some were rejected
+        """
+        try:
+            if not isinstance(items, list) or not items:
+                raise ValueError("Readings must be a non-empty list")
+
+            max_size = current_app.config['IOT_BATCH_MAX_SIZE']
+            if len(items) > max_size:
+                raise ValueError(f"Batch size must not exceed {max_size} readings")
+
+            if current_app.config['INGEST_BUFFER_ENABLED']:
+                success_status = 202
+                results = cls.buffer_readings(user_id, items, vehicle_id)
+            else:
+                success_status = 201
+                results = cls.store_readings(user_id, items, vehicle_id)
+                db.session.commit()
 
+            accepted = sum(1 for r in results if r['status'] == success_status)
+            duplicates = sum(1 for r in results if r['status'] == 200)
             return jsonify({
-                "message": "Pressure reading added successfully",
-                "reading_id": str(reading.reading_id),
-                "pressure_value": float(reading.pressure_value),
-                "created_at": reading.created_at.isoformat()
-            }), 201
+                "message": f"{accepted} of {len(results)} pressure readings accepted",
+                "accepted": accepted,
+                "duplicates": duplicates,
+                "rejected": len(results) - accepted - duplicates,
+                "results": results
+            }), success_status if accepted + duplicates == len(results) else 207
 
         except ValueError as ve:
             db.session.rollback()
             return ErrorHandler.handle_validation_error(str(ve))
         except Exception as e:
             db.session.rollback()
-            return ErrorHandler.handle_error(e, "Failed to add pressure reading"), 500
+            return ErrorHandler.handle_error(e, "Failed to add pressure readings"), 500
+
+
+    @classmethod
+    def add_readings_stream(cls, user_id, stream, vehicle_id=None) -> tuple[Response, int]:
+        """
+        Ingest an NDJSON stream of readings, one JSON object per line.
+
+        Lines are validated and stored in micro-batches of IOT_STREAM_BATCH_SIZE,
+        each committed on its own, so memory use does not depend on how long
+        the upload runs.
+
+        Args:
+            user_id: UUID of the user
+            stream: Binary file-like request body
+            vehicle_id: UUID of the vehicle the readings are restricted to (device key auth)
+
+        Returns:
+            tuple: (JSON response with an accepted/rejected summary, HTTP status code)
+        """
+        batch_size = current_app.config['IOT_STREAM_BATCH_SIZE']
+        max_line = current_app.config['IOT_STREAM_MAX_LINE']
+        buffered = current_app.config['INGEST_BUFFER_ENABLED']
+        summary = {"lines": 0, "accepted": 0, "duplicates": 0, "rejected": 0, "errors": []}
+
+        def reject(line_number, error):
+            summary["rejected"] += 1
+            if len(summary["errors"]) < 20:
+                summary["errors"].append({"line": line_number, "error": error})
+
+        def store(batch):
+            line_numbers = [line_number for line_number, _ in batch]
+            items = [item for _, item in batch]
+            if buffered:
+                results = cls.buffer_readings(user_id, items, vehicle_id)
+            else:
+                results = cls.store_readings(user_id, items, vehicle_id)
+                db.session.commit()
+            for result in results:
+                if result['status'] in (201, 202):
+                    summary["accepted"] += 1
+                elif result['status'] == 200:
+                    summary["duplicates"] += 1
+                else:
+                    reject(line_numbers[result['index']], result['error'])
+
+        try:
+            batch = []
+            for line_number, line in enumerate(cls._iter_lines(stream, max_line), start=1):
+                summary["lines"] = line_number
+                if line is None:
+                    reject(line_number, f"Line exceeds {max_line} bytes")
+                    continue
+                if not line.strip():
+                    continue
+                try:
+                    batch.append((line_number, json.loads(line)))
+                except ValueError:
+                    reject(line_number, "Invalid JSON")
+                    continue
+
+                if len(batch) >= batch_size:
+                    store(batch)
+                    batch = []
+
+            if batch:
+                store(batch)
+
+            return jsonify(summary), 200
+
+        except Exception as e:
+            db.session.rollback()
+            return ErrorHandler.handle_error(
+                e,
+                f"Stream aborted after {summary['lines']} lines "
+                f"({summary['accepted']} accepted): ",
+                500
+            )
+
+
+    @staticmethod
+    def _iter_lines(stream, max_line: int):
+        """Yield decoded lines, or None for a line longer than max_line (which is skipped)."""
+        while True:
+            line = stream.readline(max_line + 1)
+            if not line:
+                return
+            if len(line) > max_line and not line.endswith(b'\n'):
+                # Discard the rest of the oversized line
+                while line and not line.endswith(b'\n'):
+                    line = stream.readline(max_line + 1)
+                yield None
+                continue
+            yield line.decode('utf-8', errors='replace')
+
+
+    @classmethod
+    def buffer_readings(cls, user_id, items: list, vehicle_id=None) -> list[dict]:
+        """
+        Validate readings and queue them for the background flusher.
+
+        Checks that need the tire (ownership, unit conversion, alert state) are
+        done by the flusher, which loads all tires of a flush in one query.
+
+        Args:
+            user_id: UUID of the user owning the tires
+            items: List of reading dicts (see add_readings_batch)
+            vehicle_id: Optional UUID of the only vehicle whose tires may be used
+
+        Returns:
+            list: One result dict per item with a 'status' key (202, 200 for duplicates, 400 or 503)
+        """
+        from services import ingest_buffer
+
+        results = []
+        for index, data in enumerate(items):
+            try:
+                tire_id, measured_at, message_id = cls.parse_reading(data)
+                Validator.validate_pressure(data['pressure_value'], data['pressure_unit'], data['pressure_unit'])
+            except ValueError as ve:
+                results.append({"index": index, "status": 400, "error": str(ve)})
+                continue
+
+            # Ownership is not checked yet, so a foreign tire can at worst be reported as duplicate
+            if message_id is not None and dedup_cache.seen((tire_id, message_id)):
+                results.append(cls._duplicate_result(index, tire_id))
+                continue
+
+            received_at = datetime.now(timezone.utc)
+            entry = ReadingEntry(user_id, vehicle_id, data, uuid.uuid4(), received_at)
+            if not ingest_buffer.enqueue(entry):
+                results.append({"index": index, "status": 503, "error": "Ingest buffer is full, retry later"})
+                continue
+
+            results.append({
+                "index": index,
+                "status": 202,
+                "reading_id": str(entry.reading_id),
+                "created_at": (measured_at or received_at).isoformat()
+            })
+
+        return results
+
+
+    @classmethod
+    def store_readings(cls, user_id, items: list, vehicle_id=None) -> list[dict]:
+        """
+        Validate, classify and stage pressure readings of one owner without committing.
+
+        Args:
+            user_id: UUID of the user owning the tires
+            items: List of reading dicts (see add_readings_batch)
+            vehicle_id: Optional UUID of the only vehicle whose tires may be used
+
+        Returns:
+            list: One result dict per item (see store_entries)
+        """
+        return cls.store_entries([ReadingEntry(user_id, vehicle_id, data) for data in items])
 
 
     @classmethod
-    def get_readings_by_timeframe(cls, tire_id: str, data: dict) -> tuple[Response, int]:
+    def store_entries(cls, entries: list) -> list[dict]:
+        """
+        Validate, classify and stage pressure readings without committing.
+
+        All tires are fetched with one query and all valid readings are written
+        with one multi-row INSERT ... ON CONFLICT DO NOTHING. Alert type changes
+        and the alert events describing them are added to the same session, so
+        the caller's commit makes them atomic; the alert dispatcher turns the
+        events into notifications after the commit.
+
+        Readings with a message_id (or a measured_at, which then serves as the
+        ID) are idempotent per tire: repeats are answered with status 200 and
+        are not stored again. Most are caught by the in-process dedup cache,
+        the rest by the unique (tire_id, message_id) constraint. On a
+        partitioned table that constraint also includes created_at, so only
+        the cache catches retries that carry a message_id but no measured_at.
+
+        Readings within the deadband of the tire's last stored one are accepted
+        (status 201, 'suppressed': True) but only update Tire.last_seen_at and
+        the tire's alert state machine. Alert types change only as confirmed by
+        that state machine (see alert_hysteresis.evaluate), not on every
+        reading crossing a band edge.
+        Stored readings advance the tire's last-reading snapshot in the same
+        statement that inserts them, are folded into the minute/hour/day
+        rollups in the same transaction and update the tire's leak predictor,
+        which may add a leak prediction event. Alert type changes also
+        adjust the owner's alert counters. The newest state of each tire is
+        published to live event streams when the transaction commits. The
+        tires stay locked until then, so readings of a tire are processed one
+        batch at a time.
+
+        Args:
+            entries: List of ReadingEntry; each one carries its own owner scope
+
+        Returns:
+            list: One result dict per entry, in input order, with a 'status' key
+                (201, 200 for duplicates, 400 or 404) and either reading data
+                or an 'error' message
+        """
+        from models import Tire, Vehicle
+
+        results: list[dict | None] = [None] * len(entries)
+        parsed = []
+        for index, entry in enumerate(entries):
+            try:
+                tire_id, measured_at, message_id = cls.parse_reading(entry.data)
+                created_at = measured_at or entry.received_at or datetime.now(timezone.utc)
+                parsed.append((index, tire_id, created_at, message_id, entry))
+            except ValueError as ve:
+                results[index] = {"index": index, "status": 400, "error": str(ve)}
+
+        tire_ids = {p[1] for p in parsed}
+        tires = {}
+        if tire_ids:
+            # Locked in a fixed order until commit: concurrent batches of a tire
+            # then see each other's readings and alert state machine
+            tires = {
+                tire.tire_id: (tire, owner_id)
+                for tire, owner_id in db.session.query(Tire, Vehicle.user_id)
+                .join(Vehicle)
+                .filter(Tire.tire_id.in_(tire_ids))
+                .order_by(Tire.tire_id)
+                .with_for_update(of=Tire)
+                .all()
+            }
+        # Duplicates the cache missed (e.g. a retry sent to another worker) are
+        # found before they can advance the alert state machine
+        stored_keys = cls._stored_dedup_keys({
+            (tire_id, message_id, created_at)
+            for _, tire_id, created_at, message_id, _ in parsed
+            if message_id is not None and tire_id in tires
+        })
+
+        staged = []
+        batch_keys = set()
+        # Alert type and last kept reading per tire as of the readings staged so far
+        running_alerts = {}
+        last_kept = {}
+        # Apply readings in measurement order so alert transitions follow the timeline
+        for index, tire_id, created_at, message_id, entry in sorted(parsed, key=lambda p: p[2]):
+            tire, owner_id = tires.get(tire_id, (None, None))
+            if not tire or str(owner_id) != str(entry.user_id) or (
+                    entry.vehicle_id is not None and str(tire.vehicle_id) != str(entry.vehicle_id)):
+                results[index] = {"index": index, "status": 404, "error": f"Tire {tire_id} not found"}
+                continue
+
+            if message_id is not None:
+                key = (tire.tire_id, message_id)
+                if key in batch_keys or dedup_cache.seen(key):
+                    results[index] = cls._duplicate_result(index, tire.tire_id)
+                    continue
+                if cls._dedup_key(tire.tire_id, message_id, created_at) in stored_keys:
+                    dedup_cache.count_conflict()
+                    results[index] = cls._duplicate_result(index, tire.tire_id)
+                    continue
+                batch_keys.add(key)
+
+            try:
+                pressure_value = Validator.validate_pressure(
+                    value=entry.data['pressure_value'],
+                    unit=entry.data['pressure_unit'],
+                    desired_unit=tire.pressure_unit
+                )
+            except ValueError as ve:
+                results[index] = {"index": index, "status": 400, "error": str(ve)}
+                continue
+
+            if tire.last_seen_at is None or created_at > tire.last_seen_at:
+                tire.last_seen_at = created_at
+
+            # Calculate deviation from optimal pressure; the state machine debounces band changes
+            current_alert_type = running_alerts.get(tire.tire_id, tire.current_alert_type)
+            deviation_ratio = pressure_value / float(tire.optimal_pressure)
+            new_alert = alert_hysteresis.evaluate(tire, deviation_ratio, created_at, current_alert_type)
+
+            # Readings inside the deadband only refresh last_seen_at (and the alert state machine)
+            new_alert_type = new_alert.alert_type if new_alert else current_alert_type
+            last = last_kept.get(tire.tire_id) or deadband_filter.get_last_stored(tire.tire_id)
+            if not deadband_filter.should_store(last, float(tire.optimal_pressure), pressure_value,
+                                                current_alert_type, new_alert_type, created_at):
+                results[index] = {
+                    "index": index,
+                    "status": 201,
+                    "suppressed": True,
+                    "tire_id": str(tire.tire_id),
+                    "pressure_value": round(pressure_value, 2),
+                    "created_at": created_at.isoformat()
+                }
+                continue
+
+            running_alerts[tire.tire_id] = new_alert_type
+            last_kept[tire.tire_id] = StoredReading(round(pressure_value, 2), new_alert_type, created_at)
+            staged.append((index, tire, new_alert, {
+                'reading_id': entry.reading_id or uuid.uuid4(),
+                'tire_id': tire.tire_id,
+                'pressure_value': round(pressure_value, 2),
+                'created_at': created_at,
+                'message_id': message_id
+            }))
+
+        inserted = set()
+        if staged:
+            inserted = set(db.session.scalars(cls._insert_with_snapshot([row for _, _, _, row in staged])))
+
+        alert_events = []
+        tire_states = {}
+        counter_deltas = Counter()
+        rollup_service.stage_rollups([row for _, _, _, row in staged if row['reading_id'] in inserted])
+        for index, tire, new_alert, row in staged:
+            if row['reading_id'] not in inserted:
+                # Not expected with the tires locked and stored duplicates filtered out above
+                dedup_cache.count_conflict()
+                results[index] = cls._duplicate_result(index, tire.tire_id)
+                continue
+            if row['message_id'] is not None:
+                dedup_cache.remember_on_commit((tire.tire_id, row['message_id']))
+            deadband_filter.remember_on_commit(tire.tire_id, StoredReading(
+                row['pressure_value'],
+                new_alert.alert_type if new_alert else tire.current_alert_type,
+                row['created_at']
+            ))
+
+            # Update tire status if changed
+            old_alert_type = tire.current_alert_type
+            if new_alert and new_alert.alert_type != old_alert_type:
+                tire.current_alert_type = new_alert.alert_type
+                alert_events.append(alert_dispatcher.alert_type_changed(
+                    tire, tires[tire.tire_id][1], old_alert_type, new_alert.alert_type, row
+                ))
+                alert_counters.track_change(counter_deltas, tires[tire.tire_id][1], old_alert_type,
+                                            new_alert.alert_type)
+
+            # Staged rows are in time order, as the predictor requires
+            if leak_predictor.update(tire, row['pressure_value'], row['created_at']):
+                prediction = leak_predictor.predict(tire)
+                if leak_predictor.should_warn(tire, prediction):
+                    tire.leak_notified_at = row['created_at']
+                    alert_events.append(alert_dispatcher.leak_predicted(tire, tires[tire.tire_id][1], prediction, row))
+
+            # Newest state per tire for live event streams; backfilled older readings do not move it
+            if tire.last_reading_at is None or row['created_at'] >= tire.last_reading_at:
+                tire_states[tire.tire_id] = {
+                    "type": "tire_state",
+                    "user_id": str(tires[tire.tire_id][1]),
+                    "vehicle_id": str(tire.vehicle_id),
+                    "tire_id": str(tire.tire_id),
+                    "current_alert_type": tire.current_alert_type,
+                    "current_pressure": float(row['pressure_value']),
+                    "pressure_updated_at": row['created_at'].isoformat(),
+                    "last_seen_at": tire.last_seen_at.isoformat(),
+                    "leak_prediction": leak_predictor.to_dict(leak_predictor.predict(tire))
+                }
+
+            results[index] = {
+                "index": index,
+                "status": 201,
+                "reading_id": str(row['reading_id']),
+                "tire_id": str(tire.tire_id),
+                "pressure_value": row['pressure_value'],
+                "created_at": row['created_at'].isoformat()
+            }
+
+        alert_dispatcher.stage(alert_events)
+        alert_counters.apply(counter_deltas)
+        event_hub.publish(list(tire_states.values()))
+
+        return results
+
+
+    @classmethod
+    def _insert_with_snapshot(cls, rows: list[dict]):
+        """
+        Build one statement inserting readings and advancing the tires' last-reading snapshot.
+
+        The INSERT runs in a CTE; the newest inserted reading per tire then
+        updates Tire.last_pressure_value/last_reading_at/last_reading_id unless
+        the tire already has a newer one, so out-of-order backfill never moves
+        the snapshot backwards. The statement returns the inserted reading IDs.
+        """
+        from models import Tire
+
+        tire = Tire.__table__
+        inserted = pg_insert(cls) \
+            .values(rows) \
+            .on_conflict_do_nothing(index_elements=DEDUP_COLUMNS) \
+            .returning(cls.reading_id, cls.tire_id, cls.pressure_value, cls.created_at) \
+            .cte('inserted')
+        newest = select(inserted) \
+            .distinct(inserted.c.tire_id) \
+            .order_by(inserted.c.tire_id, inserted.c.created_at.desc(), inserted.c.reading_id.desc()) \
+            .cte('newest')
+        advanced = tire.update() \
+            .where(tire.c.tire_id == newest.c.tire_id) \
+            .where(or_(tire.c.last_reading_at.is_(None), tire.c.last_reading_at <= newest.c.created_at)) \
+            .values(
+                last_pressure_value=newest.c.pressure_value,
+                last_reading_at=newest.c.created_at,
+                last_reading_id=newest.c.reading_id
+            ) \
+            .cte('advanced')
+        return select(inserted.c.reading_id).add_cte(advanced)
+
+
+    @classmethod
+    def _stored_dedup_keys(cls, keys: set[tuple]) -> set[tuple]:
+        """Return the (tire_id, message_id, created_at) keys already stored, as _dedup_key tuples."""
+        if not keys:
+            return set()
+        columns = [getattr(cls, column) for column in DEDUP_COLUMNS]
+        wanted = {cls._dedup_key(*key) for key in keys}
+        return {tuple(row) for row in db.session.execute(select(*columns).where(tuple_(*columns).in_(wanted)))}
+
+
+    @staticmethod
+    def _dedup_key(tire_id, message_id: str, created_at: datetime) -> tuple:
+        """The values of DEDUP_COLUMNS, the unique key duplicates conflict on."""
+        return (tire_id, message_id, created_at) if PARTITIONED else (tire_id, message_id)
+
+
+    @staticmethod
+    def _duplicate_result(index: int, tire_id) -> dict:
+        return {
+            "index": index,
+            "status": 200,
+            "duplicate": True,
+            "tire_id": str(tire_id),
+            "message": "Duplicate reading ignored"
+        }
+
+
+    @staticmethod
+    def parse_reading(data: dict) -> tuple[uuid.UUID, datetime | None, str | None]:
+        """
+        Validate the tire-independent part of a reading.
+
+        Returns:
+            tuple: (tire UUID, measured_at or None, message_id or None)
+                message_id falls back to the measurement timestamp when absent
+
+        Raises:
+            ValueError: If the reading is malformed or measured_at is outside
+                READING_MAX_CLOCK_SKEW_SECONDS ahead / READING_MAX_AGE_DAYS back
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Reading must be an object")
+        Validator.validate_required_fields(data, ['pressure_value', 'tire_id', 'pressure_unit'])
+        try:
+            tire_id = uuid.UUID(str(data['tire_id']))
+        except ValueError:
+            raise ValueError("Invalid tire ID format")
+        measured_at = Validator.validate_timestamp(data.get('measured_at'))
+        if measured_at is not None:
+            # A future timestamp would pin the tire's snapshot, deadband and alert timers to it
+            config = current_app.config
+            Validator.validate_timestamp_window(
+                measured_at,
+                max_ahead=timedelta(seconds=config['READING_MAX_CLOCK_SKEW_SECONDS']),
+                max_age=timedelta(days=config['READING_MAX_AGE_DAYS']) if config['READING_MAX_AGE_DAYS'] > 0 else None
+            )
+
+        message_id = data.get('message_id')
+        if message_id is not None:
+            message_id = str(message_id).strip()
+            if not message_id or len(message_id) > 100:
+                raise ValueError("message_id must be between 1 and 100 characters")
+        elif measured_at is not None:
+            message_id = f"t:{measured_at.astimezone(timezone.utc).isoformat()}"
+
+        return tire_id, measured_at, message_id
+
+
+    @classmethod
+    def get_readings_by_timeframe(cls, tire_id: str, data: dict, user_id=None) -> tuple[Response, int]:
         """
         Get pressure readings for a tire within a specific timeframe.
 
@@ -114,32 +639,95 @@ class PressureReading(db.Model):
             data: {
                 'days': int,  # Optional
                 Number of days to look back (1 for last day, 7 for last week, None for all)
+                'resolution': str,  # Optional, 'raw' by default
+                'raw', 'minute', 'hour', 'day' or 'auto' (coarsest rollup giving
+                at least ROLLUP_TARGET_POINTS points)
+                'stream': bool,  # Optional
+                Stream the readings as chunked JSON through a server-side cursor
             }
+            user_id: UUID of the user who must own the tire  # Optional
+
+        On a partitioned table the created_at bound lets PostgreSQL skip the
+        partitions outside the window. Rollup resolutions read pressure_rollup
+        instead and return one aggregate per bucket.
+
         Returns:
             tuple: (JSON response, HTTP status code)
         """
+        from models import PressureRollup, Tire, Vehicle
+
         try:
-            query = cls.query.filter_by(tire_id=uuid.UUID(tire_id))
+            try:
+                tire_uuid = uuid.UUID(str(tire_id))
+            except ValueError:
+                raise ValueError("Invalid tire ID format")
+
+            if user_id is not None and not db.session.query(Tire.tire_id).join(Vehicle) \
+                    .filter(Tire.tire_id == tire_uuid, Vehicle.user_id == user_id).first():
+                return ErrorHandler.handle_error(None, message=f"Tire {tire_id} not found", status_code=404)
 
             days = data.get('days')
+            cutoff_date = None
             if days is not None:
                 if not isinstance(days, int) or days <= 0:
                     raise ValueError("Days parameter must be a positive integer")
-
                 cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-                query = query.filter(cls.created_at >= cutoff_date)
-
-            readings = query.order_by(cls.created_at.desc()).all()
-
-            readings_data = [{
-                "reading_id": str(r.reading_id),
-                "pressure_value": float(r.pressure_value),
-                "created_at": r.created_at.isoformat()
-            } for r in readings]
 
-            return jsonify({
+            resolution = data.get('resolution') or 'raw'
+            if resolution not in ('raw', 'auto', *rollup_service.RESOLUTIONS):
+                raise ValueError("Resolution must be one of: raw, minute, hour, day, auto")
+
+            if resolution == 'auto':
+                start = cutoff_date or db.session.query(func.min(PressureRollup.bucket_start)) \
+                    .filter_by(tire_id=tire_uuid, resolution='day') \
+                    .scalar()
+                window = (datetime.now(timezone.utc) - start).total_seconds() if start else 0
+                resolution = rollup_service.choose_resolution(window, current_app.config['ROLLUP_TARGET_POINTS'])
+
+            if resolution == 'raw':
+                query = cls.query.filter_by(tire_id=tire_uuid)
+                if cutoff_date is not None:
+                    query = query.filter(cls.created_at >= cutoff_date)
+                query = query.order_by(cls.created_at.desc())
+
+                def serialize(r):
+                    return {
+                        "reading_id": str(r.reading_id),
+                        "pressure_value": float(r.pressure_value),
+                        "created_at": r.created_at.isoformat()
+                    }
+            else:
+                query = PressureRollup.query.filter_by(tire_id=tire_uuid, resolution=resolution)
+                if cutoff_date is not None:
+                    query = query.filter(
+                        PressureRollup.bucket_start >= rollup_service.bucket_start(cutoff_date, resolution)
+                    )
+                query = query.order_by(PressureRollup.bucket_start.desc())
+
+                def serialize(r):
+                    return {
+                        "bucket_start": r.bucket_start.isoformat(),
+                        "min": float(r.min_value),
+                        "max": float(r.max_value),
+                        "avg": round(float(r.sum_value) / r.count, 2),
+                        "count": r.count,
+                        "first": float(r.first_value),
+                        "last": float(r.last_value),
+                        "last_at": r.last_at.isoformat()
+                    }
+
+            envelope = {
                 "tire_id": tire_id,
                 "timeframe": f"last {days} days" if days else "all time",
+                "resolution": resolution
+            }
+            if data.get('stream'):
+                rows = iter(query.yield_per(current_app.config['STREAM_CHUNK_ROWS']))
+                return stream_json(envelope, 'readings', rows, serialize, count_key='count'), 200
+
+            readings_data = [serialize(r) for r in query.all()]
+            return jsonify({
+                **envelope,
                 "count": len(readings_data),
                 "readings": readings_data
             }), 200
@@ -150,6 +738,158 @@ class PressureReading(db.Model):
             return ErrorHandler.handle_error(e, "Failed to get pressure readings"), 500
 
 
+    @classmethod
+    def get_reading_history(cls, user_id, tire_id: str, args: dict) -> tuple[Response, int]:
+        """
+        Get one page of a tire's readings, newest first.
+
+        Pages are addressed by a keyset cursor over (created_at, reading_id)
+        rather than an offset, so every page is an index range scan on
+        ix_pressure_reading_tire_created no matter how deep the client pages.
+
+        Args:
+            user_id: UUID of the user owning the tire
+            tire_id: UUID of the tire
+            args: {
+                'limit': str, page size (default HISTORY_PAGE_SIZE, capped at HISTORY_MAX_PAGE_SIZE)  # Optional
+                'from': str, ISO 8601 timestamp, inclusive lower bound  # Optional
+                'to': str, ISO 8601 timestamp, exclusive upper bound  # Optional
+                'cursor': str, next_cursor of the previous page  # Optional
+            }
+
+        Returns:
+            tuple: (JSON response with 'readings' and 'next_cursor' (None on the last page), HTTP status code)
+        """
+        from models import Tire, Vehicle
+
+        try:
+            try:
+                tire_uuid = uuid.UUID(str(tire_id))
+            except ValueError:
+                raise ValueError("Invalid tire ID format")
+
+            limit = args.get('limit') or current_app.config['HISTORY_PAGE_SIZE']
+            Validator.validate_limit(limit)
+            limit = min(int(limit), current_app.config['HISTORY_MAX_PAGE_SIZE'])
+            from_at = Validator.validate_timestamp(args.get('from'))
+            to_at = Validator.validate_timestamp(args.get('to'))
+
+            owned = db.session.query(Tire.tire_id) \
+                .join(Vehicle) \
+                .filter(Tire.tire_id == tire_uuid, Vehicle.user_id == user_id) \
+                .first()
+            if not owned:
+                return ErrorHandler.handle_error(None, message=f"Tire {tire_id} not found", status_code=404)
+
+            query = db.session.query(cls.reading_id, cls.pressure_value, cls.created_at) \
+                .filter(cls.tire_id == tire_uuid)
+            if from_at is not None:
+                query = query.filter(cls.created_at >= from_at)
+            if to_at is not None:
+                query = query.filter(cls.created_at < to_at)
+            if args.get('cursor'):
+                query = query.filter(tuple_(cls.created_at, cls.reading_id) < tuple_(*cls._decode_cursor(args['cursor'])))
+
+            # One extra row tells whether another page exists
+            rows = query.order_by(cls.created_at.desc(), cls.reading_id.desc()).limit(limit + 1).all()
+            page = rows[:limit]
+            next_cursor = cls._encode_cursor(page[-1].created_at, page[-1].reading_id) if len(rows) > limit else None
+
+            return jsonify({
+                "tire_id": str(tire_uuid),
+                "count": len(page),
+                "readings": [{
+                    "reading_id": str(r.reading_id),
+                    "pressure_value": float(r.pressure_value),
+                    "created_at": r.created_at.isoformat()
+                } for r in page],
+                "next_cursor": next_cursor
+            }), 200
+
+        except ValueError as ve:
+            return ErrorHandler.handle_validation_error(str(ve))
+        except Exception as e:
+            return ErrorHandler.handle_error(e, "Failed to get reading history"), 500
+
+
+    @classmethod
+    def export_readings(cls, user_id, args: dict) -> tuple[Response, int]:
+        """
+        Export a user's readings as a compressed columnar file.
+
+        The file is streamed while the rows are read from a server-side cursor
+        in batches of EXPORT_BATCH_ROWS, so memory does not grow with history
+        size. Columns are tire_id, pressure_unit, created_at (UTC timestamp)
+        and pressure_value (float32, in the tire's unit).
+
+        Args:
+            user_id: UUID of the user whose readings are exported
+            args: {
+                'format': str, 'csv.gz' (default), 'arrow' or 'parquet'  # Optional
+                'tire': str, UUID of one tire  # Optional
+                'vehicle': str, UUID of one vehicle  # Optional
+                'from': str, ISO 8601 timestamp, inclusive lower bound  # Optional
+                'to': str, ISO 8601 timestamp, exclusive upper bound  # Optional
+            }
+
+        Returns:
+            tuple: (streamed file response, HTTP status code)
+        """
+        from models import Tire, Vehicle
+        from services import export_service
+
+        try:
+            file_format = args.get('format') or 'csv.gz'
+            export_service.check_format(file_format)
+            from_at = Validator.validate_timestamp(args.get('from'))
+            to_at = Validator.validate_timestamp(args.get('to'))
+
+            try:
+                tire_id = uuid.UUID(args['tire']) if args.get('tire') else None
+                vehicle_id = uuid.UUID(args['vehicle']) if args.get('vehicle') else None
+            except ValueError:
+                raise ValueError("Invalid tire or vehicle ID format")
+
+            if tire_id and not db.session.query(Tire.tire_id).join(Vehicle) \
+                    .filter(Tire.tire_id == tire_id, Vehicle.user_id == user_id).first():
+                return ErrorHandler.handle_error(None, message=f"Tire {tire_id} not found", status_code=404)
+            if vehicle_id and not Vehicle.query.filter_by(vehicle_id=vehicle_id, user_id=user_id).first():
+                return ErrorHandler.handle_error(None, message=f"Vehicle {vehicle_id} not found", status_code=404)
+
+            batches = export_service.open_batches(
+                user_id=user_id, tire_id=tire_id, vehicle_id=vehicle_id, from_at=from_at, to_at=to_at,
+                batch_rows=current_app.config['EXPORT_BATCH_ROWS']
+            )
+            extension, mimetype = export_service.FORMATS[file_format]
+            scope = tire_id or vehicle_id or user_id
+            return Response(
+                stream_with_context(export_service.encode(file_format, batches)),
+                mimetype=mimetype,
+                headers={"Content-Disposition": f'attachment; filename="readings-{scope}.{extension}"'}
+            ), 200
+
+        except ValueError as ve:
+            return ErrorHandler.handle_validation_error(str(ve))
+        except Exception as e:
+            return ErrorHandler.handle_error(e, "Failed to export pressure readings"), 500
+
+
+    @staticmethod
+    def _encode_cursor(created_at: datetime, reading_id) -> str:
+        payload = json.dumps([created_at.isoformat(), str(reading_id)], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, reading_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), uuid.UUID(reading_id)
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+
+
     @classmethod
     def get_latest_reading(cls, tire_id: str) -> Any | None:
         """
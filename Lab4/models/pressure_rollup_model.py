@@ -0,0 +1,20 @@
+from db import db
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class PressureRollup(db.Model):
+    __tablename__ = 'pressure_rollup'
+
+    tire_id = db.Column(UUID(as_uuid=True), db.ForeignKey('tire.tire_id', ondelete='CASCADE'), primary_key=True)
+    resolution = db.Column(db.String(10), primary_key=True)
+    bucket_start = db.Column(db.DateTime(timezone=True), primary_key=True)
+    min_value = db.Column(db.Numeric(5, 2), nullable=False)
+    max_value = db.Column(db.Numeric(5, 2), nullable=False)
+    sum_value = db.Column(db.Numeric(14, 2), nullable=False)
+    count = db.Column(db.Integer, nullable=False)
+    first_value = db.Column(db.Numeric(5, 2), nullable=False)
+    first_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    last_value = db.Column(db.Numeric(5, 2), nullable=False)
+    last_at = db.Column(db.DateTime(timezone=True), nullable=False)
+
+    tire = db.relationship('Tire', back_populates='pressure_rollups')
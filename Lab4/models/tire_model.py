@@ -2,9 +2,10 @@ from db import db
 from sqlalchemy.dialects.postgresql import UUID
 import uuid, random, string
 from sqlalchemy.sql import func
-from flask import jsonify, Response
+from flask import jsonify, Response, current_app
+from datetime import datetime, timedelta, timezone
 from utils import ErrorHandler, Validator
-from models.pressure_reading_model import PressureReading
+from services import leak_predictor, alert_counters
 from models.vehicle_model import  Vehicle
 
 class Tire(db.Model):
@@ -18,6 +19,23 @@ class Tire(db.Model):
     installed_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
     current_alert_type = db.Column(db.String(50), db.ForeignKey('alert_type.alert_type'))
     sensor_code = db.Column(db.String(6), unique=True, nullable=False)
+    last_seen_at = db.Column(db.DateTime(timezone=True))
+    # Snapshot of the newest stored reading, maintained by the reading INSERT itself
+    last_pressure_value = db.Column(db.Numeric(5, 2))
+    last_reading_at = db.Column(db.DateTime(timezone=True))
+    last_reading_id = db.Column(UUID(as_uuid=True))
+    # Exponentially weighted regression sums of the leak predictor (time in days since leak_state_at)
+    leak_state_at = db.Column(db.DateTime(timezone=True))
+    leak_weight = db.Column(db.Float)
+    leak_sum_t = db.Column(db.Float)
+    leak_sum_v = db.Column(db.Float)
+    leak_sum_tt = db.Column(db.Float)
+    leak_sum_tv = db.Column(db.Float)
+    leak_notified_at = db.Column(db.DateTime(timezone=True))
+    # Alert type change waiting for confirmation by the alert hysteresis state machine
+    alert_pending_type = db.Column(db.String(50))
+    alert_pending_count = db.Column(db.Integer)
+    alert_pending_since = db.Column(db.DateTime(timezone=True))
 
     vehicle = db.relationship('Vehicle', back_populates='tires')
     current_alert = db.relationship(
@@ -30,6 +48,12 @@ class Tire(db.Model):
         back_populates='tire',
         cascade="all, delete-orphan"
     )
+    pressure_rollups = db.relationship(
+        'PressureRollup',
+        back_populates='tire',
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
     notifications = db.relationship(
         'Notification',
         back_populates='tire',
@@ -37,6 +61,23 @@ class Tire(db.Model):
     )
 
 
+    def to_state_dict(self) -> dict:
+        """Tire details with its latest reading and leak prediction, all from the tire row itself."""
+        return {
+            "tire_id": str(self.tire_id),
+            "label": self.label,
+            "optimal_pressure": float(self.optimal_pressure),
+            "pressure_unit": self.pressure_unit,
+            "sensor_code": self.sensor_code,
+            "installed_at": self.installed_at.isoformat(),
+            "current_alert_type": self.current_alert_type,
+            "current_pressure": float(self.last_pressure_value) if self.last_pressure_value is not None else None,
+            "pressure_updated_at": self.last_reading_at.isoformat() if self.last_reading_at else None,
+            "last_seen_at": self.last_seen_at.isoformat() if self.last_seen_at else None,
+            "leak_prediction": leak_predictor.to_dict(leak_predictor.predict(self))
+        }
+
+
     @staticmethod
     def generate_sensor_code() -> str:
         """Generate a unique 6-character alphanumeric sensor code."""
@@ -158,6 +199,9 @@ class Tire(db.Model):
         """
         Get all tires for a specific vehicle with latest pressure readings.
 
+        The latest reading comes from the snapshot columns on tire, so this is
+        a single query regardless of reading history size.
+
         Args:
             vehicle_id: UUID of the vehicle
 
@@ -167,22 +211,7 @@ class Tire(db.Model):
         try:
             tires = cls.query.filter_by(vehicle_id=uuid.UUID(vehicle_id)).all()
 
-            tires_data = []
-            for tire in tires:
-                latest_reading = PressureReading.get_latest_reading(str(tire.tire_id))
-
-                tire_data = {
-                    "tire_id": str(tire.tire_id),
-                    "label": tire.label,
-                    "optimal_pressure": float(tire.optimal_pressure),
-                    "pressure_unit": tire.pressure_unit,
-                    "sensor_code": tire.sensor_code,
-                    "installed_at": tire.installed_at.isoformat(),
-                    "current_alert_type": tire.current_alert_type,
-                    "current_pressure": float(latest_reading.pressure_value) if latest_reading else None,
-                    "pressure_updated_at": latest_reading.created_at.isoformat() if latest_reading else None
-                }
-                tires_data.append(tire_data)
+            tires_data = [tire.to_state_dict() for tire in tires]
 
             return jsonify({"tires": tires_data}), 200
 
@@ -212,25 +241,68 @@ class Tire(db.Model):
                     status_code=404
                 )
 
-            latest_reading = PressureReading.get_latest_reading(tire_id)
+            return jsonify({
+                **tire.to_state_dict(),
+                "vehicle_id": str(tire.vehicle_id)
+            }), 200
 
+        except ValueError as ve:
+            return ErrorHandler.handle_validation_error(str(ve))
+        except Exception as e:
+            return ErrorHandler.handle_error(e, "Failed to get tire details"), 500
+
+
+    @classmethod
+    def get_tire_stats(cls, user_id, tire_id: str, args: dict) -> tuple[Response, int]:
+        """
+        Get pressure statistics of a tire over a time window.
+
+        Args:
+            user_id: UUID of the user owning the tire
+            tire_id: UUID of the tire
+            args: {
+                'from': str, ISO 8601 timestamp, inclusive lower bound  # Optional, default STATS_DEFAULT_DAYS ago
+                'to': str, ISO 8601 timestamp, exclusive upper bound  # Optional
+            }
+
+        Returns:
+            tuple: (JSON response, HTTP status code)
+        """
+        from services import pressure_analytics
+
+        try:
+            from_at, to_at = cls.parse_stats_window(args)
+            tire = db.session.query(cls.tire_id, cls.optimal_pressure, cls.pressure_unit) \
+                .join(Vehicle) \
+                .filter(cls.tire_id == uuid.UUID(str(tire_id)), Vehicle.user_id == user_id) \
+                .first()
+            if not tire:
+                return ErrorHandler.handle_error(None, message=f"Tire {tire_id} not found", status_code=404)
+
+            stats = pressure_analytics.compute_stats([(tire.tire_id, tire.optimal_pressure)], from_at, to_at)[0]
             return jsonify({
-                "tire_id": str(tire.tire_id),
-                "vehicle_id": str(tire.vehicle_id),
-                "label": tire.label,
-                "optimal_pressure": float(tire.optimal_pressure),
+                **stats,
                 "pressure_unit": tire.pressure_unit,
-                "sensor_code": tire.sensor_code,
-                "installed_at": tire.installed_at.isoformat(),
-                "current_alert_type": tire.current_alert_type,
-                "current_pressure": float(latest_reading.pressure_value) if latest_reading else None,
-                "pressure_updated_at": latest_reading.created_at.isoformat() if latest_reading else None
+                "from": from_at.isoformat(),
+                "to": to_at.isoformat() if to_at else None
             }), 200
 
         except ValueError as ve:
             return ErrorHandler.handle_validation_error(str(ve))
         except Exception as e:
-            return ErrorHandler.handle_error(e, "Failed to get tire details"), 500
+            return ErrorHandler.handle_error(e, "Failed to get tire statistics"), 500
+
+
+    @staticmethod
+    def parse_stats_window(args: dict) -> tuple[datetime, datetime | None]:
+        """Parse 'from'/'to' of a statistics request, defaulting 'from' to STATS_DEFAULT_DAYS ago."""
+        from_at = Validator.validate_timestamp(args.get('from'))
+        to_at = Validator.validate_timestamp(args.get('to'))
+        if from_at is None:
+            from_at = (to_at or datetime.now(timezone.utc)) - timedelta(days=current_app.config['STATS_DEFAULT_DAYS'])
+        if to_at is not None and to_at <= from_at:
+            raise ValueError("'to' must be later than 'from'")
+        return from_at, to_at
 
 
     @classmethod
@@ -258,6 +330,7 @@ class Tire(db.Model):
             if tire.vehicle.user_id != user_id:
                 return jsonify({"error": "Forbidden: You do not own this tire"}), 403
 
+            alert_counters.apply_change(tire.vehicle.user_id, tire.current_alert_type, None)
             db.session.delete(tire)
             db.session.commit()
 
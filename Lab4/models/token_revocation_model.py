@@ -0,0 +1,22 @@
+from db import db
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from sqlalchemy.sql import func
+
+
+class TokenRevocation(db.Model):
+    """
+    A revoked JWT (jti) or all JWTs of a user issued below min_token_version.
+
+    Rows are only kept until the revoked tokens would have expired anyway, so
+    the table stays small enough to be held in memory by every worker. There is
+    no foreign key on user_id: revocations of a deleted user must outlive it.
+    """
+    __tablename__ = 'token_revocation'
+
+    revocation_id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = db.Column(UUID(as_uuid=True), nullable=False, index=True)
+    jti = db.Column(db.String(36), unique=True)
+    min_token_version = db.Column(db.Integer)
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
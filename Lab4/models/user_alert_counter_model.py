@@ -0,0 +1,12 @@
+from db import db
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class UserAlertCounter(db.Model):
+    """Number of a user's tires currently in each alert type, kept up to date on every change."""
+    __tablename__ = 'user_alert_counter'
+
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('user.user_id', ondelete='CASCADE'), primary_key=True)
+    alert_type = db.Column(db.String(50), db.ForeignKey('alert_type.alert_type', ondelete='CASCADE'),
+                           primary_key=True)
+    tire_count = db.Column(db.Integer, nullable=False, default=0)
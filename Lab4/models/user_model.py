@@ -2,12 +2,14 @@ from db import db
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
 from flask_login import UserMixin
+from sqlalchemy.orm import joinedload
 from sqlalchemy.sql import func
 from datetime import datetime
-from flask import jsonify, Response
-from werkzeug.security import generate_password_hash, check_password_hash
-from models.role_model import Role
+from flask import jsonify, Response, current_app
 from utils import ErrorHandler, Validator
+from utils.streaming import stream_json
+from services import reference_cache, principal_cache, token_service, password_hasher
+from sqlalchemy import event, inspect
 
 
 class User(db.Model, UserMixin):
@@ -21,6 +23,8 @@ class User(db.Model, UserMixin):
     password = db.Column(db.String(256))
     created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
     email_confirmed = db.Column(db.Boolean, default=False)
+    # Tokens issued with an older version are revoked; bumped on password or role change
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     role = db.relationship('Role', back_populates='users')
     vehicles = db.relationship(
@@ -34,11 +38,37 @@ class User(db.Model, UserMixin):
 
     def set_password(self, password: str) -> None:
         """Set hashed password for the user."""
-        self.password = generate_password_hash(password)
+        self.password = password_hasher.hash_password(password)
 
     def check_password(self, password: str) -> bool:
         """Check if provided password matches the stored hash."""
-        return check_password_hash(self.password, password)
+        if not self.password or not password:
+            return False
+        return password_hasher.verify_password(self.password, password)
+
+    def password_needs_rehash(self) -> bool:
+        """Whether the stored hash uses outdated parameters."""
+        return bool(self.password) and password_hasher.needs_rehash(self.password)
+
+
+    @classmethod
+    def get_with_vehicles_count(cls, user_id: str) -> tuple['User | None', int]:
+        """
+        Load a user with its role and number of vehicles in a single query.
+
+        Returns:
+            tuple: (User or None, vehicles count)
+        """
+        from models import Vehicle
+
+        vehicles_count = db.select(func.count(Vehicle.vehicle_id)) \
+            .where(Vehicle.user_id == cls.user_id) \
+            .scalar_subquery()
+        row = db.session.query(cls, vehicles_count) \
+            .options(joinedload(cls.role)) \
+            .filter(cls.user_id == user_id) \
+            .first()
+        return (row[0], row[1]) if row else (None, 0)
 
 
     @staticmethod
@@ -82,8 +112,8 @@ class User(db.Model, UserMixin):
                 )
 
             # Get role
-            role = Role.query.filter_by(role_name=role_name).first()
-            if not role:
+            role_id = reference_cache.get_role_id(role_name)
+            if not role_id:
                 return ErrorHandler.handle_error(
                     None,
                     message=f"Role '{role_name}' not found",
@@ -94,7 +124,7 @@ class User(db.Model, UserMixin):
             user = cls(
                 name=name,
                 email=email,
-                role_id=role.role_id,
+                role_id=role_id,
                 birthday=datetime.strptime(birthday, '%Y-%m-%d').date() if birthday else None
             )
             user.set_password(password)
@@ -109,35 +139,39 @@ class User(db.Model, UserMixin):
 
         except ValueError as ve:
             return ErrorHandler.handle_validation_error(str(ve))
+        except password_hasher.HashingUnavailable:
+            db.session.rollback()
+            raise
         except Exception as e:
             db.session.rollback()
             return ErrorHandler.handle_error(e, "Failed to register user"), 500
 
 
     @classmethod
-    def get_users_by_role(cls, role_name: str) -> tuple[Response, int]:
+    def get_users_by_role(cls, role_name: str, stream: bool = False) -> tuple[Response, int]:
         """
         Get all users with a specific role.
 
         Args:
             role_name (str): Name of the role to filter users by
+            stream (bool): Stream the list as chunked JSON through a server-side cursor
 
         Returns:
             tuple: (JSON response with list of users, HTTP status code)
         """
         try:
-            role = Role.query.filter_by(role_name=role_name).first()
-            if not role:
+            role_id = reference_cache.get_role_id(role_name)
+            if not role_id:
                 return ErrorHandler.handle_error(
                     None,
                     message=f"Role '{role_name}' not found",
                     status_code=404
                 )
 
-            users = cls.query.filter_by(role_id=role.role_id).all()
+            users = cls.query.filter_by(role_id=role_id).order_by(cls.created_at)
 
-            users_data = [
-                {
+            def serialize(user):
+                return {
                     "user_id": str(user.user_id),
                     "name": user.name,
                     "email": user.email,
@@ -145,10 +179,13 @@ class User(db.Model, UserMixin):
                     "birthday": user.birthday.isoformat() if user.birthday else None,
                     "created_at": user.created_at.isoformat(),
                     "email_confirmed": user.email_confirmed
-                } for user in users
-            ]
+                }
 
-            return jsonify({"users": users_data}), 200
+            if stream:
+                rows = iter(users.yield_per(current_app.config['STREAM_CHUNK_ROWS']))
+                return stream_json({}, 'users', rows, serialize), 200
+
+            return jsonify({"users": [serialize(user) for user in users.all()]}), 200
 
         except Exception as e:
             return ErrorHandler.handle_error(e, "Failed to fetch users by role"), 500
@@ -166,7 +203,7 @@ class User(db.Model, UserMixin):
             tuple: (JSON response, HTTP status code)
         """
         try:
-            user = User.query.filter_by(user_id=user_id).first()
+            user, vehicles_count = cls.get_with_vehicles_count(user_id)
             if not user:
                 return ErrorHandler.handle_error(
                     None,
@@ -182,7 +219,7 @@ class User(db.Model, UserMixin):
                 "role": user.role.role_name,
                 "created_at": user.created_at.isoformat(),
                 "email_confirmed": user.email_confirmed,
-                "vehicles_count": len(user.vehicles),
+                "vehicles_count": vehicles_count,
             }
             return jsonify({"user": user_data}), 200
 
@@ -235,7 +272,7 @@ class User(db.Model, UserMixin):
             tuple: (JSON response, HTTP status code)
         """
         try:
-            user = User.query.filter_by(user_id=user_id).first()
+            user, vehicles_count = cls.get_with_vehicles_count(user_id)
             if not user:
                 return ErrorHandler.handle_error(
                     None,
@@ -251,7 +288,7 @@ class User(db.Model, UserMixin):
                 "role": user.role.role_name,
                 "created_at": user.created_at.isoformat(),
                 "email_confirmed": user.email_confirmed,
-                "vehicles_count": len(user.vehicles),
+                "vehicles_count": vehicles_count,
             }), 200
 
         except ValueError:
@@ -293,6 +330,9 @@ class User(db.Model, UserMixin):
 
         except ValueError as ve:
             return ErrorHandler.handle_validation_error(str(ve))
+        except password_hasher.HashingUnavailable:
+            db.session.rollback()
+            raise
         except Exception as e:
             db.session.rollback()
             return ErrorHandler.handle_error(e, "Failed to update password"), 500
@@ -301,4 +341,28 @@ class User(db.Model, UserMixin):
     @staticmethod
     def verify_email(user):
         user.email_confirmed = True
-        db.session.commit()
\ No newline at end of file
+        db.session.commit()
+
+
+@event.listens_for(User, 'before_update')
+def _bump_token_version(mapper, connection, user) -> None:
+    state = inspect(user)
+    if any(state.attrs[attr].history.has_changes() for attr in ('role_id', 'password')) \
+            and not state.attrs.token_version.history.has_changes():
+        user.token_version = (user.token_version or 0) + 1
+
+
+@event.listens_for(User, 'after_update')
+def _invalidate_principal_on_update(mapper, connection, user) -> None:
+    state = inspect(user)
+    if any(state.attrs[attr].history.has_changes() for attr in ('role_id', 'password', 'email_confirmed')):
+        principal_cache.invalidate_on_commit(state.session, user.user_id)
+    if state.attrs.token_version.history.has_changes():
+        token_service.revoke_user_tokens(connection, state.session, user.user_id, user.token_version)
+
+
+@event.listens_for(User, 'after_delete')
+def _invalidate_principal_on_delete(mapper, connection, user) -> None:
+    session = inspect(user).session
+    principal_cache.invalidate_on_commit(session, user.user_id)
+    token_service.revoke_user_tokens(connection, session, user.user_id, token_service.DELETED_USER_VERSION)
@@ -1,10 +1,13 @@
 from db import db
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
+from collections import Counter
 from sqlalchemy.sql import func
 from datetime import datetime
 from flask import jsonify, Response
+from sqlalchemy.orm import contains_eager
 from utils import ErrorHandler, Validator
+from services import alert_counters
 
 
 class Vehicle(db.Model):
@@ -19,6 +22,98 @@ class Vehicle(db.Model):
 
     user = db.relationship('User', back_populates='vehicles')
     tires = db.relationship('Tire', back_populates='vehicle', cascade="all, delete-orphan")
+    device_keys = db.relationship('DeviceKey', back_populates='vehicle', cascade="all, delete-orphan")
+
+
+    @classmethod
+    def get_dashboard(cls, user_id) -> tuple[Response, int]:
+        """
+        Get everything the dashboard shows: all vehicles of a user with their
+        tires' latest state, and the number of tires per alert type.
+
+        Vehicles and tires come from one outer-joined query; the summary reads
+        the user's alert counters instead of scanning tires.
+
+        Args:
+            user_id: UUID of the user
+
+        Returns:
+            tuple: (JSON response, HTTP status code)
+        """
+        from models import Tire
+
+        try:
+            vehicles = db.session.execute(
+                db.select(cls)
+                .outerjoin(cls.tires)
+                .options(contains_eager(cls.tires))
+                .where(cls.user_id == user_id)
+                .order_by(cls.created_at, Tire.label)
+            ).unique().scalars().all()
+            alert_counts = alert_counters.get_counts(user_id)
+
+            return jsonify({
+                "vehicles": [{
+                    "vehicle_id": str(v.vehicle_id),
+                    "make": v.make,
+                    "model": v.model,
+                    "year": v.year,
+                    "created_at": v.created_at.isoformat(),
+                    "tires": [tire.to_state_dict() for tire in v.tires]
+                } for v in vehicles],
+                "summary": {
+                    "vehicles": len(vehicles),
+                    "tires": sum(len(v.tires) for v in vehicles),
+                    "alert_counts": alert_counts
+                }
+            }), 200
+
+        except Exception as e:
+            return ErrorHandler.handle_error(e, "Failed to get dashboard"), 500
+
+
+    @classmethod
+    def get_vehicle_stats(cls, user_id, vehicle_id: str, args: dict) -> tuple[Response, int]:
+        """
+        Get pressure statistics of every tire of a vehicle, computed in one pass.
+
+        Args:
+            user_id: UUID of the user owning the vehicle
+            vehicle_id: UUID of the vehicle
+            args: {
+                'from': str, ISO 8601 timestamp, inclusive lower bound  # Optional, default STATS_DEFAULT_DAYS ago
+                'to': str, ISO 8601 timestamp, exclusive upper bound  # Optional
+            }
+
+        Returns:
+            tuple: (JSON response, HTTP status code)
+        """
+        from models import Tire
+        from services import pressure_analytics
+
+        try:
+            from_at, to_at = Tire.parse_stats_window(args)
+            vehicle = cls.query.filter_by(vehicle_id=uuid.UUID(str(vehicle_id)), user_id=user_id).first()
+            if not vehicle:
+                return ErrorHandler.handle_error(None, message=f"Vehicle {vehicle_id} not found", status_code=404)
+
+            tires = db.session.query(Tire.tire_id, Tire.label, Tire.optimal_pressure, Tire.pressure_unit) \
+                .filter(Tire.vehicle_id == vehicle.vehicle_id) \
+                .order_by(Tire.label) \
+                .all()
+            stats = pressure_analytics.compute_stats([(t.tire_id, t.optimal_pressure) for t in tires], from_at, to_at)
+
+            return jsonify({
+                "vehicle_id": str(vehicle.vehicle_id),
+                "from": from_at.isoformat(),
+                "to": to_at.isoformat() if to_at else None,
+                "tires": [{**s, "label": t.label, "pressure_unit": t.pressure_unit} for t, s in zip(tires, stats)]
+            }), 200
+
+        except ValueError as ve:
+            return ErrorHandler.handle_validation_error(str(ve))
+        except Exception as e:
+            return ErrorHandler.handle_error(e, "Failed to get vehicle statistics"), 500
 
 
     @classmethod
@@ -94,6 +189,10 @@ class Vehicle(db.Model):
             if vehicle.user_id != user_id:
                 return jsonify({"error": "Forbidden: You do not own this vehicle"}), 403
 
+            deltas = Counter()
+            for tire in vehicle.tires:
+                alert_counters.track_change(deltas, vehicle.user_id, tire.current_alert_type, None)
+            alert_counters.apply(deltas)
             db.session.delete(vehicle)
             db.session.commit()
 
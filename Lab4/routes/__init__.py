@@ -5,3 +5,5 @@ from routes.user_profile_routes import user_profile_bp
 from routes.notification_routes import notification_bp
 from routes.tire_routes import tire_bp
 from routes.vehicle_routes import vehicle_bp
+from routes.dashboard_routes import dashboard_bp
+from routes.event_routes import event_bp
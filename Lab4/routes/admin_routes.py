@@ -1,6 +1,8 @@
-from flask import Blueprint, request
+from flask import Blueprint, request, jsonify
 from models import User
+from services import ingest_buffer, dedup_cache, deadband_filter, principal_cache, token_service, password_hasher, email_outbox, alert_dispatcher, event_hub
 from utils.auth_decorator import role_required
+from utils.streaming import wants_stream
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -8,7 +10,7 @@ admin_bp = Blueprint('admin', __name__)
 @admin_bp.route('/users', methods=['Get'])
 @role_required(['admin'])
 def get_users():
-    return User.get_users_by_role(role_name='customer')
+    return User.get_users_by_role(role_name='customer', stream=wants_stream(request.args.get('stream')))
 
 
 @admin_bp.route('/user/user', methods=['Get'])
@@ -28,7 +30,7 @@ def delete_user():
 @admin_bp.route('/admins', methods=['Get'])
 @role_required(['admin'])
 def get_admins():
-    return User.get_users_by_role(role_name='admin')
+    return User.get_users_by_role(role_name='admin', stream=wants_stream(request.args.get('stream')))
 
 
 @admin_bp.route('/register_admin', methods=['Post'])
@@ -36,3 +38,19 @@ def get_admins():
 def register_admin():
     data = request.get_json()
     return User.register_user(data, role_name='admin')
+
+
+@admin_bp.route('/metrics', methods=['Get'])
+@role_required(['admin'])
+def get_metrics():
+    return jsonify({
+        "ingest_buffer": ingest_buffer.get_metrics(),
+        "dedup": dedup_cache.get_metrics(),
+        "deadband": deadband_filter.get_metrics(),
+        "principal_cache": principal_cache.get_metrics(),
+        "token_revocations": token_service.get_metrics(),
+        "password_hasher": password_hasher.get_metrics(),
+        "email_outbox": email_outbox.get_metrics(),
+        "alert_dispatcher": alert_dispatcher.get_metrics(),
+        "event_hub": event_hub.get_metrics()
+    }), 200
@@ -3,6 +3,7 @@ from flask import Blueprint, request
 from models import User
 from services import auth_service, password_reset_service
 from flask_login import login_required
+from utils.auth_decorator import auth_required
 
 
 auth_bp = Blueprint('auth', __name__)
@@ -25,6 +26,26 @@ def token_login():
     return auth_service.token_login_user(data)
 
 
+@auth_bp.route('/refresh_token', methods=['POST'])
+def refresh_token():
+    data = request.get_json(silent=True)
+    return auth_service.refresh_token_user(data)
+
+
+@auth_bp.route('/token_logout', methods=['POST'])
+@auth_required
+def token_logout():
+    token = request.headers.get('Authorization')
+    data = request.get_json(silent=True)
+    return auth_service.token_logout_user(token, data)
+
+
+@auth_bp.route('/token_logout_all', methods=['POST'])
+@auth_required
+def token_logout_all():
+    return auth_service.token_logout_all(request.current_user.user_id)
+
+
 @auth_bp.route('/verify_token', methods=['GET'])
 def verify_token():
     token = request.headers.get('Authorization')
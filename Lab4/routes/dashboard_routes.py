@@ -0,0 +1,12 @@
+from flask import Blueprint, request
+from models import Vehicle
+from utils.auth_decorator import role_required
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+
+@dashboard_bp.route('/dashboard', methods=['Get'])
+@role_required(['customer'])
+def get_dashboard():
+    user = request.current_user
+    return Vehicle.get_dashboard(user.user_id)
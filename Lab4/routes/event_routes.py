@@ -0,0 +1,18 @@
+from flask import Blueprint, request
+from services import event_hub
+from utils import ErrorHandler
+from utils.auth_decorator import role_required
+
+event_bp = Blueprint('event', __name__)
+
+
+@event_bp.route('/events', methods=['Get'])
+@role_required(['customer'])
+def stream_events():
+    user = request.current_user
+    # EventSource sends the header on reconnect; the parameter serves a fresh page load
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        return event_hub.open_stream(user.user_id, last_event_id)
+    except ValueError as ve:
+        return ErrorHandler.handle_validation_error(str(ve))
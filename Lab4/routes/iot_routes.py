@@ -1,19 +1,68 @@
 from flask import Blueprint, request
 from models import PressureReading
-from services import auth_service
+from services import auth_service, device_auth_service
 from utils import ErrorHandler
 
 iot_bp = Blueprint('iot', __name__)
 
 
+def authenticate_sensor(data):
+    """
+    Authenticate an IoT request.
+
+    A gateway key in the 'X-Device-Key' header is preferred; it is checked with
+    an HMAC and limits the request to the tires of one vehicle. Without it the
+    owner's email and password from the request body are used.
+
+    Returns:
+        tuple: (user_id, vehicle_id or None)
+    """
+    device_key = request.headers.get('X-Device-Key')
+    if device_key:
+        device = device_auth_service.authenticate_device(device_key)
+        return device.user_id, device.vehicle_id
+
+    user = auth_service.login_user(data or {})
+    return user.user_id, None
+
+
 @iot_bp.route('/add_reading', methods=['Post'])
 def send_sensor_status():
     data = request.get_json()
-    user = auth_service.login_user(data)
-    if user:
-        return PressureReading.add_reading(user.user_id, data)
-    return ErrorHandler.handle_error(
-        None,
-        message="Invalid credentials",
-        status_code=403
-    )
+    try:
+        user_id, vehicle_id = authenticate_sensor(data)
+    except ValueError as ve:
+        return ErrorHandler.handle_validation_error(str(ve))
+    except PermissionError as pe:
+        return ErrorHandler.handle_error(pe, message="Invalid credentials: ", status_code=403)
+
+    return PressureReading.add_reading(user_id, data, vehicle_id)
+
+
+@iot_bp.route('/add_readings', methods=['Post'])
+def send_sensor_statuses():
+    data = request.get_json()
+    try:
+        user_id, vehicle_id = authenticate_sensor(data)
+    except ValueError as ve:
+        return ErrorHandler.handle_validation_error(str(ve))
+    except PermissionError as pe:
+        return ErrorHandler.handle_error(pe, message="Invalid credentials: ", status_code=403)
+
+    return PressureReading.add_readings_batch(user_id, (data or {}).get('readings'), vehicle_id)
+
+
+@iot_bp.route('/stream', methods=['Post'])
+def stream_sensor_statuses():
+    if not request.headers.get('X-Device-Key'):
+        return ErrorHandler.handle_error(
+            None,
+            message="X-Device-Key header is required for streaming",
+            status_code=401
+        )
+    try:
+        user_id, vehicle_id = authenticate_sensor(None)
+    except PermissionError as pe:
+        return ErrorHandler.handle_error(pe, message="Invalid credentials: ", status_code=403)
+
+    return PressureReading.add_readings_stream(user_id, request.stream, vehicle_id)
@@ -1,6 +1,7 @@
 from flask import Blueprint, request
 from models import Notification
 from utils.auth_decorator import role_required
+from utils.streaming import wants_stream
 
 notification_bp = Blueprint('notification', __name__)
 
@@ -9,7 +10,8 @@ notification_bp = Blueprint('notification', __name__)
 @role_required(['customer']) 
 def get_notifications():
     user = request.current_user
-    return Notification.get_user_notifications(user.user_id)
+    limit = request.args.get('limit', '10')
+    return Notification.get_user_notifications(user.user_id, limit, wants_stream(request.args.get('stream')))
 
 
 @notification_bp.route('/notifications_by_vehicle/vehicle/limit', methods=['Get'])
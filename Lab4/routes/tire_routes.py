@@ -1,6 +1,7 @@
 from flask import Blueprint, request
-from models import Tire
+from models import Tire, PressureReading
 from utils.auth_decorator import role_required
+from utils.streaming import wants_stream
 
 tire_bp = Blueprint('tire', __name__)
 
@@ -21,6 +22,42 @@ def get_tire():
     return Tire.get_tire(tire_id)
 
 
+@tire_bp.route('/tire_readings/tire', methods=['Get'])
+@role_required(['customer'])
+def get_tire_readings():
+    user = request.current_user
+    tire_id = request.args.get('tire')
+    return PressureReading.get_reading_history(user.user_id, tire_id, request.args)
+
+
+@tire_bp.route('/tire_history/tire', methods=['Get'])
+@role_required(['customer'])
+def get_tire_history():
+    user = request.current_user
+    tire_id = request.args.get('tire')
+    data = {
+        'days': request.args.get('days', type=int),
+        'resolution': request.args.get('resolution'),
+        'stream': wants_stream(request.args.get('stream'))
+    }
+    return PressureReading.get_readings_by_timeframe(tire_id, data, user.user_id)
+
+
+@tire_bp.route('/export_readings', methods=['Get'])
+@role_required(['customer'])
+def export_readings():
+    user = request.current_user
+    return PressureReading.export_readings(user.user_id, request.args)
+
+
+@tire_bp.route('/tire/stats', methods=['Get'])
+@role_required(['customer'])
+def get_tire_stats():
+    user = request.current_user
+    tire_id = request.args.get('tire')
+    return Tire.get_tire_stats(user.user_id, tire_id, request.args)
+
+
 @tire_bp.route('/add_tire', methods=['Post'])
 @role_required(['customer']) 
 def add_tire():
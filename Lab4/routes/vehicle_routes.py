@@ -1,5 +1,5 @@
 from flask import Blueprint, request
-from models import Vehicle
+from models import Vehicle, DeviceKey
 from utils.auth_decorator import role_required
 
 vehicle_bp = Blueprint('vehicle', __name__)
@@ -20,6 +20,14 @@ def get_vehicle():
     return Vehicle.get_vehicle(vehicle_id)
 
 
+@vehicle_bp.route('/vehicle/stats', methods=['Get'])
+@role_required(['customer'])
+def get_vehicle_stats():
+    user = request.current_user
+    vehicle_id = request.args.get('vehicle')
+    return Vehicle.get_vehicle_stats(user.user_id, vehicle_id, request.args)
+
+
 @vehicle_bp.route('/add_vehicle', methods=['Post'])
 @role_required(['customer']) 
 def add_vehicle():
@@ -42,3 +50,27 @@ def update_vehicle():
     user = request.current_user
     data = request.get_json()
     return Vehicle.update_vehicle(user.user_id, data)
+
+
+@vehicle_bp.route('/issue_device_key', methods=['Post'])
+@role_required(['customer'])
+def issue_device_key():
+    user = request.current_user
+    data = request.get_json()
+    return DeviceKey.issue_key(user.user_id, data)
+
+
+@vehicle_bp.route('/device_keys/vehicle', methods=['Get'])
+@role_required(['customer'])
+def get_device_keys():
+    user = request.current_user
+    vehicle_id = request.args.get('vehicle')
+    return DeviceKey.get_vehicle_keys(user.user_id, vehicle_id)
+
+
+@vehicle_bp.route('/revoke_device_key/key', methods=['Delete'])
+@role_required(['customer'])
+def revoke_device_key():
+    user = request.current_user
+    key_id = request.args.get('key')
+    return DeviceKey.revoke_key(user.user_id, key_id)
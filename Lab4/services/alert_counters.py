@@ -0,0 +1,83 @@
+from collections import Counter
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from db import db
+
+
+def track_change(deltas: Counter, user_id, old_alert_type, new_alert_type) -> None:
+    """Record that one of the user's tires moved from old_alert_type to new_alert_type."""
+    if old_alert_type == new_alert_type:
+        return
+    if old_alert_type is not None:
+        deltas[(user_id, old_alert_type)] -= 1
+    if new_alert_type is not None:
+        deltas[(user_id, new_alert_type)] += 1
+
+
+def apply(deltas: Counter) -> None:
+    """
+    Add counter deltas in the current transaction without committing.
+
+    One INSERT ... ON CONFLICT DO UPDATE adds them atomically, so concurrent
+    writers for the same user do not lose updates.
+    """
+    from models import UserAlertCounter
+
+    rows = [
+        {'user_id': user_id, 'alert_type': alert_type, 'tire_count': delta}
+        for (user_id, alert_type), delta in deltas.items() if delta
+    ]
+    if not rows:
+        return
+
+    insert = pg_insert(UserAlertCounter).values(rows)
+    db.session.execute(insert.on_conflict_do_update(
+        index_elements=['user_id', 'alert_type'],
+        set_={'tire_count': UserAlertCounter.tire_count + insert.excluded.tire_count}
+    ))
+
+
+def apply_change(user_id, old_alert_type, new_alert_type) -> None:
+    """Shortcut for a single tire's change (or removal, with new_alert_type None)."""
+    deltas = Counter()
+    track_change(deltas, user_id, old_alert_type, new_alert_type)
+    apply(deltas)
+
+
+def get_counts(user_id) -> dict[str, int]:
+    """Tires per alert type of a user (alert types without tires are omitted)."""
+    from models import UserAlertCounter
+
+    return {
+        alert_type: count
+        for alert_type, count in db.session.query(UserAlertCounter.alert_type, UserAlertCounter.tire_count)
+        .filter(UserAlertCounter.user_id == user_id, UserAlertCounter.tire_count > 0)
+    }
+
+
+def rebuild(user_ids=None) -> int:
+    """
+    Recompute counters from tire.current_alert_type, e.g. to repair drift.
+
+    Args:
+        user_ids: Users to rebuild (default: all)
+
+    Returns:
+        int: Number of counter rows written
+    """
+    delete_scope, insert_scope, params = "", "", {}
+    if user_ids is not None:
+        delete_scope = "WHERE user_id = ANY(:user_ids)"
+        insert_scope = "AND v.user_id = ANY(:user_ids)"
+        params['user_ids'] = list(user_ids)
+
+    db.session.execute(db.text(f"DELETE FROM tire_pressure.user_alert_counter {delete_scope}"), params)
+    result = db.session.execute(db.text(f"""
+        INSERT INTO tire_pressure.user_alert_counter (user_id, alert_type, tire_count)
+        SELECT v.user_id, t.current_alert_type, count(*)
+        FROM tire_pressure.tire t
+        JOIN tire_pressure.vehicle v ON v.vehicle_id = t.vehicle_id
+        WHERE t.current_alert_type IS NOT NULL {insert_scope}
+        GROUP BY v.user_id, t.current_alert_type
+    """), params)
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,274 @@
+import atexit
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from flask import current_app
+from sqlalchemy import event, insert, select
+from sqlalchemy.orm import Session
+from services import reference_cache, leak_predictor
+from services.notification_service import build_alert_type_change_notification, build_leak_prediction_notification
+
+ALERT_TYPE_CHANGED = 'alert_type_changed'
+LEAK_PREDICTED = 'leak_predicted'
+
+_thread: threading.Thread | None = None
+_start_lock = threading.Lock()
+_wakeup = threading.Event()
+_stopping = threading.Event()
+_app = None
+# Callables receiving the event dicts of each committed dispatch batch
+_listeners: list = []
+
+_metrics = {
+    'staged': 0,
+    'batches': 0,
+    'dispatched': 0,
+    'notifications': 0,
+    'last_batch_ms': 0.0,
+    'max_batch_ms': 0.0,
+    'total_batch_ms': 0.0,
+}
+_metrics_lock = threading.Lock()
+
+
+def alert_type_changed(tire, user_id, old_alert_type: str | None, new_alert_type: str, reading: dict) -> dict:
+    """Build the event of a tire switching alert type because of a stored reading."""
+    return {
+        'tire_id': tire.tire_id,
+        'user_id': user_id,
+        'event_type': ALERT_TYPE_CHANGED,
+        'old_alert_type': old_alert_type,
+        'new_alert_type': new_alert_type,
+        'payload': _reading_payload(reading)
+    }
+
+
+def leak_predicted(tire, user_id, prediction, reading: dict) -> dict:
+    """Build the event of a tire predicted to reach critical pressure."""
+    return {
+        'tire_id': tire.tire_id,
+        'user_id': user_id,
+        'event_type': LEAK_PREDICTED,
+        'old_alert_type': tire.current_alert_type,
+        'new_alert_type': None,
+        'payload': {**_reading_payload(reading), 'prediction': leak_predictor.to_dict(prediction)}
+    }
+
+
+def stage(events: list[dict]) -> None:
+    """
+    Write events in the current transaction without committing.
+
+    They are dispatched once the transaction commits; a rolled back
+    transaction leaves nothing behind.
+    """
+    from db import db
+    from models import AlertEvent
+
+    if not events:
+        return
+
+    db.session.execute(insert(AlertEvent), events)
+    db.session.info['alert_dispatch_wakeup'] = True
+    _ensure_started()
+    _count('staged', len(events))
+
+
+def dispatch(max_events: int | None = None) -> int:
+    """
+    Materialize notifications for up to max_events undispatched events and commit.
+
+    Events are claimed in event_id order with FOR UPDATE SKIP LOCKED, so
+    dispatchers of several worker processes never handle the same event.
+    Listeners are called with the dispatched events after the commit.
+
+    Must run inside an application context.
+
+    Returns:
+        int: Number of events dispatched
+    """
+    from db import db
+    from models import AlertEvent, Tire
+
+    max_events = max_events or current_app.config['ALERT_DISPATCH_BATCH_SIZE']
+    started = time.perf_counter()
+    try:
+        events = db.session.execute(
+            select(AlertEvent)
+            .where(AlertEvent.dispatched_at.is_(None))
+            .order_by(AlertEvent.event_id)
+            .limit(max_events)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not events:
+            db.session.rollback()
+            return 0
+
+        tires = {
+            tire.tire_id: tire
+            for tire in db.session.query(Tire).filter(Tire.tire_id.in_({e.tire_id for e in events}))
+        }
+        dispatched_at = datetime.now(timezone.utc)
+        notifications = []
+        for alert_event in events:
+            notification = _build_notification(alert_event, tires.get(alert_event.tire_id))
+            if notification is not None:
+                notification.notification_id = uuid.uuid4()
+                notification.sent_at = dispatched_at
+                alert_event.notification = notification
+                notifications.append(notification)
+            alert_event.dispatched_at = dispatched_at
+        db.session.add_all(notifications)
+
+        # Plain copies: the ORM objects expire on commit
+        delivered = [to_dict(alert_event, alert_event.notification) for alert_event in events]
+        db.session.commit()
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _metrics_lock:
+        _metrics['batches'] += 1
+        _metrics['dispatched'] += len(events)
+        _metrics['notifications'] += len(notifications)
+        _metrics['last_batch_ms'] = elapsed_ms
+        _metrics['max_batch_ms'] = max(_metrics['max_batch_ms'], elapsed_ms)
+        _metrics['total_batch_ms'] += elapsed_ms
+
+    for listener in list(_listeners):
+        try:
+            listener(delivered)
+        except Exception as e:
+            current_app.logger.error(f"Alert event listener failed: {str(e)}")
+
+    return len(events)
+
+
+def add_listener(listener) -> None:
+    """Register a callable receiving the event dicts (see to_dict) of each dispatched batch."""
+    _listeners.append(listener)
+
+
+def to_dict(alert_event, notification=None) -> dict:
+    """An alert event with the notification materialized from it (None if there is none)."""
+    return {
+        "event_id": alert_event.event_id,
+        "event_type": alert_event.event_type,
+        "tire_id": str(alert_event.tire_id),
+        "user_id": str(alert_event.user_id),
+        "old_alert_type": alert_event.old_alert_type,
+        "new_alert_type": alert_event.new_alert_type,
+        "payload": alert_event.payload,
+        "created_at": alert_event.created_at.isoformat() if alert_event.created_at else None,
+        "notification": {
+            "notification_id": str(notification.notification_id),
+            "title": notification.title,
+            "body": notification.body,
+            "sent_at": notification.sent_at.isoformat()
+        } if notification is not None else None
+    }
+
+
+def purge(older_than) -> int:
+    """Delete dispatched events created before older_than, and commit."""
+    from db import db
+    from models import AlertEvent
+
+    deleted = AlertEvent.query \
+        .filter(AlertEvent.dispatched_at.isnot(None), AlertEvent.created_at < older_than) \
+        .delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+def stop() -> None:
+    """Stop the dispatcher thread after its current batch; undispatched events stay in the outbox."""
+    _stopping.set()
+    _wakeup.set()
+    if _thread is not None:
+        _thread.join()
+
+
+def get_metrics() -> dict:
+    """Dispatch statistics of this process."""
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    metrics['avg_batch_ms'] = metrics['total_batch_ms'] / metrics['batches'] if metrics['batches'] else 0.0
+    return metrics
+
+
+def _build_notification(alert_event, tire):
+    if tire is None:
+        return None
+    if alert_event.event_type == ALERT_TYPE_CHANGED:
+        new_alert = reference_cache.get_alert_type(alert_event.new_alert_type)
+        if new_alert is None:
+            return None
+        return build_alert_type_change_notification(tire, alert_event.old_alert_type, new_alert)
+    if alert_event.event_type == LEAK_PREDICTED:
+        prediction = leak_predictor.from_dict(alert_event.payload.get('prediction'))
+        return build_leak_prediction_notification(tire, prediction, alert_event.old_alert_type)
+    return None
+
+
+def _reading_payload(reading: dict) -> dict:
+    return {
+        "reading_id": str(reading['reading_id']),
+        "pressure_value": reading['pressure_value'],
+        "measured_at": reading['created_at'].isoformat()
+    }
+
+
+def _ensure_started() -> None:
+    # Started lazily so the thread lives in the worker process, not a preforking master
+    global _thread, _app
+    if _thread is not None:
+        return
+
+    with _start_lock:
+        if _thread is not None:
+            return
+
+        _app = current_app._get_current_object()
+        _thread = threading.Thread(target=_run, name='alert-dispatcher', daemon=True)
+        _thread.start()
+        atexit.register(stop)
+
+
+def _run() -> None:
+    interval = _app.config['ALERT_DISPATCH_INTERVAL_MS'] / 1000
+    batch_size = _app.config['ALERT_DISPATCH_BATCH_SIZE']
+
+    while not _stopping.is_set():
+        # Woken right after a commit that staged events; the poll also picks
+        # up events left by other processes
+        _wakeup.wait(interval)
+        _wakeup.clear()
+        if _stopping.is_set():
+            break
+
+        with _app.app_context():
+            try:
+                while dispatch(batch_size) == batch_size and not _stopping.is_set():
+                    pass
+            except Exception as e:
+                _app.logger.error(f"Alert dispatcher error: {str(e)}")
+
+
+def _count(key: str, amount: int = 1) -> None:
+    with _metrics_lock:
+        _metrics[key] += amount
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session) -> None:
+    if session.info.pop('alert_dispatch_wakeup', False):
+        _wakeup.set()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session) -> None:
+    session.info.pop('alert_dispatch_wakeup', None)
@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Optional
+from flask import current_app
+from services import reference_cache
+from services.reference_cache import AlertTypeInfo
+
+
+def evaluate(tire, deviation_ratio: float, created_at: datetime,
+             current_alert_type: Optional[str]) -> Optional[AlertTypeInfo]:
+    """
+    Feed a reading to the tire's alert state machine and return the alert type it is in afterwards.
+
+    The band classification only proposes a candidate. The tire leaves its
+    current alert type once readings fall outside the current band widened
+    by ALERT_HYSTERESIS_MARGIN for ALERT_CONFIRM_READINGS consecutive
+    readings, or for at least ALERT_CONFIRM_SECONDS; it then moves to the
+    latest candidate. Escalations to ALERT_IMMEDIATE_SEVERITY or above apply
+    at once. A reading back inside the widened band cancels the pending
+    transition.
+
+    The pending transition is kept in the Tire.alert_pending_* columns, so
+    the caller's commit persists it together with the reading.
+
+    Args:
+        tire: Tire the reading belongs to
+        deviation_ratio: Measured / optimal pressure
+        created_at: Time of the reading
+        current_alert_type: Alert type of the tire as of the previous reading
+
+    Returns:
+        AlertTypeInfo or None if no alert type matches
+    """
+    config = current_app.config
+    candidate = reference_cache.classify_deviation(deviation_ratio)
+    current = reference_cache.get_alert_type(current_alert_type)
+    if candidate is None or current is None:
+        # Nothing to debounce against, e.g. the tire's first reading
+        reset(tire)
+        return candidate
+
+    margin = config['ALERT_HYSTERESIS_MARGIN']
+    if candidate.alert_type == current.alert_type or \
+            current.deviation_min - margin <= deviation_ratio <= current.deviation_max + margin:
+        reset(tire)
+        return current
+
+    if current.severity_level < candidate.severity_level >= config['ALERT_IMMEDIATE_SEVERITY']:
+        reset(tire)
+        return candidate
+
+    count = (tire.alert_pending_count or 0) + 1
+    since = tire.alert_pending_since or created_at
+    dwell_seconds = config['ALERT_CONFIRM_SECONDS']
+    if count >= config['ALERT_CONFIRM_READINGS'] or (
+            dwell_seconds > 0 and count > 1 and (created_at - since).total_seconds() >= dwell_seconds):
+        reset(tire)
+        return candidate
+
+    tire.alert_pending_type, tire.alert_pending_count, tire.alert_pending_since = candidate.alert_type, count, since
+    return current
+
+
+def reset(tire) -> None:
+    """Cancel a pending transition of the tire."""
+    if tire.alert_pending_count:
+        tire.alert_pending_type, tire.alert_pending_count, tire.alert_pending_since = None, None, None
@@ -2,13 +2,19 @@ from models import User
 from app import login_manager
 from services.email_confirm_service import EmailConfirmService
 from utils import ErrorHandler, JwtUtils
-from flask import jsonify
+from db import db
+from flask import jsonify, current_app
 import flask_login
+from sqlalchemy import update
+from services import principal_cache, token_service, password_hasher
 
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(user_id)
+    try:
+        return principal_cache.get_principal(user_id)
+    except ValueError:
+        return None
 
 
 def session_login_user(data):
@@ -24,6 +30,8 @@ def session_login_user(data):
         return ErrorHandler.handle_validation_error(str(ve))
     except PermissionError as pe:
         return ErrorHandler.handle_error(pe, message=str(pe), status_code=403)
+    except password_hasher.HashingUnavailable:
+        raise
     except RuntimeError as re:
         return ErrorHandler.handle_error(re, message=str(re), status_code=500)
     except Exception as e:
@@ -38,8 +46,9 @@ def token_login_user(data):
     try:
         user = login_user(data)
         if user:
-            token = JwtUtils.generate_jwt({'user_id': str(user.user_id)})
-            return jsonify({'message': 'Logged in successfully.', 'token': token}), 200
+            tokens = token_service.issue_tokens(user)
+            # 'token' is kept for clients written before refresh tokens existed
+            return jsonify({'message': 'Logged in successfully.', 'token': tokens['access_token'], **tokens}), 200
 
         raise PermissionError('Invalid credentials.')
 
@@ -47,6 +56,8 @@ def token_login_user(data):
         return ErrorHandler.handle_validation_error(str(ve))
     except PermissionError as pe:
         return ErrorHandler.handle_error(pe, message=str(pe), status_code=403)
+    except password_hasher.HashingUnavailable:
+        raise
     except RuntimeError as re:
         return ErrorHandler.handle_error(re, message=str(re), status_code=500)
     except Exception as e:
@@ -57,6 +68,94 @@ def token_login_user(data):
         )
 
 
+def refresh_token_user(data):
+    """
+    Exchange a refresh token for a new access and refresh token pair.
+
+    Args:
+        data: {'refresh_token': str}
+    """
+    try:
+        refresh_token = (data or {}).get('refresh_token')
+        if not refresh_token:
+            raise ValueError("Refresh token is required.")
+
+        tokens = token_service.refresh(refresh_token)
+        return jsonify({'message': 'Token refreshed successfully.', 'token': tokens['access_token'], **tokens}), 200
+
+    except ValueError as ve:
+        db.session.rollback()
+        return ErrorHandler.handle_error(ve, message=str(ve), status_code=401)
+    except Exception as e:
+        db.session.rollback()
+        return ErrorHandler.handle_error(
+            e,
+            message="Internal server error during token refresh",
+            status_code=500
+        )
+
+
+def token_logout_user(token: str | None, data):
+    """
+    Revoke the access token of the request and, if given, its refresh token.
+
+    Args:
+        token: The 'Authorization' header content (may include 'Bearer ' prefix)
+        data: {'refresh_token': str}  # Optional
+    """
+    try:
+        clean_token = token[7:] if token and token.startswith("Bearer ") else token
+        if not clean_token:
+            raise ValueError("Token is missing.")
+
+        payload = JwtUtils.decode_jwt(clean_token)
+        token_service.check_not_revoked(payload)
+        token_service.revoke_token(payload)
+
+        refresh_token = (data or {}).get('refresh_token')
+        if refresh_token:
+            refresh_payload = JwtUtils.decode_jwt(refresh_token)
+            if refresh_payload.get('user_id') != payload.get('user_id'):
+                raise ValueError("Refresh token belongs to another user.")
+            token_service.revoke_token(refresh_payload)
+
+        token_service.purge_expired()
+        db.session.commit()
+        return jsonify({'message': 'Logged out successfully.'}), 200
+
+    except ValueError as ve:
+        db.session.rollback()
+        return ErrorHandler.handle_error(ve, message=str(ve), status_code=401)
+    except Exception as e:
+        db.session.rollback()
+        return ErrorHandler.handle_error(
+            e,
+            message="Internal server error during token logout",
+            status_code=500
+        )
+
+
+def token_logout_all(user_id):
+    """Revoke every token issued to a user so far, on all devices."""
+    try:
+        user = db.session.get(User, user_id)
+        if not user:
+            return ErrorHandler.handle_error(None, message="User not found", status_code=404)
+
+        # The mapper events record the revocation of all older versions
+        user.token_version = (user.token_version or 0) + 1
+        db.session.commit()
+        return jsonify({'message': 'Logged out from all devices successfully.'}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return ErrorHandler.handle_error(
+            e,
+            message="Internal server error during token logout",
+            status_code=500
+        )
+
+
 def login_user(data):
     email = data.get('email')
     if not email:
@@ -71,11 +170,35 @@ def login_user(data):
         raise PermissionError("Please confirm your email first.")
 
     if user.check_password(data.get('password')):
+        if user.password_needs_rehash():
+            rehash_password(user, data.get('password'))
         return user
 
     raise PermissionError('Invalid credentials.')
 
 
+def rehash_password(user, password: str) -> None:
+    """
+    Re-hash a just verified password with the current PASSWORD_HASH_METHOD.
+
+    Written with a plain UPDATE, so it is not treated as a password change
+    (which would revoke the user's tokens), and only if the hash did not
+    change concurrently. Best effort: the login succeeds even if the pool is
+    busy or the commit fails, and the upgrade is retried on the next login.
+    """
+    try:
+        new_hash = password_hasher.hash_password(password)
+        db.session.execute(
+            update(User)
+            .where(User.user_id == user.user_id, User.password == user.password)
+            .values(password=new_hash)
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.warning(f"Failed to rehash password of user {user.user_id}: {str(e)}")
+
+
 def logout_user():
     try:
         if flask_login.current_user.is_authenticated:
@@ -114,7 +237,7 @@ def verify_token(token: str | None) -> tuple[dict, int]:
         - Returns 401 if:
             - Token is missing
             - Token has invalid format
-            - Token is expired/invalid
+            - Token is expired/invalid/revoked
         - Returns 500 for unexpected server errors
         - Returns 200 with user_id for valid tokens
     """
@@ -129,12 +252,14 @@ def verify_token(token: str | None) -> tuple[dict, int]:
 
     # Token validation
     try:
-        payload = JwtUtils.decode_jwt(clean_token)
+        principal = token_service.authenticate(clean_token)
+        if not principal:
+            return {"valid": False, "message": "User not found"}, 401
         return {
             "valid": True,
-            "user_id": payload.get("user_id")
+            "user_id": str(principal.user_id)
         }, 200
     except ValueError as e:
         return {"valid": False, "message": str(e)}, 401
     except Exception:
-        return {"valid": False, "message": "Token verification failed"}, 500
\ No newline at end of file
+        return {"valid": False, "message": "Token verification failed"}, 500
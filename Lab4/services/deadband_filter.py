@@ -0,0 +1,84 @@
+import threading
+from datetime import datetime
+from typing import NamedTuple, Optional
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class StoredReading(NamedTuple):
+    pressure_value: float
+    alert_type: Optional[str]
+    created_at: datetime
+
+
+# tire_id -> last reading that was actually persisted (by this process)
+_last_stored: dict = {}
+_lock = threading.Lock()
+_metrics = {'received': 0, 'stored': 0, 'suppressed': 0}
+
+
+def get_last_stored(tire_id) -> Optional[StoredReading]:
+    with _lock:
+        return _last_stored.get(tire_id)
+
+
+def should_store(last: Optional[StoredReading], optimal_pressure: float, pressure_value: float,
+                 old_alert_type: Optional[str], new_alert_type: Optional[str], created_at: datetime) -> bool:
+    """
+    Decide whether a reading is worth persisting.
+
+    A reading is stored when deadband filtering is disabled, when nothing is
+    known about the tire yet, when it changes the alert type, when it is not
+    newer than the last stored one, when it moves by more than the deadband
+    (DEADBAND_ABSOLUTE, or DEADBAND_PERCENT of the optimal pressure, whichever
+    is larger) or when DEADBAND_HEARTBEAT_SECONDS passed since the last stored one.
+    """
+    config = current_app.config
+    if not config['DEADBAND_ENABLED'] or last is None:
+        return _count(True)
+    if new_alert_type != old_alert_type or new_alert_type != last.alert_type or created_at <= last.created_at:
+        return _count(True)
+    if (created_at - last.created_at).total_seconds() >= config['DEADBAND_HEARTBEAT_SECONDS']:
+        return _count(True)
+
+    deadband = max(config['DEADBAND_ABSOLUTE'], optimal_pressure * config['DEADBAND_PERCENT'] / 100)
+    return _count(abs(pressure_value - last.pressure_value) > deadband)
+
+
+def remember_on_commit(tire_id, reading: StoredReading) -> None:
+    """Record a persisted reading once the current transaction commits."""
+    from db import db
+    db.session.info.setdefault('deadband_readings', []).append((tire_id, reading))
+
+
+def get_metrics() -> dict:
+    with _lock:
+        metrics = dict(_metrics)
+    metrics['suppression_ratio'] = metrics['suppressed'] / metrics['received'] if metrics['received'] else 0.0
+    return metrics
+
+
+def _count(store: bool) -> bool:
+    with _lock:
+        _metrics['received'] += 1
+        _metrics['stored' if store else 'suppressed'] += 1
+    return store
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session) -> None:
+    readings = session.info.pop('deadband_readings', None)
+    if not readings:
+        return
+
+    with _lock:
+        for tire_id, reading in readings:
+            last = _last_stored.get(tire_id)
+            if last is None or reading.created_at >= last.created_at:
+                _last_stored[tire_id] = reading
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session) -> None:
+    session.info.pop('deadband_readings', None)
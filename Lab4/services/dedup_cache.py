@@ -0,0 +1,64 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# (tire_id, message_id) -> time it was stored, least recently seen first
+_recent: OrderedDict = OrderedDict()
+_lock = threading.Lock()
+_metrics = {'cache_hits': 0, 'db_conflicts': 0}
+
+
+def seen(key: tuple) -> bool:
+    """Check whether a reading key was stored within DEDUP_WINDOW_SECONDS."""
+    window = current_app.config['DEDUP_WINDOW_SECONDS']
+    with _lock:
+        stored_at = _recent.get(key)
+        if stored_at is None:
+            return False
+        if time.monotonic() - stored_at > window:
+            del _recent[key]
+            return False
+        _recent.move_to_end(key)
+        _metrics['cache_hits'] += 1
+        return True
+
+
+def remember_on_commit(key: tuple) -> None:
+    """Add a reading key to the cache once the current transaction commits."""
+    from db import db
+    db.session.info.setdefault('dedup_keys', []).append(key)
+
+
+def count_conflict() -> None:
+    """Count a duplicate that got past the cache and was rejected by the database."""
+    with _lock:
+        _metrics['db_conflicts'] += 1
+
+
+def get_metrics() -> dict:
+    with _lock:
+        return {**_metrics, 'size': len(_recent)}
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session) -> None:
+    keys = session.info.pop('dedup_keys', None)
+    if not keys:
+        return
+
+    capacity = current_app.config['DEDUP_CACHE_SIZE']
+    now = time.monotonic()
+    with _lock:
+        for key in keys:
+            _recent[key] = now
+            _recent.move_to_end(key)
+        while len(_recent) > capacity:
+            _recent.popitem(last=False)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session) -> None:
+    session.info.pop('dedup_keys', None)
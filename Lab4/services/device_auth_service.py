@@ -0,0 +1,88 @@
+import hashlib
+import hmac
+import threading
+import time
+import uuid
+from typing import NamedTuple
+from flask import current_app
+from models import DeviceKey, Vehicle
+
+# key_id -> (key_hash, vehicle_id, user_id, expires_at)
+_verified_keys: dict[str, tuple[str, uuid.UUID, uuid.UUID, float]] = {}
+_lock = threading.Lock()
+
+
+class DeviceIdentity(NamedTuple):
+    key_id: str
+    vehicle_id: uuid.UUID
+    user_id: uuid.UUID
+
+
+def hash_secret(secret: str) -> str:
+    """Return the HMAC-SHA256 digest of a device key secret."""
+    return hmac.new(
+        current_app.config['SECRET_KEY'].encode(),
+        secret.encode(),
+        hashlib.sha256
+    ).hexdigest()
+
+
+def authenticate_device(device_key: str) -> DeviceIdentity:
+    """
+    Verify a '<key_id>.<secret>' device key.
+
+    Known keys are served from an in-process cache for DEVICE_KEY_CACHE_TTL
+    seconds, so a revoked key stops working on other workers after at most
+    one TTL.
+
+    Args:
+        device_key: Key as issued by DeviceKey.issue_key
+
+    Returns:
+        DeviceIdentity: Vehicle and owner the key belongs to
+
+    Raises:
+        PermissionError: If the key is malformed, unknown, revoked or wrong
+    """
+    key_id, _, secret = (device_key or '').partition('.')
+    if not key_id or not secret:
+        raise PermissionError('Invalid device key.')
+
+    now = time.monotonic()
+    with _lock:
+        cached = _verified_keys.get(key_id)
+    if cached is None or cached[3] < now:
+        cached = _load_key(key_id, now)
+
+    key_hash, vehicle_id, user_id, _ = cached
+    if not hmac.compare_digest(key_hash, hash_secret(secret)):
+        raise PermissionError('Invalid device key.')
+
+    return DeviceIdentity(key_id, vehicle_id, user_id)
+
+
+def evict_key(key_id: str) -> None:
+    """Drop a key from this process' verified-key cache."""
+    with _lock:
+        _verified_keys.pop(str(key_id), None)
+
+
+def _load_key(key_id: str, now: float) -> tuple[str, uuid.UUID, uuid.UUID, float]:
+    try:
+        parsed_id = uuid.UUID(key_id)
+    except ValueError:
+        raise PermissionError('Invalid device key.')
+
+    row = DeviceKey.query \
+        .join(Vehicle) \
+        .with_entities(DeviceKey.key_hash, DeviceKey.vehicle_id, Vehicle.user_id) \
+        .filter(DeviceKey.key_id == parsed_id, DeviceKey.revoked_at.is_(None)) \
+        .first()
+    if not row:
+        evict_key(key_id)
+        raise PermissionError('Invalid device key.')
+
+    entry = (row.key_hash, row.vehicle_id, row.user_id, now + current_app.config['DEVICE_KEY_CACHE_TTL'])
+    with _lock:
+        _verified_keys[key_id] = entry
+    return entry
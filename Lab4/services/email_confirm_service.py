@@ -1,10 +1,10 @@
 from models import User
-from app import mail
+from db import db
 from config import Config
 from itsdangerous import URLSafeTimedSerializer
-from flask_mail import Message
 from flask import url_for, render_template, jsonify, Response
 from utils import ErrorHandler
+from services import email_outbox
 
 s = URLSafeTimedSerializer(Config.SECRET_KEY)
 
@@ -12,14 +12,14 @@ class EmailConfirmService:
     @staticmethod
     def send_email_confirmation(user: User) -> tuple[Response, int]:
         """
-        Send an email confirmation link to the user.
+        Queue an email confirmation link to the user.
 
         Args:
             user (User): The User object for whom the email confirmation is being sent.
 
         Returns:
             tuple[Response, int]: A tuple containing the JSON response and HTTP status code.
-                - Success: ({"message": "The email confirmation was sent successfully."}, 200)
+                - Success: ({"message": "The email confirmation was queued successfully."}, 200)
                 - Error: Response from ErrorHandler with status code 500.
 
         Raises:
@@ -29,9 +29,11 @@ class EmailConfirmService:
             token = s.dumps(user.email, salt='email-confirm-salt')
             confirmation_url = url_for('auth.confirm_email', token=token, _external=True)
 
-            msg = Message(
+            # Throttled: an unconfirmed user trying to log in gets one email per window
+            email_outbox.enqueue(
+                'email_confirmation',
+                user.email,
                 "Email Confirmation",
-                recipients=[user.email],
                 body=f"To confirm your email address, visit the following link: {confirmation_url}",
                 html=render_template(
                     "email_confirmation.html",
@@ -39,11 +41,12 @@ class EmailConfirmService:
                     confirmation_url=confirmation_url
                 )
             )
+            db.session.commit()
 
-            mail.send(msg)
-            return jsonify({'message': 'The email confirmation was sent successfully.'}), 200
+            return jsonify({'message': 'The email confirmation was queued successfully.'}), 200
 
         except Exception as e:
+            db.session.rollback()
             return ErrorHandler.handle_error(
                 e,
                 message="Internal server error while sending the email confirmation.",
@@ -53,7 +56,7 @@ class EmailConfirmService:
     @staticmethod
     def send_user_registered_email(user: User, password: str) -> tuple[Response, int]:
         """
-        Send a registration notification email to the user with their role and temporary password.
+        Queue a registration notification email to the user with their role and temporary password.
 
         Args:
             user (User): The User object who has been registered.
@@ -61,7 +64,7 @@ class EmailConfirmService:
 
         Returns:
             tuple[Response, int]: A tuple containing the JSON response and HTTP status code.
-                - Success: ({"message": "User registered notification was sent successfully."}, 200)
+                - Success: ({"message": "User registered notification was queued successfully."}, 200)
                 - Error: Response from ErrorHandler with status code 500.
 
         Raises:
@@ -71,9 +74,10 @@ class EmailConfirmService:
             token = s.dumps(user.email, salt='email-confirm-salt')
             confirmation_url = url_for('auth.confirm_email', token=token, _external=True)
 
-            msg = Message(
+            email_outbox.enqueue(
+                'user_registered',
+                user.email,
                 "User Registration Notification",
-                recipients=[user.email],
                 body=f"You were registered as {user.role.role_name} with password: {password}!\n"
                      f"To confirm your email address, visit the following link: {confirmation_url}",
                 html=render_template(
@@ -83,13 +87,15 @@ class EmailConfirmService:
                     role=user.role.role_name,
                     password=password,
                     confirmation_url=confirmation_url
-                )
+                ),
+                throttle=False
             )
+            db.session.commit()
 
-            mail.send(msg)
-            return jsonify({'message': 'User registered notification was sent successfully.'}), 200
+            return jsonify({'message': 'User registered notification was queued successfully.'}), 200
 
         except Exception as e:
+            db.session.rollback()
             return ErrorHandler.handle_error(
                 e,
                 message="Internal server error while sending the user registered notification.",
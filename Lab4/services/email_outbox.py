@@ -0,0 +1,232 @@
+import atexit
+import threading
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from flask_mail import Message
+from sqlalchemy import event, select, delete, func
+from sqlalchemy.orm import Session
+
+_thread: threading.Thread | None = None
+_start_lock = threading.Lock()
+_wakeup = threading.Event()
+_stopping = threading.Event()
+_app = None
+
+_metrics = {
+    'queued': 0,
+    'throttled': 0,
+    'batches': 0,
+    'sent': 0,
+    'retried': 0,
+    'failed': 0,
+}
+_metrics_lock = threading.Lock()
+
+
+def enqueue(template: str, recipient: str, subject: str, body: str, html: str | None = None,
+            throttle: bool = True) -> bool:
+    """
+    Queue an email in the current transaction without committing.
+
+    The background sender picks it up once the transaction commits, so a
+    rolled back request sends nothing. Throttled emails are not queued if the
+    same template was queued for the recipient within EMAIL_THROTTLE_SECONDS;
+    emails carrying something new (e.g. a generated password) must not be.
+
+    Returns:
+        bool: False if the email was throttled
+    """
+    from db import db
+    from models import EmailOutbox
+
+    window = current_app.config['EMAIL_THROTTLE_SECONDS']
+    if throttle and window > 0:
+        recent = db.session.query(EmailOutbox.email_id) \
+            .filter(EmailOutbox.recipient == recipient,
+                    EmailOutbox.template == template,
+                    EmailOutbox.status != 'failed',
+                    EmailOutbox.created_at >= datetime.now(timezone.utc) - timedelta(seconds=window)) \
+            .first()
+        if recent:
+            _count('throttled')
+            return False
+
+    db.session.add(EmailOutbox(
+        template=template,
+        recipient=recipient,
+        subject=subject,
+        body=body,
+        html=html
+    ))
+    db.session.info['email_outbox_wakeup'] = True
+    _ensure_started()
+    _count('queued')
+    return True
+
+
+def send_due(max_rows: int | None = None) -> int:
+    """
+    Send up to max_rows due emails over a single SMTP connection and commit.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED, so senders of several worker
+    processes never send the same email. A failed email is retried with
+    exponential backoff, up to EMAIL_MAX_ATTEMPTS attempts.
+
+    Must run inside an application context.
+
+    Returns:
+        int: Number of emails attempted
+    """
+    from app import mail
+    from db import db
+    from models import EmailOutbox
+
+    max_rows = max_rows or current_app.config['EMAIL_OUTBOX_BATCH_SIZE']
+    try:
+        emails = db.session.execute(
+            select(EmailOutbox)
+            .where(EmailOutbox.status == 'pending', EmailOutbox.next_attempt_at <= func.now())
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(max_rows)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not emails:
+            db.session.rollback()
+            return 0
+
+        attempted = set()
+        try:
+            with mail.connect() as connection:
+                for email in emails:
+                    attempted.add(email.email_id)
+                    try:
+                        connection.send(Message(
+                            email.subject,
+                            recipients=[email.recipient],
+                            body=email.body,
+                            html=email.html
+                        ))
+                    except Exception as e:
+                        _schedule_retry(email, e)
+                    else:
+                        _mark_sent(email)
+        except Exception as e:
+            # Connecting failed, or the connection broke while closing it
+            current_app.logger.warning(f"SMTP connection failed: {str(e)}")
+            for email in emails:
+                if email.email_id not in attempted:
+                    _schedule_retry(email, e)
+
+        db.session.commit()
+        _count('batches')
+        return len(emails)
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def purge(older_than_days: int) -> int:
+    """Delete sent and failed emails created more than older_than_days ago, and commit."""
+    from db import db
+    from models import EmailOutbox
+
+    result = db.session.execute(
+        delete(EmailOutbox).where(
+            EmailOutbox.status != 'pending',
+            EmailOutbox.created_at < datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        )
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def stop() -> None:
+    """Stop the sender thread after its current batch; pending emails stay in the outbox."""
+    _stopping.set()
+    _wakeup.set()
+    if _thread is not None:
+        _thread.join()
+
+
+def get_metrics() -> dict:
+    """Outbox statistics of this process."""
+    with _metrics_lock:
+        return dict(_metrics)
+
+
+def _mark_sent(email) -> None:
+    email.status = 'sent'
+    email.attempts += 1
+    email.sent_at = datetime.now(timezone.utc)
+    email.last_error = None
+    email.body, email.html = None, None
+    _count('sent')
+
+
+def _schedule_retry(email, error: Exception) -> None:
+    config = current_app.config
+    email.attempts += 1
+    email.last_error = str(error)[:1000]
+    if email.attempts >= config['EMAIL_MAX_ATTEMPTS']:
+        email.status = 'failed'
+        email.body, email.html = None, None
+        current_app.logger.error(f"Giving up on email {email.email_id} to {email.recipient}: {str(error)}")
+        _count('failed')
+        return
+
+    delay = min(config['EMAIL_RETRY_BASE_SECONDS'] * 2 ** (email.attempts - 1), config['EMAIL_RETRY_MAX_SECONDS'])
+    email.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+    _count('retried')
+
+
+def _ensure_started() -> None:
+    # Started lazily so the thread lives in the worker process, not a preforking master
+    global _thread, _app
+    if _thread is not None:
+        return
+
+    with _start_lock:
+        if _thread is not None:
+            return
+
+        _app = current_app._get_current_object()
+        _thread = threading.Thread(target=_run, name='email-sender', daemon=True)
+        _thread.start()
+        atexit.register(stop)
+
+
+def _run() -> None:
+    poll_seconds = _app.config['EMAIL_OUTBOX_POLL_SECONDS']
+    batch_size = _app.config['EMAIL_OUTBOX_BATCH_SIZE']
+
+    while not _stopping.is_set():
+        # Woken right after a commit that queued an email; the poll also picks
+        # up retries and emails queued by other processes
+        _wakeup.wait(poll_seconds)
+        _wakeup.clear()
+        if _stopping.is_set():
+            break
+
+        with _app.app_context():
+            try:
+                while send_due(batch_size) == batch_size and not _stopping.is_set():
+                    pass
+            except Exception as e:
+                _app.logger.error(f"Email sender error: {str(e)}")
+
+
+def _count(key: str) -> None:
+    with _metrics_lock:
+        _metrics[key] += 1
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session) -> None:
+    if session.info.pop('email_outbox_wakeup', False):
+        _wakeup.set()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session) -> None:
+    session.info.pop('email_outbox_wakeup', None)
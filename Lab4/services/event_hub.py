@@ -0,0 +1,308 @@
+import atexit
+import json
+import queue
+import select
+import threading
+import uuid
+from flask import Response, current_app
+from werkzeug.exceptions import ServiceUnavailable
+from services import alert_dispatcher
+from utils.streaming import sse_message
+
+# PostgreSQL NOTIFY channel carrying events to the hub of every worker process
+CHANNEL = 'tire_pressure_events'
+# NOTIFY payloads must stay below 8000 bytes
+MAX_PAYLOAD_BYTES = 7900
+
+_subscribers: dict[uuid.UUID, set['Subscription']] = {}
+_lock = threading.Lock()
+_listener: threading.Thread | None = None
+_start_lock = threading.Lock()
+_stopping = threading.Event()
+_app = None
+
+_metrics = {
+    'published': 0,
+    'oversized': 0,
+    'received': 0,
+    'delivered': 0,
+    'overflowed': 0,
+    'listener_errors': 0,
+}
+
+
+class Subscription:
+    """Events for one user, queued for one event stream connection."""
+
+    def __init__(self, user_id: uuid.UUID, max_size: int):
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=max_size)
+        # Set when the client reads too slowly and events were dropped; it
+        # must reconnect and resume from its Last-Event-ID
+        self.overflowed = False
+
+
+class StreamsUnavailable(ServiceUnavailable):
+    """Raised when a worker already serves SSE_MAX_CONNECTIONS event streams."""
+    description = "Too many open event streams, please retry shortly."
+
+
+def publish(events: list[dict]) -> None:
+    """
+    Publish events to the subscribers of their 'user_id' once the current transaction commits.
+
+    Events travel through PostgreSQL NOTIFY, so subscribers connected to
+    any worker process receive them, and a rolled back transaction
+    publishes nothing. All events go out in a single statement.
+    """
+    from db import db
+
+    if not current_app.config['EVENTS_ENABLED']:
+        return
+
+    payloads = []
+    for event in events:
+        payload = json.dumps(event, default=str)
+        if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+            _count('oversized')
+            current_app.logger.warning(f"Dropped oversized {event.get('type')} event for user {event.get('user_id')}")
+            continue
+        payloads.append(payload)
+    if not payloads:
+        return
+
+    db.session.execute(
+        db.text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+        {'channel': CHANNEL, 'payloads': payloads}
+    )
+    _count('published', len(payloads))
+
+
+def subscribe(user_id) -> Subscription:
+    """
+    Register an event stream connection of a user.
+
+    Raises:
+        StreamsUnavailable: If this worker serves SSE_MAX_CONNECTIONS streams already
+    """
+    config = current_app.config
+    _ensure_started()
+    subscription = Subscription(uuid.UUID(str(user_id)), config['SSE_QUEUE_SIZE'])
+    with _lock:
+        if sum(len(subs) for subs in _subscribers.values()) >= config['SSE_MAX_CONNECTIONS']:
+            raise StreamsUnavailable(retry_after=config['SSE_RETRY_MS'] // 1000 or 1)
+        _subscribers.setdefault(subscription.user_id, set()).add(subscription)
+    return subscription
+
+
+def open_stream(user_id, last_event_id: str | None = None) -> Response:
+    """
+    Open a Server-Sent Events stream of a user's tire states and alerts.
+
+    The stream starts with a 'tire_state' event per tire of the user. With a
+    last_event_id (the client's Last-Event-ID) it then replays the 'alert'
+    events dispatched after it, at most SSE_RESUME_LIMIT of them; a 'resync'
+    event tells the client to reload its notifications if more were missed.
+    Live events follow, with a heartbeat comment every SSE_HEARTBEAT_SECONDS.
+    A client that reads too slowly is disconnected and resumes on reconnect.
+
+    Raises:
+        ValueError: If last_event_id is not an alert event id
+        StreamsUnavailable: If this worker serves SSE_MAX_CONNECTIONS streams already
+    """
+    from db import db
+    from models import AlertEvent, Notification, Tire, Vehicle
+
+    config = current_app.config
+    after_id = None
+    if last_event_id:
+        try:
+            after_id = int(last_event_id)
+        except ValueError:
+            raise ValueError("Invalid Last-Event-ID")
+
+    # Subscribe before reading the current state, so nothing published in between is lost
+    subscription = subscribe(user_id)
+    try:
+        messages = [
+            sse_message({
+                "type": "tire_state",
+                "user_id": str(subscription.user_id),
+                "vehicle_id": str(tire.vehicle_id),
+                **tire.to_state_dict()
+            }, event='tire_state')
+            for tire in db.session.query(Tire)
+            .join(Vehicle, Tire.vehicle_id == Vehicle.vehicle_id)
+            .filter(Vehicle.user_id == subscription.user_id)
+            .order_by(Tire.vehicle_id, Tire.label)
+        ]
+
+        replayed = set()
+        if after_id is not None:
+            limit = config['SSE_RESUME_LIMIT']
+            rows = db.session.query(AlertEvent, Notification) \
+                .outerjoin(Notification, AlertEvent.notification_id == Notification.notification_id) \
+                .filter(AlertEvent.user_id == subscription.user_id,
+                        AlertEvent.event_id > after_id,
+                        AlertEvent.dispatched_at.isnot(None)) \
+                .order_by(AlertEvent.event_id) \
+                .limit(limit + 1) \
+                .all()
+            if len(rows) > limit:
+                rows = rows[-limit:]
+                messages.append(sse_message({"type": "resync"}, event='resync'))
+            for alert_event, notification in rows:
+                event = {'type': 'alert', **alert_dispatcher.to_dict(alert_event, notification)}
+                messages.append(sse_message(event, event='alert', event_id=alert_event.event_id))
+                replayed.add(alert_event.event_id)
+
+        # The stream may stay open for hours; do not hold a pooled connection meanwhile
+        db.session.close()
+    except Exception:
+        unsubscribe(subscription)
+        raise
+
+    retry_ms = config['SSE_RETRY_MS']
+    heartbeat = config['SSE_HEARTBEAT_SECONDS']
+
+    def generate():
+        try:
+            yield f"retry: {retry_ms}\n\n"
+            yield from messages
+            while not subscription.overflowed and not _stopping.is_set():
+                try:
+                    event = subscription.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+                    continue
+                if event.get('type') == 'alert':
+                    # Dispatched alerts may also have been replayed from the table
+                    if event.get('event_id') in replayed:
+                        continue
+                    yield sse_message(event, event='alert', event_id=event.get('event_id'))
+                else:
+                    yield sse_message(event, event=event.get('type'))
+        finally:
+            unsubscribe(subscription)
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+def unsubscribe(subscription: Subscription) -> None:
+    with _lock:
+        subscriptions = _subscribers.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del _subscribers[subscription.user_id]
+
+
+def stop() -> None:
+    """Stop the listener thread."""
+    _stopping.set()
+    if _listener is not None:
+        _listener.join()
+
+
+def get_metrics() -> dict:
+    """Hub statistics of this process."""
+    with _lock:
+        metrics = dict(_metrics)
+        metrics['users'] = len(_subscribers)
+        metrics['connections'] = sum(len(subs) for subs in _subscribers.values())
+    return metrics
+
+
+def _deliver(event: dict) -> None:
+    try:
+        user_id = uuid.UUID(str(event.get('user_id')))
+    except ValueError:
+        return
+
+    with _lock:
+        _metrics['received'] += 1
+        for subscription in _subscribers.get(user_id, ()):
+            try:
+                subscription.queue.put_nowait(event)
+                _metrics['delivered'] += 1
+            except queue.Full:
+                if not subscription.overflowed:
+                    subscription.overflowed = True
+                    _metrics['overflowed'] += 1
+
+
+def _publish_alert_events(events: list[dict]) -> None:
+    # Listener of the alert dispatcher, called after its batch committed
+    from db import db
+
+    try:
+        publish([{'type': 'alert', **event} for event in events])
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def _ensure_started() -> None:
+    # Started lazily so the connection and thread live in the worker process, not a preforking master
+    global _listener, _app
+    if _listener is not None:
+        return
+
+    with _start_lock:
+        if _listener is not None:
+            return
+
+        _app = current_app._get_current_object()
+        _listener = threading.Thread(target=_listen, name='event-hub-listener', daemon=True)
+        _listener.start()
+        atexit.register(stop)
+
+
+def _listen() -> None:
+    """Forward NOTIFY payloads to local subscribers, reconnecting after errors."""
+    from db import db
+
+    while not _stopping.is_set():
+        connection = None
+        try:
+            with _app.app_context():
+                # A dedicated connection, detached from the pool: it stays in LISTEN mode
+                connection = db.engine.raw_connection()
+                connection.detach()
+            dbapi_connection = connection.dbapi_connection
+            dbapi_connection.autocommit = True
+            dbapi_connection.cursor().execute(f"LISTEN {CHANNEL}")
+
+            while not _stopping.is_set():
+                if not select.select([dbapi_connection], [], [], 1.0)[0]:
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notify = dbapi_connection.notifies.pop(0)
+                    try:
+                        _deliver(json.loads(notify.payload))
+                    except ValueError:
+                        continue
+
+        except Exception as e:
+            _count('listener_errors')
+            _app.logger.error(f"Event hub listener error: {str(e)}")
+            _stopping.wait(1.0)
+        finally:
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+
+def _count(key: str, amount: int = 1) -> None:
+    with _lock:
+        _metrics[key] += amount
+
+
+alert_dispatcher.add_listener(_publish_alert_events)
@@ -0,0 +1,142 @@
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import Iterator, Optional
+from db import db
+
+# format -> (file extension, MIME type)
+FORMATS = {
+    'csv.gz': ('csv.gz', 'application/gzip'),
+    'arrow': ('arrows', 'application/vnd.apache.arrow.stream'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+COLUMNS = ['tire_id', 'pressure_unit', 'created_at', 'pressure_value']
+
+
+def check_format(file_format: str) -> None:
+    """
+    Raises:
+        ValueError: If the format is unknown or needs pyarrow, which is not installed
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Format must be one of: {', '.join(FORMATS)}")
+    if file_format != 'csv.gz':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError(f"The {file_format} format requires pyarrow, which is not installed")
+
+
+def open_batches(user_id=None, tire_id=None, vehicle_id=None, from_at: Optional[datetime] = None,
+                 to_at: Optional[datetime] = None, batch_rows: int = 50000) -> Iterator[list]:
+    """
+    Start the export query and return an iterator over batches of rows.
+
+    Rows are (tire_id, pressure_unit, created_at, pressure_value), ordered by
+    tire and time, and fetched through a server-side cursor batch_rows at a time.
+    Every given filter applies.
+    """
+    from models import PressureReading, Tire, Vehicle
+
+    query = db.select(PressureReading.tire_id, Tire.pressure_unit, PressureReading.created_at,
+                      PressureReading.pressure_value) \
+        .join(Tire, Tire.tire_id == PressureReading.tire_id)
+    if user_id is not None:
+        query = query.join(Vehicle, Vehicle.vehicle_id == Tire.vehicle_id).where(Vehicle.user_id == user_id)
+    if vehicle_id is not None:
+        query = query.where(Tire.vehicle_id == vehicle_id)
+    if tire_id is not None:
+        query = query.where(PressureReading.tire_id == tire_id)
+    if from_at is not None:
+        query = query.where(PressureReading.created_at >= from_at)
+    if to_at is not None:
+        query = query.where(PressureReading.created_at < to_at)
+    query = query.order_by(PressureReading.tire_id, PressureReading.created_at)
+
+    result = db.session.execute(query, execution_options={'yield_per': batch_rows})
+    return result.partitions()
+
+
+def encode(file_format: str, batches: Iterator[list]) -> Iterator[bytes]:
+    """Encode row batches into the chunks of an export file."""
+    if file_format == 'csv.gz':
+        return _encode_csv_gz(batches)
+    return _encode_arrow(batches, parquet=file_format == 'parquet')
+
+
+def _encode_csv_gz(batches) -> Iterator[bytes]:
+    # wbits=31 writes a gzip header and trailer
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator='\n')
+    writer.writerow(COLUMNS)
+    for batch in batches:
+        writer.writerows(
+            (str(tire_id), unit, created_at.isoformat(), f"{value:.2f}")
+            for tire_id, unit, created_at, value in batch
+        )
+        chunk = compressor.compress(text.getvalue().encode('utf-8'))
+        text.seek(0)
+        text.truncate()
+        if chunk:
+            yield chunk
+    yield compressor.compress(text.getvalue().encode('utf-8')) + compressor.flush()
+
+
+def _encode_arrow(batches, parquet: bool) -> Iterator[bytes]:
+    import pyarrow as pa
+
+    schema = pa.schema([
+        ('tire_id', pa.dictionary(pa.int32(), pa.string())),
+        ('pressure_unit', pa.dictionary(pa.int8(), pa.string())),
+        ('created_at', pa.timestamp('us', tz='UTC')),
+        ('pressure_value', pa.float32()),
+    ])
+    sink = _DrainSink()
+    if parquet:
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    else:
+        writer = pa.ipc.new_stream(sink, schema, options=pa.ipc.IpcWriteOptions(compression='zstd'))
+
+    with writer:
+        for batch in batches:
+            tire_ids, units, created_ats, values = zip(*batch)
+            table = pa.table([
+                pa.array([str(t) for t in tire_ids]).dictionary_encode().cast(schema.field('tire_id').type),
+                pa.array(units).dictionary_encode().cast(schema.field('pressure_unit').type),
+                pa.array(created_ats, type=pa.timestamp('us', tz='UTC')),
+                pa.array([float(v) for v in values], type=pa.float32()),
+            ], schema=schema)
+            writer.write_table(table)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    yield sink.drain()
+
+
+class _DrainSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
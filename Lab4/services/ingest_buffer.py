@@ -0,0 +1,178 @@
+import atexit
+import queue
+import threading
+import time
+from flask import current_app
+
+_queue: queue.Queue | None = None
+_thread: threading.Thread | None = None
+_stopping = threading.Event()
+_flush_lock = threading.Lock()
+_start_lock = threading.Lock()
+_app = None
+
+_metrics = {
+    'enqueued': 0,
+    'rejected_full': 0,
+    'flushes': 0,
+    'flushed_rows': 0,
+    'failed_rows': 0,
+    'last_flush_ms': 0.0,
+    'max_flush_ms': 0.0,
+    'total_flush_ms': 0.0,
+}
+_metrics_lock = threading.Lock()
+
+
+def enqueue(entry) -> bool:
+    """
+    Queue a validated ReadingEntry for the background flusher.
+
+    Returns:
+        bool: False if the buffer is full and the reading was not queued
+    """
+    _ensure_started()
+    try:
+        _queue.put_nowait(entry)
+    except queue.Full:
+        _count('rejected_full')
+        return False
+
+    _count('enqueued')
+    return True
+
+
+def flush(max_rows: int | None = None) -> int:
+    """
+    Drain up to max_rows readings and store them with one bulk insert and one commit.
+
+    Must run inside an application context.
+
+    Returns:
+        int: Number of readings taken from the queue
+    """
+    from db import db
+    from models import PressureReading
+
+    if _queue is None:
+        return 0
+
+    max_rows = max_rows or current_app.config['INGEST_FLUSH_MAX_ROWS']
+    with _flush_lock:
+        entries = []
+        while len(entries) < max_rows:
+            try:
+                entries.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        if not entries:
+            return 0
+
+        started = time.perf_counter()
+        try:
+            results = PressureReading.store_entries(entries)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Failed to flush {len(entries)} buffered readings, retrying one by one: {str(e)}")
+            results = _store_one_by_one(entries)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for result in results:
+            if result['status'] not in (200, 201):
+                current_app.logger.warning(f"Dropped buffered reading: {result['error']}")
+        stored = sum(1 for result in results if result['status'] in (200, 201))
+
+        with _metrics_lock:
+            _metrics['flushes'] += 1
+            _metrics['flushed_rows'] += stored
+            _metrics['failed_rows'] += len(entries) - stored
+            _metrics['last_flush_ms'] = elapsed_ms
+            _metrics['max_flush_ms'] = max(_metrics['max_flush_ms'], elapsed_ms)
+            _metrics['total_flush_ms'] += elapsed_ms
+
+        return len(entries)
+
+
+def _store_one_by_one(entries: list) -> list[dict]:
+    """
+    Store entries in a transaction each, so a bad one only loses itself.
+
+    Every entry was already answered with 202. Separate commits rather than
+    savepoints: the staged after-commit work (dedup cache, counters, alert
+    dispatch) is only discarded when a whole transaction rolls back.
+    """
+    from db import db
+    from models import PressureReading
+
+    results = []
+    for entry in entries:
+        try:
+            results.extend(PressureReading.store_entries([entry]))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Dropped buffered reading {entry.reading_id}: {str(e)}")
+    return results
+
+
+def stop() -> None:
+    """Stop the flusher thread and write everything still queued."""
+    _stopping.set()
+    if _thread is not None:
+        _thread.join()
+    if _app is not None:
+        with _app.app_context():
+            while flush():
+                pass
+
+
+def get_metrics() -> dict:
+    """Queue depth and flush statistics of this process."""
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    metrics['queue_depth'] = _queue.qsize() if _queue is not None else 0
+    metrics['capacity'] = _queue.maxsize if _queue is not None else 0
+    metrics['avg_flush_ms'] = metrics['total_flush_ms'] / metrics['flushes'] if metrics['flushes'] else 0.0
+    return metrics
+
+
+def _ensure_started() -> None:
+    # Started lazily so the thread lives in the worker process, not a preforking master
+    global _queue, _thread, _app
+    if _thread is not None:
+        return
+
+    with _start_lock:
+        if _thread is not None:
+            return
+
+        _app = current_app._get_current_object()
+        _queue = queue.Queue(maxsize=_app.config['INGEST_BUFFER_CAPACITY'])
+        _thread = threading.Thread(target=_run, name='ingest-flusher', daemon=True)
+        _thread.start()
+        atexit.register(stop)
+
+
+def _run() -> None:
+    interval = _app.config['INGEST_FLUSH_INTERVAL_MS'] / 1000
+    max_rows = _app.config['INGEST_FLUSH_MAX_ROWS']
+    deadline = time.monotonic() + interval
+
+    while not _stopping.is_set():
+        # Flush early once a full batch is waiting, otherwise every interval
+        if _queue.qsize() < max_rows and time.monotonic() < deadline:
+            _stopping.wait(min(0.01, interval))
+            continue
+
+        with _app.app_context():
+            try:
+                flush(max_rows)
+            except Exception as e:
+                _app.logger.error(f"Ingest flusher error: {str(e)}")
+        deadline = time.monotonic() + interval
+
+
+def _count(key: str) -> None:
+    with _metrics_lock:
+        _metrics[key] += 1
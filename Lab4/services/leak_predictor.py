@@ -0,0 +1,132 @@
+import math
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+from flask import current_app
+from services import reference_cache
+
+CRITICAL_ALERT_TYPE = 'low_pressure_critical'
+SECONDS_PER_DAY = 86400
+
+
+class LeakPrediction(NamedTuple):
+    slope_per_day: float
+    estimated_pressure: float
+    critical_pressure: float
+    critical_at: Optional[datetime]
+
+
+def update(tire, pressure_value: float, created_at: datetime) -> bool:
+    """
+    Fold a stored reading into the tire's exponentially weighted regression state.
+
+    The state is five running sums (weight, t, v, t*t, t*v) with time measured
+    in days relative to tire.leak_state_at, so an update is O(1): decay the
+    sums, shift their time origin to the new reading and add it. Older weights
+    halve every LEAK_HALF_LIFE_HOURS. Readings older than the state are ignored.
+
+    Returns:
+        bool: Whether the state was updated
+    """
+    if tire.leak_state_at is None or tire.leak_weight is None:
+        tire.leak_weight, tire.leak_sum_t, tire.leak_sum_v = 1.0, 0.0, pressure_value
+        tire.leak_sum_tt, tire.leak_sum_tv = 0.0, 0.0
+        tire.leak_state_at = created_at
+        return True
+
+    shift = (created_at - tire.leak_state_at).total_seconds() / SECONDS_PER_DAY
+    if shift < 0:
+        return False
+
+    half_life = current_app.config['LEAK_HALF_LIFE_HOURS'] / 24
+    decay = math.exp(-math.log(2) * shift / half_life)
+    w, t, v = tire.leak_weight * decay, tire.leak_sum_t * decay, tire.leak_sum_v * decay
+    tt, tv = tire.leak_sum_tt * decay, tire.leak_sum_tv * decay
+
+    # Move the origin to the new reading: t' = t - shift
+    tt = tt - 2 * shift * t + shift * shift * w
+    tv = tv - shift * v
+    t = t - shift * w
+
+    # The new reading sits at t' = 0
+    tire.leak_weight, tire.leak_sum_t, tire.leak_sum_v = w + 1.0, t, v + pressure_value
+    tire.leak_sum_tt, tire.leak_sum_tv = tt, tv
+    tire.leak_state_at = created_at
+    return True
+
+
+def predict(tire) -> Optional[LeakPrediction]:
+    """
+    Extrapolate the tire's weighted trend to the low_pressure_critical threshold.
+
+    Returns:
+        LeakPrediction or None if there is not enough data yet. critical_at is
+            None unless pressure is falling and still above the threshold.
+    """
+    if tire.leak_state_at is None or tire.leak_weight is None:
+        return None
+
+    config = current_app.config
+    w, t, v, tt, tv = tire.leak_weight, tire.leak_sum_t, tire.leak_sum_v, tire.leak_sum_tt, tire.leak_sum_tv
+    denominator = w * tt - t * t
+    min_span_days = config['LEAK_MIN_SPAN_HOURS'] / 24
+    # Weighted variance of time must cover a minimal span, or the slope is noise
+    if w < config['LEAK_MIN_WEIGHT'] or denominator <= (w * min_span_days) ** 2:
+        return None
+
+    slope = (w * tv - t * v) / denominator
+    # Intercept at t = 0, i.e. the trend value at leak_state_at
+    estimated = (v - slope * t) / w
+
+    critical = reference_cache.get_alert_type(CRITICAL_ALERT_TYPE)
+    if critical is None:
+        return None
+    critical_pressure = critical.deviation_max * float(tire.optimal_pressure)
+
+    critical_at = None
+    if slope < 0 and estimated > critical_pressure:
+        critical_at = tire.leak_state_at + timedelta(days=(critical_pressure - estimated) / slope)
+
+    return LeakPrediction(round(slope, 4), round(estimated, 2), round(critical_pressure, 2), critical_at)
+
+
+def should_warn(tire, prediction: Optional[LeakPrediction]) -> bool:
+    """
+    Decide whether to send the predictive leak notification, and re-arm it.
+
+    Warns once when the critical threshold is predicted within
+    LEAK_HORIZON_HOURS and the tire is not critical yet. The warning re-arms
+    when the trend no longer points at the threshold.
+    """
+    if prediction is None:
+        return False
+    if prediction.critical_at is None:
+        tire.leak_notified_at = None
+        return False
+    if tire.leak_notified_at is not None or tire.current_alert_type == CRITICAL_ALERT_TYPE:
+        return False
+
+    horizon = timedelta(hours=current_app.config['LEAK_HORIZON_HOURS'])
+    return prediction.critical_at - tire.leak_state_at <= horizon
+
+
+def to_dict(prediction: Optional[LeakPrediction]) -> Optional[dict]:
+    if prediction is None:
+        return None
+    return {
+        "slope_per_day": prediction.slope_per_day,
+        "estimated_pressure": prediction.estimated_pressure,
+        "critical_pressure": prediction.critical_pressure,
+        "critical_at": prediction.critical_at.isoformat() if prediction.critical_at else None
+    }
+
+
+def from_dict(data: Optional[dict]) -> Optional[LeakPrediction]:
+    """Inverse of to_dict."""
+    if data is None:
+        return None
+    return LeakPrediction(
+        data["slope_per_day"],
+        data["estimated_pressure"],
+        data["critical_pressure"],
+        datetime.fromisoformat(data["critical_at"]) if data["critical_at"] else None
+    )
@@ -1,30 +1,53 @@
-from utils import ErrorHandler
 from models.notification_model import Notification
-from models.alert_type_model import AlertType
-
-def send_alert_type_change_notification(user_id, tire, old_alert_type, new_alert_type):
-    try:
-        # Get alert type objects for notification
-        old_alert = AlertType.query.get(old_alert_type) if old_alert_type else None
-        new_alert = AlertType.query.get(new_alert_type)
-
-        title = f"Tire status changed to {new_alert.alert_type}"
-        body = f"Your tire '{tire.label}' status changed to {new_alert.alert_type}, {new_alert.description}."
-
-        # Create notification
-        Notification.add_notification(
-            tire_id=tire.tire_id,
-            old_alert_type=old_alert_type,
-            new_alert_type=new_alert_type,
-            title=title,
-            body=body
-        )
-
-    except ValueError as ve:
-        print(ErrorHandler.handle_validation_error(str(ve)))
-    except Exception as e:
-        return ErrorHandler.handle_error(
-            e,
-            message="Internal server error while sending security mode change notification.",
-            status_code=500
-        )
+
+
+def build_alert_type_change_notification(tire, old_alert_type, new_alert):
+    """
+    Build (but do not commit) a notification about a tire alert type change.
+
+    Args:
+        tire: Tire whose status changed
+        old_alert_type: Previous alert type name (can be None)
+        new_alert: AlertTypeInfo (or AlertType) the tire switched to
+
+    Returns:
+        Notification: Unsaved notification; the caller adds it to its transaction
+    """
+    title = f"Tire status changed to {new_alert.alert_type}"
+    body = f"Your tire '{tire.label}' status changed to {new_alert.alert_type}, {new_alert.description}."
+
+    return Notification(
+        tire_id=tire.tire_id,
+        old_alert_type=old_alert_type,
+        new_alert_type=new_alert.alert_type,
+        title=title,
+        body=body
+    )
+
+
+def build_leak_prediction_notification(tire, prediction, alert_type):
+    """
+    Build (but do not commit) a notification warning that a tire is predicted to go critical.
+
+    Args:
+        tire: Tire with a falling pressure trend
+        prediction: LeakPrediction with critical_at set
+        alert_type: Alert type of the tire when the prediction was made
+
+    Returns:
+        Notification: Unsaved notification; the caller adds it to its transaction
+    """
+    title = "Slow leak suspected"
+    body = (
+        f"Your tire '{tire.label}' is losing {abs(prediction.slope_per_day):.2f} {tire.pressure_unit} per day "
+        f"and is expected to reach critical pressure ({prediction.critical_pressure:.2f} {tire.pressure_unit}) "
+        f"around {prediction.critical_at.strftime('%Y-%m-%d %H:%M')} UTC."
+    )
+
+    return Notification(
+        tire_id=tire.tire_id,
+        old_alert_type=alert_type,
+        new_alert_type=None,
+        title=title,
+        body=body
+    )
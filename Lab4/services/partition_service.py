@@ -0,0 +1,159 @@
+from datetime import date, datetime, timezone
+from flask import current_app
+from db import db
+
+PARENT_TABLE = 'pressure_reading'
+SCHEMA = 'tire_pressure'
+# Catches readings of months without a partition, so ingestion never runs DDL
+DEFAULT_PARTITION = f'{PARENT_TABLE}_default'
+
+
+def is_enabled() -> bool:
+    return current_app.config['PRESSURE_READING_PARTITIONED']
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+def ensure_partitions(months_ahead: int | None = None, start: date | None = None) -> list[str]:
+    """
+    Create monthly partitions from start (default: current month) up to months_ahead months later.
+
+    Also creates the DEFAULT partition. Readings it already holds for a
+    month being created are moved into the new partition.
+
+    Args:
+        months_ahead: Number of future months to prepare (default: PARTITION_MONTHS_AHEAD)
+        start: Any day of the first month to create
+
+    Returns:
+        list: Names of the partitions that were checked or created
+    """
+    if months_ahead is None:
+        months_ahead = current_app.config['PARTITION_MONTHS_AHEAD']
+
+    first = _month_start(start or datetime.now(timezone.utc).date())
+    months = [_add_months(first, offset) for offset in range(months_ahead + 1)]
+    with db.engine.begin() as connection:
+        connection.execute(db.text(create_default_partition_sql()))
+        for month in months:
+            connection.execute(db.text(create_partition_sql(month)))
+    return [partition_name(month) for month in months]
+
+
+def months_of(timestamps) -> set[date]:
+    """First days of the (UTC) months the given timestamps fall into."""
+    return {_month_start(ts.astimezone(timezone.utc).date()) for ts in timestamps}
+
+
+def create_default_partition_sql() -> str:
+    """DDL creating the DEFAULT partition if it does not exist yet."""
+    return (
+        f'CREATE TABLE IF NOT EXISTS {SCHEMA}."{DEFAULT_PARTITION}" '
+        f'PARTITION OF {SCHEMA}.{PARENT_TABLE} DEFAULT'
+    )
+
+
+def create_partition_sql(month: date) -> str:
+    """
+    DDL creating the partition for one month if it does not exist yet.
+
+    A partition cannot be created while the DEFAULT partition holds rows of
+    its range, so the table is built standalone, those rows are moved into
+    it and it is attached afterwards, all in the caller's transaction.
+    """
+    name = f'{SCHEMA}."{partition_name(month)}"'
+    default = f'{SCHEMA}."{DEFAULT_PARTITION}"'
+    lower = f"'{month.isoformat()} 00:00:00+00'"
+    upper = f"'{_add_months(month, 1).isoformat()} 00:00:00+00'"
+    return f"""
+        DO $$
+        BEGIN
+            IF to_regclass('{name}') IS NOT NULL THEN
+                RETURN;
+            END IF;
+            CREATE TABLE {name} (LIKE {SCHEMA}.{PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS);
+            IF to_regclass('{default}') IS NOT NULL THEN
+                WITH moved AS (
+                    DELETE FROM {default} WHERE created_at >= {lower} AND created_at < {upper} RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved;
+            END IF;
+            ALTER TABLE {SCHEMA}.{PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ({lower}) TO ({upper});
+        END
+        $$
+    """
+
+
+def apply_retention(retention_months: int | None = None, detach: bool = False) -> list[str]:
+    """
+    Drop (or detach) partitions that only hold readings older than the retention period.
+
+    Retention is a metadata operation: whole partitions go away, no rows are deleted.
+
+    Args:
+        retention_months: Months of history to keep besides the current one
+            (default: READING_RETENTION_MONTHS, 0 keeps everything)
+        detach: Detach partitions as standalone tables instead of dropping them
+
+    Returns:
+        list: Names of the removed partitions
+    """
+    if retention_months is None:
+        retention_months = current_app.config['READING_RETENTION_MONTHS']
+    if retention_months <= 0:
+        return []
+
+    cutoff = _add_months(_month_start(datetime.now(timezone.utc).date()), -retention_months)
+    db.session.execute(
+        db.text(f'DELETE FROM {SCHEMA}."{DEFAULT_PARTITION}" WHERE created_at < :cutoff'),
+        {'cutoff': datetime(cutoff.year, cutoff.month, 1, tzinfo=timezone.utc)}
+    )
+    removed = []
+    for name in list_partitions():
+        month = _parse_month(name)
+        if month is None or _add_months(month, 1) > cutoff:
+            continue
+
+        if detach:
+            db.session.execute(db.text(
+                f'ALTER TABLE {SCHEMA}.{PARENT_TABLE} DETACH PARTITION {SCHEMA}."{name}"'
+            ))
+        else:
+            db.session.execute(db.text(f'DROP TABLE {SCHEMA}."{name}"'))
+        removed.append(name)
+
+    db.session.commit()
+    return removed
+
+
+def list_partitions() -> list[str]:
+    rows = db.session.execute(db.text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        JOIN pg_namespace ns ON ns.oid = parent.relnamespace
+        WHERE parent.relname = :parent AND ns.nspname = :schema
+        ORDER BY child.relname
+    """), {'parent': PARENT_TABLE, 'schema': SCHEMA})
+    return [row[0] for row in rows]
+
+
+def _parse_month(name: str) -> date | None:
+    suffix = name.removeprefix(f"{PARENT_TABLE}_p")
+    if len(suffix) != 6 or not suffix.isdigit():
+        return None
+    return date(int(suffix[:4]), int(suffix[4:]), 1)
+
+
+def _month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    if not date.min.year <= index // 12 <= date.max.year:
+        raise ValueError(f"Month out of range: {months:+d} months from {month.isoformat()}")
+    return date(index // 12, index % 12 + 1, 1)
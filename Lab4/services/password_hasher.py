@@ -0,0 +1,158 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app
+from werkzeug.exceptions import ServiceUnavailable
+from werkzeug.security import generate_password_hash, check_password_hash
+
+_executor: ProcessPoolExecutor | None = None
+_executor_pid: int | None = None
+_lock = threading.Lock()
+_in_flight = 0
+
+_metrics = {
+    'completed': 0,
+    'rejected_busy': 0,
+    'timeouts': 0,
+    'max_in_flight': 0,
+    'last_latency_ms': 0.0,
+    'max_latency_ms': 0.0,
+    'total_latency_ms': 0.0,
+}
+
+
+# Parameters werkzeug uses for a method given without them
+_METHOD_DEFAULTS = {
+    'scrypt': ['32768', '8', '1'],
+    'pbkdf2': ['sha256', '600000'],
+}
+
+
+class HashingUnavailable(ServiceUnavailable):
+    """Raised when the hashing pool is saturated; rendered by Flask as 503 with Retry-After."""
+    description = "Too many password operations in progress, please retry shortly."
+
+
+def hash_password(password: str) -> str:
+    """Hash a password with PASSWORD_HASH_METHOD on the hashing pool."""
+    return _run(generate_password_hash, password, current_app.config['PASSWORD_HASH_METHOD'])
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """Check a password against its hash on the hashing pool."""
+    return _run(check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """Whether a hash was made with other parameters than PASSWORD_HASH_METHOD, e.g. before they were tuned."""
+    return _normalize_method(password_hash.split('$', 1)[0]) != \
+        _normalize_method(current_app.config['PASSWORD_HASH_METHOD'])
+
+
+def get_metrics() -> dict:
+    """Hashing latency (queue wait included) and pool occupancy of this process."""
+    config = current_app.config
+    with _lock:
+        metrics = dict(_metrics)
+        in_flight = _in_flight
+    metrics['workers'] = config['PASSWORD_HASH_WORKERS']
+    metrics['in_flight'] = in_flight
+    metrics['queue_depth'] = max(0, in_flight - config['PASSWORD_HASH_WORKERS'])
+    metrics['capacity'] = config['PASSWORD_HASH_MAX_PENDING']
+    metrics['avg_latency_ms'] = metrics['total_latency_ms'] / metrics['completed'] if metrics['completed'] else 0.0
+    return metrics
+
+
+def _run(fn, *args):
+    """
+    Run a hashing function on the process pool, at most PASSWORD_HASH_MAX_PENDING at a time.
+
+    The KDF is deliberately slow; running it here keeps request threads free
+    and bounds the CPU a burst of logins can take. With PASSWORD_HASH_WORKERS
+    set to 0 it runs inline, e.g. for CLI commands.
+
+    Raises:
+        HashingUnavailable: If the pool is saturated, broken or too slow to answer
+    """
+    global _in_flight
+    config = current_app.config
+    if config['PASSWORD_HASH_WORKERS'] <= 0:
+        return fn(*args)
+
+    retry_after = config['PASSWORD_HASH_RETRY_AFTER']
+    with _lock:
+        if _in_flight >= config['PASSWORD_HASH_MAX_PENDING']:
+            _metrics['rejected_busy'] += 1
+            raise HashingUnavailable(retry_after=retry_after)
+        _in_flight += 1
+        _metrics['max_in_flight'] = max(_metrics['max_in_flight'], _in_flight)
+
+    started = time.perf_counter()
+    try:
+        future = _get_executor(config['PASSWORD_HASH_WORKERS']).submit(fn, *args)
+    except BrokenProcessPool:
+        _release(started, completed=False)
+        _reset_executor()
+        raise HashingUnavailable(retry_after=retry_after)
+    # Released when the job finishes, not when the caller gives up waiting,
+    # so timed out jobs keep counting against the limit while they occupy a worker
+    future.add_done_callback(lambda f: _release(started, completed=not f.cancelled() and f.exception() is None))
+
+    try:
+        return future.result(timeout=config['PASSWORD_HASH_TIMEOUT'])
+    except FutureTimeoutError:
+        with _lock:
+            _metrics['timeouts'] += 1
+        raise HashingUnavailable(retry_after=retry_after)
+    except BrokenProcessPool:
+        _reset_executor()
+        raise HashingUnavailable(retry_after=retry_after)
+
+
+def _normalize_method(method: str) -> tuple:
+    """
+    Spell out werkzeug's defaults, so 'scrypt' equals 'scrypt:32768:8:1'.
+
+    werkzeug stores the full parameters in the hash, while PASSWORD_HASH_METHOD
+    may leave the trailing ones out.
+    """
+    name, *params = method.split(':')
+    defaults = _METHOD_DEFAULTS.get(name, [])
+    params += defaults[len(params):]
+    return (name, *(int(p) if p.isdigit() else p for p in params))
+
+
+def _release(started: float, completed: bool) -> None:
+    global _in_flight
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _lock:
+        _in_flight -= 1
+        if completed:
+            _metrics['completed'] += 1
+            _metrics['last_latency_ms'] = elapsed_ms
+            _metrics['max_latency_ms'] = max(_metrics['max_latency_ms'], elapsed_ms)
+            _metrics['total_latency_ms'] += elapsed_ms
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    # Created lazily and per process, so a pool started in a preforking master
+    # (e.g. by seeding at import time) is not shared with its workers
+    global _executor, _executor_pid
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            # Workers only run werkzeug's hashing functions, so forking a
+            # threaded process is safe and avoids re-importing the app
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'))
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _reset_executor() -> None:
+    global _executor
+    with _lock:
+        broken, _executor = _executor, None
+    if broken is not None and _executor_pid == os.getpid():
+        broken.shutdown(wait=False, cancel_futures=True)
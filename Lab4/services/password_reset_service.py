@@ -1,5 +1,4 @@
-from flask_mail import Message
-from app import mail, app
+from app import app
 from db import db
 from config import Config
 from models import User
@@ -8,6 +7,8 @@ import string
 from itsdangerous import URLSafeTimedSerializer
 from flask import url_for, render_template, jsonify, Response
 from utils import ErrorHandler
+from services.password_hasher import HashingUnavailable
+from services import email_outbox
 
 s = URLSafeTimedSerializer(Config.SECRET_KEY)
 
@@ -44,9 +45,11 @@ def reset_password_request(data: dict) -> tuple[Response, int]:
         token = s.dumps(user.email, salt='reset-password-confirm-salt')
         confirmation_url = url_for('auth.confirm_reset_password', token=token, _external=True)
 
-        msg = Message(
+        # Throttled: the link of an email queued shortly before is still valid
+        email_outbox.enqueue(
+            'reset_password_confirmation',
+            user.email,
             "Reset Password Confirmation",
-            recipients=[user.email],
             body=f"To confirm your password reset, visit the following link: {confirmation_url}",
             html=render_template(
                 "reset_password_confirmation.html",
@@ -54,13 +57,14 @@ def reset_password_request(data: dict) -> tuple[Response, int]:
                 confirmation_url=confirmation_url
             )
         )
+        db.session.commit()
 
-        mail.send(msg)
         return jsonify({'message': 'The confirmation was sent successfully.'}), 200
 
     except ValueError as ve:
         return ErrorHandler.handle_validation_error(str(ve))
     except Exception as e:
+        db.session.rollback()
         return ErrorHandler.handle_error(
             e,
             message="Internal server error while sending the password reset email.",
@@ -99,6 +103,10 @@ def verify_reset_password_token(token: str) -> str:
             user=user
         )
 
+    except HashingUnavailable:
+        # The token stays valid, so the link can simply be opened again
+        raise
+
     except PermissionError as pe:
         return render_template(
             "reset_password_confirmation_error.html",
@@ -137,25 +145,29 @@ def send_password_reset_email(user: User) -> tuple[Response, int]:
     """
     try:
         new_password = generate_random_password()
-        update_password(user, new_password)
 
-        msg = Message(
+        # Queued in the password update's transaction: the email goes out if and only if the password changed
+        email_outbox.enqueue(
+            'new_password',
+            user.email,
             "Your New Password",
-            recipients=[user.email],
             body=f"Your new password is: {new_password}\n"
                  f"You can log in using this password. Please change it after logging in.",
             html=render_template(
                 "password_reset_email.html",
                 name=user.name,
                 new_password=new_password
-            )
+            ),
+            throttle=False
         )
+        update_password(user, new_password)
 
-        mail.send(msg)
         return jsonify({'message': 'A new password has been sent to your email.'}), 200
 
     except ValueError as ve:
         return ErrorHandler.handle_validation_error(str(ve))
+    except HashingUnavailable:
+        raise
     except Exception as e:
         raise RuntimeError("Internal server error while sending the password reset email.") from e
 
@@ -201,6 +213,9 @@ def update_password(user: User, new_password: str) -> None:
     try:
         user.set_password(new_password)
         db.session.commit()
+    except HashingUnavailable:
+        db.session.rollback()
+        raise
     except Exception as e:
         return ErrorHandler.handle_error(
             e,
@@ -0,0 +1,136 @@
+from datetime import datetime, timezone
+from typing import Optional
+import numpy as np
+from db import db
+from services import reference_cache
+
+READING_DTYPE = np.dtype([('group', np.int32), ('epoch', np.float64), ('value', np.float64)])
+PERCENTILES = (5, 50, 95)
+FETCH_ROWS = 100000
+
+
+def fetch_readings(tire_ids: list, from_at: Optional[datetime], to_at: Optional[datetime]) -> np.ndarray:
+    """
+    Load readings of several tires as one structured array, sorted by (group, epoch).
+
+    'group' is the tire's position in tire_ids. Rows go from the DBAPI cursor
+    straight into NumPy, without ORM objects or per-row dicts.
+    """
+    conditions, params = [], {'tire_ids': [str(tire_id) for tire_id in tire_ids]}
+    if from_at is not None:
+        conditions.append("r.created_at >= %(from_at)s")
+        params['from_at'] = from_at
+    if to_at is not None:
+        conditions.append("r.created_at < %(to_at)s")
+        params['to_at'] = to_at
+
+    sql = f"""
+        SELECT (t.position - 1)::int, extract(epoch FROM r.created_at)::float8, r.pressure_value::float8
+        FROM unnest(%(tire_ids)s::uuid[]) WITH ORDINALITY AS t(tire_id, position)
+        JOIN tire_pressure.pressure_reading r ON r.tire_id = t.tire_id
+        {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+        ORDER BY t.position, r.created_at
+    """
+    # Same transaction as the ORM session
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.execute(sql, params)
+        chunks = []
+        while rows := cursor.fetchmany(FETCH_ROWS):
+            chunks.append(np.fromiter(rows, dtype=READING_DTYPE, count=len(rows)))
+    finally:
+        cursor.close()
+
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=READING_DTYPE)
+
+
+def compute_stats(tires: list, from_at: Optional[datetime] = None, to_at: Optional[datetime] = None) -> list[dict]:
+    """
+    Compute pressure statistics for many tires with grouped NumPy reductions.
+
+    Args:
+        tires: List of (tire_id, optimal_pressure) pairs
+        from_at: Inclusive lower bound of the window
+        to_at: Exclusive upper bound of the window
+
+    Returns:
+        list: One dict per tire, in input order. Tires without readings only
+            have tire_id and count = 0. Time outside the normal band counts
+            the interval from each reading to the next one of the same tire;
+            leak_rate_per_day is the least-squares slope in pressure units per day.
+    """
+    readings = fetch_readings([tire_id for tire_id, _ in tires], from_at, to_at)
+    stats = [{"tire_id": str(tire_id), "count": 0} for tire_id, _ in tires]
+    if not len(readings):
+        return stats
+
+    group, epoch, value = readings['group'], readings['epoch'], readings['value']
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    groups = group[starts]
+    counts = np.diff(np.r_[starts, len(readings)])
+
+    mean = np.add.reduceat(value, starts) / counts
+    deviation = value - np.repeat(mean, counts)
+    stddev = np.sqrt(np.add.reduceat(deviation * deviation, starts) / counts)
+    minimum = np.minimum.reduceat(value, starts)
+    maximum = np.maximum.reduceat(value, starts)
+
+    # Readings are ordered by time within a group; reorder by value for percentiles
+    by_value = value[np.lexsort((value, group))]
+    percentiles = {q: _grouped_percentile(by_value, starts, counts, q) for q in PERCENTILES}
+
+    # Least-squares slope of value over time, per group
+    t = epoch - np.repeat(np.add.reduceat(epoch, starts) / counts, counts)
+    sxx = np.add.reduceat(t * t, starts)
+    sxy = np.add.reduceat(t * deviation, starts)
+    slope = np.divide(sxy, sxx, out=np.full(len(starts), np.nan), where=sxx > 0) * 86400
+
+    # Each reading holds until the next one of the same tire
+    intervals = np.r_[np.diff(epoch), 0.0]
+    intervals[starts[1:] - 1] = 0.0
+    optimal = np.array([float(optimal) for _, optimal in tires])[group]
+    outside = ~_is_normal(value / optimal)
+    seconds_outside = np.add.reduceat(np.where(outside, intervals, 0.0), starts)
+    seconds_total = np.add.reduceat(intervals, starts)
+    first_at = epoch[starts]
+    last_at = epoch[np.r_[starts[1:], len(readings)] - 1]
+
+    for i, g in enumerate(groups):
+        stats[g].update({
+            "count": int(counts[i]),
+            "mean": round(float(mean[i]), 3),
+            "stddev": round(float(stddev[i]), 3),
+            "min": float(minimum[i]),
+            "max": float(maximum[i]),
+            **{f"p{q}": round(float(percentiles[q][i]), 3) for q in PERCENTILES},
+            "seconds_outside_normal": round(float(seconds_outside[i]), 1),
+            "fraction_outside_normal":
+                round(float(seconds_outside[i] / seconds_total[i]), 4) if seconds_total[i] > 0 else None,
+            "leak_rate_per_day": None if np.isnan(slope[i]) else round(float(slope[i]), 4),
+            "first_at": datetime.fromtimestamp(first_at[i], tz=timezone.utc).isoformat(),
+            "last_at": datetime.fromtimestamp(last_at[i], tz=timezone.utc).isoformat(),
+        })
+    return stats
+
+
+def _grouped_percentile(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Linear-interpolated percentile of each group of an array sorted within groups."""
+    position = starts + (counts - 1) * (q / 100)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _is_normal(ratios: np.ndarray) -> np.ndarray:
+    """Vectorized ThresholdTable.classify(ratio).alert_type == 'normal'."""
+    table = reference_cache.get_thresholds()
+    breakpoints = np.asarray(table.breakpoints, dtype=np.float64)
+    point_normal = np.array([a is not None and a.alert_type == 'normal' for a in table.point_types], dtype=bool)
+    interval_normal = np.array([a is not None and a.alert_type == 'normal' for a in table.interval_types], dtype=bool)
+
+    index = np.searchsorted(breakpoints, ratios, side='left')
+    if not len(breakpoints):
+        return interval_normal[index]
+    clipped = np.minimum(index, len(breakpoints) - 1)
+    on_point = (index < len(breakpoints)) & (breakpoints[clipped] == ratios)
+    return np.where(on_point, point_normal[clipped], interval_normal[index])
@@ -0,0 +1,120 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class Principal(NamedTuple):
+    """
+    Immutable snapshot of an authenticated user, enough to authorize a request.
+
+    Implements the Flask-Login user interface, so it can be returned by the
+    user loader in place of a User.
+    """
+    user_id: uuid.UUID
+    role_name: str
+    email_confirmed: bool
+
+    @property
+    def is_authenticated(self) -> bool:
+        return True
+
+    @property
+    def is_active(self) -> bool:
+        return True
+
+    @property
+    def is_anonymous(self) -> bool:
+        return False
+
+    def get_id(self) -> str:
+        return str(self.user_id)
+
+
+# user_id -> (Principal, expires_at), least recently used first
+_principals: OrderedDict = OrderedDict()
+_lock = threading.Lock()
+_metrics = {'hits': 0, 'misses': 0}
+
+
+def get_principal(user_id) -> Optional[Principal]:
+    """
+    Get the principal of a user, from the cache when possible.
+
+    Entries live PRINCIPAL_CACHE_TTL seconds; changes made by other worker
+    processes become visible within that time.
+
+    Raises:
+        ValueError: If user_id is not a valid UUID
+    """
+    user_id = uuid.UUID(str(user_id))
+    now = time.monotonic()
+    with _lock:
+        cached = _principals.get(user_id)
+        if cached is not None and cached[1] >= now:
+            _principals.move_to_end(user_id)
+            _metrics['hits'] += 1
+            return cached[0]
+        _metrics['misses'] += 1
+
+    principal = _load(user_id)
+    if principal is not None:
+        config = current_app.config
+        with _lock:
+            _principals[user_id] = (principal, now + config['PRINCIPAL_CACHE_TTL'])
+            _principals.move_to_end(user_id)
+            while len(_principals) > config['PRINCIPAL_CACHE_SIZE']:
+                _principals.popitem(last=False)
+    return principal
+
+
+def invalidate(user_id) -> None:
+    with _lock:
+        _principals.pop(uuid.UUID(str(user_id)), None)
+
+
+def invalidate_on_commit(session, user_id) -> None:
+    """
+    Evict a user now and again once the session commits.
+
+    The second eviction drops a stale entry that a concurrent request may
+    have loaded before the change was committed.
+    """
+    invalidate(user_id)
+    session.info.setdefault('principal_invalidations', set()).add(user_id)
+
+
+def get_metrics() -> dict:
+    with _lock:
+        lookups = _metrics['hits'] + _metrics['misses']
+        return {
+            **_metrics,
+            'size': len(_principals),
+            'hit_rate': _metrics['hits'] / lookups if lookups else 0.0
+        }
+
+
+def _load(user_id: uuid.UUID) -> Optional[Principal]:
+    from db import db
+    from models import User, Role
+
+    row = db.session.query(User.user_id, Role.role_name, User.email_confirmed) \
+        .join(Role, Role.role_id == User.role_id) \
+        .filter(User.user_id == user_id) \
+        .first()
+    return Principal(row.user_id, row.role_name, bool(row.email_confirmed)) if row else None
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session) -> None:
+    for user_id in session.info.pop('principal_invalidations', ()):
+        invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session) -> None:
+    session.info.pop('principal_invalidations', None)
@@ -0,0 +1,152 @@
+import bisect
+import threading
+import time
+import uuid
+from typing import NamedTuple, Optional
+from flask import current_app
+
+
+class AlertTypeInfo(NamedTuple):
+    alert_type: str
+    direction: Optional[str]
+    deviation_min: float
+    deviation_max: float
+    severity_level: int
+    description: Optional[str]
+
+
+class ThresholdTable:
+    """
+    Alert bands compiled into a sorted interval table.
+
+    Every band edge becomes a breakpoint. Between two consecutive breakpoints
+    (and exactly on each of them) the matching alert type cannot change, so it
+    is resolved once at compile time with the original rule: the most severe
+    band with deviation_min <= ratio <= deviation_max wins, otherwise 'normal'.
+    Classification is then a single bisect.
+    """
+
+    def __init__(self, alert_types: list[AlertTypeInfo]):
+        self._ordered = sorted(alert_types, key=lambda a: (-a.severity_level, a.alert_type))
+        self._default = next((a for a in alert_types if a.alert_type == 'normal'), None)
+
+        self.breakpoints = sorted({a.deviation_min for a in alert_types} | {a.deviation_max for a in alert_types})
+        self.point_types = [self._match(point) for point in self.breakpoints]
+        if self.breakpoints:
+            probes = [self.breakpoints[0] - 1.0]
+            probes += [(lo + hi) / 2 for lo, hi in zip(self.breakpoints, self.breakpoints[1:])]
+            probes.append(self.breakpoints[-1] + 1.0)
+        else:
+            probes = [0.0]
+        self.interval_types = [self._match(probe) for probe in probes]
+
+    def _match(self, ratio: float) -> Optional[AlertTypeInfo]:
+        for alert in self._ordered:
+            if alert.deviation_min <= ratio <= alert.deviation_max:
+                return alert
+        return self._default
+
+    def classify(self, ratio: float) -> Optional[AlertTypeInfo]:
+        """Return the alert type for a deviation ratio in O(log n)."""
+        i = bisect.bisect_left(self.breakpoints, ratio)
+        if i < len(self.breakpoints) and self.breakpoints[i] == ratio:
+            return self.point_types[i]
+        return self.interval_types[i]
+
+
+class _Snapshot(NamedTuple):
+    loaded_at: float
+    alert_types: dict[str, AlertTypeInfo]
+    thresholds: ThresholdTable
+    role_ids: dict[str, uuid.UUID]
+
+
+_snapshot: Optional[_Snapshot] = None
+_lock = threading.Lock()
+_reload_lock = threading.Lock()
+
+
+def _get() -> _Snapshot:
+    snapshot = _snapshot
+    if snapshot is None:
+        return _load()
+
+    # Rows changed by another process (or by hand) are picked up within
+    # REFERENCE_CACHE_REFRESH_SECONDS; one thread reloads while the others
+    # keep using the current snapshot
+    if time.monotonic() - snapshot.loaded_at >= current_app.config['REFERENCE_CACHE_REFRESH_SECONDS'] \
+            and _reload_lock.acquire(blocking=False):
+        try:
+            return _reload()
+        except Exception as e:
+            current_app.logger.error(f"Failed to reload reference data: {str(e)}")
+        finally:
+            _reload_lock.release()
+    return snapshot
+
+
+def _load() -> _Snapshot:
+    with _lock:
+        if _snapshot is not None:
+            return _snapshot
+        return _reload()
+
+
+def _reload() -> _Snapshot:
+    global _snapshot
+    from models import AlertType, Role
+
+    loaded_at = time.monotonic()
+    alert_types = {
+        a.alert_type: AlertTypeInfo(
+            alert_type=a.alert_type,
+            direction=a.direction,
+            deviation_min=float(a.deviation_min),
+            deviation_max=float(a.deviation_max),
+            severity_level=a.severity_level,
+            description=a.description
+        )
+        for a in AlertType.query.all()
+    }
+    role_ids = {r.role_name: r.role_id for r in Role.query.all()}
+
+    _snapshot = _Snapshot(loaded_at, alert_types, ThresholdTable(list(alert_types.values())), role_ids)
+    return _snapshot
+
+
+def invalidate() -> None:
+    """
+    Drop this process's cached reference data; it is reloaded on next access.
+
+    Other processes reload on their own within REFERENCE_CACHE_REFRESH_SECONDS.
+    """
+    global _snapshot
+    with _lock:
+        _snapshot = None
+
+
+def get_alert_type(alert_type: Optional[str]) -> Optional[AlertTypeInfo]:
+    """Get an alert type by name without touching the database."""
+    if alert_type is None:
+        return None
+    return _get().alert_types.get(alert_type)
+
+
+def get_alert_types() -> list[AlertTypeInfo]:
+    """Get all alert types ordered by severity, most severe first."""
+    return sorted(_get().alert_types.values(), key=lambda a: (-a.severity_level, a.alert_type))
+
+
+def classify_deviation(deviation_ratio: float) -> Optional[AlertTypeInfo]:
+    """Classify a measured/optimal pressure ratio into an alert type."""
+    return _get().thresholds.classify(deviation_ratio)
+
+
+def get_thresholds() -> ThresholdTable:
+    """Get the compiled alert band table, e.g. for vectorized classification."""
+    return _get().thresholds
+
+
+def get_role_id(role_name: str) -> Optional[uuid.UUID]:
+    """Get a role ID by its name without touching the database."""
+    return _get().role_ids.get(role_name)
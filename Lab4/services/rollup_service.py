@@ -0,0 +1,138 @@
+from datetime import datetime, timezone
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from db import db
+
+# Bucket width in seconds, coarsest last
+RESOLUTIONS = {'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    """Floor a timestamp to the start of its UTC bucket."""
+    width = RESOLUTIONS[resolution]
+    return datetime.fromtimestamp(int(timestamp.timestamp()) // width * width, tz=timezone.utc)
+
+
+def choose_resolution(window_seconds: float, target_points: int) -> str:
+    """
+    Pick the coarsest resolution that still gives at least target_points buckets.
+
+    Returns:
+        str: 'day', 'hour' or 'minute', or 'raw' for short windows
+    """
+    for resolution in reversed(RESOLUTIONS):
+        if window_seconds / RESOLUTIONS[resolution] >= target_points:
+            return resolution
+    return 'raw'
+
+
+def stage_rollups(rows: list[dict]) -> None:
+    """
+    Fold freshly inserted readings into the rollup tables without committing.
+
+    Rows are aggregated per (tire, resolution, bucket) first, so each bucket is
+    touched once by a single INSERT ... ON CONFLICT DO UPDATE.
+
+    Args:
+        rows: Reading dicts with tire_id, pressure_value and created_at
+    """
+    from models import PressureRollup
+
+    buckets = {}
+    for row in rows:
+        value, created_at = row['pressure_value'], row['created_at']
+        for resolution in RESOLUTIONS:
+            key = (row['tire_id'], resolution, bucket_start(created_at, resolution))
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = {
+                    'tire_id': key[0], 'resolution': resolution, 'bucket_start': key[2],
+                    'min_value': value, 'max_value': value, 'sum_value': value, 'count': 1,
+                    'first_value': value, 'first_at': created_at,
+                    'last_value': value, 'last_at': created_at,
+                }
+                continue
+
+            bucket['min_value'] = min(bucket['min_value'], value)
+            bucket['max_value'] = max(bucket['max_value'], value)
+            bucket['sum_value'] += value
+            bucket['count'] += 1
+            if created_at < bucket['first_at']:
+                bucket['first_value'], bucket['first_at'] = value, created_at
+            if created_at >= bucket['last_at']:
+                bucket['last_value'], bucket['last_at'] = value, created_at
+
+    if not buckets:
+        return
+
+    insert = pg_insert(PressureRollup).values(list(buckets.values()))
+    current, new = PressureRollup.__table__.c, insert.excluded
+    db.session.execute(insert.on_conflict_do_update(
+        index_elements=['tire_id', 'resolution', 'bucket_start'],
+        set_={
+            'min_value': func.least(current.min_value, new.min_value),
+            'max_value': func.greatest(current.max_value, new.max_value),
+            'sum_value': current.sum_value + new.sum_value,
+            'count': current.count + new.count,
+            'first_value': db.case((new.first_at < current.first_at, new.first_value), else_=current.first_value),
+            'first_at': func.least(current.first_at, new.first_at),
+            'last_value': db.case((new.last_at >= current.last_at, new.last_value), else_=current.last_value),
+            'last_at': func.greatest(current.last_at, new.last_at),
+        }
+    ))
+
+
+def rebuild(tire_ids=None, since: datetime | None = None) -> int:
+    """
+    Recompute rollups from raw readings, e.g. after a bulk import.
+
+    Rollups older than since are kept, so history whose raw partitions were
+    dropped by retention survives a rebuild with a recent since.
+
+    Args:
+        tire_ids: Tires to rebuild (default: all)
+        since: Rebuild from the start of this UTC day on (default: all history)
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    conditions, params = [], {}
+    if tire_ids is not None:
+        conditions.append("tire_id = ANY(:tire_ids)")
+        params['tire_ids'] = list(tire_ids)
+    if since is not None:
+        params['since'] = bucket_start(since, 'day')
+
+    def scope(time_column):
+        clauses = conditions + ([f"{time_column} >= :since"] if since is not None else [])
+        return f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    db.session.execute(db.text(f"DELETE FROM tire_pressure.pressure_rollup {scope('bucket_start')}"), params)
+
+    written = 0
+    for resolution in RESOLUTIONS:
+        result = db.session.execute(db.text(f"""
+            INSERT INTO tire_pressure.pressure_rollup (
+                tire_id, resolution, bucket_start, min_value, max_value, sum_value, count,
+                first_value, first_at, last_value, last_at
+            )
+            SELECT
+                tire_id,
+                '{resolution}',
+                date_trunc('{resolution}', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+                min(pressure_value),
+                max(pressure_value),
+                sum(pressure_value),
+                count(*),
+                (array_agg(pressure_value ORDER BY created_at))[1],
+                min(created_at),
+                (array_agg(pressure_value ORDER BY created_at DESC))[1],
+                max(created_at)
+            FROM tire_pressure.pressure_reading
+            {scope('created_at')}
+            GROUP BY 1, 3
+        """), params)
+        written += result.rowcount
+
+    db.session.commit()
+    return written
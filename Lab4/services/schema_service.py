@@ -0,0 +1,96 @@
+from db import db
+
+SCHEMA = 'tire_pressure'
+
+# Columns added to tables that db.create_all() does not alter once they exist:
+# (table, column, definition)
+ADDED_COLUMNS = [
+    ('pressure_reading', 'message_id', 'varchar(100)'),
+    ('tire', 'last_seen_at', 'timestamp with time zone'),
+    ('tire', 'last_pressure_value', 'numeric(5, 2)'),
+    ('tire', 'last_reading_at', 'timestamp with time zone'),
+    ('tire', 'last_reading_id', 'uuid'),
+    ('tire', 'leak_state_at', 'timestamp with time zone'),
+    ('tire', 'leak_weight', 'double precision'),
+    ('tire', 'leak_sum_t', 'double precision'),
+    ('tire', 'leak_sum_v', 'double precision'),
+    ('tire', 'leak_sum_tt', 'double precision'),
+    ('tire', 'leak_sum_tv', 'double precision'),
+    ('tire', 'leak_notified_at', 'timestamp with time zone'),
+    ('tire', 'alert_pending_type', 'varchar(50)'),
+    ('tire', 'alert_pending_count', 'integer'),
+    ('tire', 'alert_pending_since', 'timestamp with time zone'),
+    ('user', 'token_version', 'integer NOT NULL DEFAULT 0'),
+    ('alert_event', 'notification_id',
+     f'uuid REFERENCES {SCHEMA}.notification (notification_id) ON DELETE SET NULL'),
+]
+
+# Constraints and indexes on existing tables: (table, name, DDL)
+ADDED_CONSTRAINTS = [
+    ('pressure_reading', 'uq_pressure_reading_tire_message',
+     f'ALTER TABLE {SCHEMA}.pressure_reading ADD CONSTRAINT uq_pressure_reading_tire_message '
+     f'UNIQUE (tire_id, message_id)'),
+]
+ADDED_INDEXES = [
+    ('pressure_reading', 'ix_pressure_reading_tire_created',
+     f'CREATE INDEX IF NOT EXISTS ix_pressure_reading_tire_created '
+     f'ON {SCHEMA}.pressure_reading (tire_id, created_at, reading_id)'),
+]
+
+
+def upgrade() -> list[str]:
+    """
+    Add the columns, constraints and indexes missing from tables created by an older version, and commit.
+
+    Only missing objects are altered, so running it on an up to date database
+    takes no table locks. Concurrent callers (e.g. workers starting together)
+    are serialized with an advisory lock.
+
+    Returns:
+        list: Descriptions of the changes made
+    """
+    db.session.execute(db.text("SELECT pg_advisory_xact_lock(hashtext('tire_pressure.schema_upgrade'))"))
+
+    existing_tables = {
+        row[0] for row in db.session.execute(
+            db.text("SELECT table_name FROM information_schema.tables WHERE table_schema = :schema"),
+            {'schema': SCHEMA}
+        )
+    }
+    existing_columns = {
+        (row[0], row[1]) for row in db.session.execute(
+            db.text("SELECT table_name, column_name FROM information_schema.columns WHERE table_schema = :schema"),
+            {'schema': SCHEMA}
+        )
+    }
+    existing_constraints = {
+        row[0] for row in db.session.execute(
+            db.text("""
+                SELECT con.conname
+                FROM pg_constraint con
+                JOIN pg_namespace ns ON ns.oid = con.connamespace
+                WHERE ns.nspname = :schema
+            """),
+            {'schema': SCHEMA}
+        )
+    }
+
+    changes = []
+    for table, column, definition in ADDED_COLUMNS:
+        if table in existing_tables and (table, column) not in existing_columns:
+            db.session.execute(db.text(f'ALTER TABLE {SCHEMA}."{table}" ADD COLUMN "{column}" {definition}'))
+            changes.append(f"added {table}.{column}")
+
+    for table, name, ddl in ADDED_CONSTRAINTS:
+        if table in existing_tables and name not in existing_constraints:
+            db.session.execute(db.text(ddl))
+            changes.append(f"added constraint {name}")
+
+    for table, name, ddl in ADDED_INDEXES:
+        if table in existing_tables and \
+                db.session.execute(db.text("SELECT to_regclass(:name)"), {'name': f'{SCHEMA}.{name}'}).scalar() is None:
+            db.session.execute(db.text(ddl))
+            changes.append(f"added index {name}")
+
+    db.session.commit()
+    return changes
@@ -0,0 +1,237 @@
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from flask import current_app
+from sqlalchemy import event, insert, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from utils import JwtUtils
+from services import principal_cache
+from services.principal_cache import Principal
+
+ACCESS = 'access'
+REFRESH = 'refresh'
+# Minimal token version recorded for deleted users: none of their tokens is valid anymore
+DELETED_USER_VERSION = 2 ** 31 - 1
+
+# Revocation list of this worker, reloaded every TOKEN_REVOCATION_REFRESH_SECONDS
+_denied_jtis: set[str] = set()
+_min_versions: dict[uuid.UUID, int] = {}
+_loaded_at: Optional[float] = None
+_lock = threading.Lock()
+_reload_lock = threading.Lock()
+
+
+def issue_tokens(user) -> dict:
+    """
+    Issue a short-lived access token and a long-lived refresh token.
+
+    The access token carries everything needed to authorize a request (user_id,
+    role, token version), so authenticate() does not have to load the user.
+    """
+    config = current_app.config
+    claims = {'user_id': str(user.user_id), 'ver': user.token_version or 0}
+    access_token = JwtUtils.generate_jwt(
+        {**claims, 'type': ACCESS, 'role': user.role.role_name},
+        expires_in=config['ACCESS_TOKEN_TTL']
+    )
+    refresh_token = JwtUtils.generate_jwt({**claims, 'type': REFRESH}, expires_in=config['REFRESH_TOKEN_TTL'])
+    return {
+        'access_token': access_token,
+        'refresh_token': refresh_token,
+        'expires_in': config['ACCESS_TOKEN_TTL']
+    }
+
+
+def authenticate(token: str) -> Optional[Principal]:
+    """
+    Resolve an access token to its principal from the token claims alone.
+
+    Returns:
+        Principal or None if the user of a token without claims no longer exists
+
+    Raises:
+        ValueError: If the token is invalid, expired, revoked or not an access token
+    """
+    payload = JwtUtils.decode_jwt(token)
+    if payload.get('type') == REFRESH:
+        raise ValueError("Invalid token.")
+    check_not_revoked(payload)
+
+    if not {'type', 'ver', 'role'} & payload.keys():
+        # Tokens issued before claims were embedded expire within an hour
+        return principal_cache.get_principal(payload['user_id'])
+    if payload.get('type') != ACCESS or 'role' not in payload:
+        raise ValueError("Invalid token.")
+
+    # Tokens are only issued to users with a confirmed email
+    return Principal(uuid.UUID(payload['user_id']), payload['role'], True)
+
+
+def check_not_revoked(payload: dict) -> None:
+    """
+    Raises:
+        ValueError: If the token's jti or token version has been revoked
+    """
+    _reload_if_stale()
+    user_id = uuid.UUID(payload['user_id'])
+    with _lock:
+        revoked = payload.get('jti') in _denied_jtis or payload.get('ver', 0) < _min_versions.get(user_id, 0)
+    if revoked:
+        raise ValueError("Token has been revoked.")
+
+
+def refresh(refresh_token: str) -> dict:
+    """
+    Exchange a refresh token for a new token pair.
+
+    The refresh token is rotated: the used one is revoked, so a stolen copy
+    stops working once either party refreshes. Unlike authenticate(), this
+    reads the user, so role changes are picked up here.
+
+    Raises:
+        ValueError: If the token is invalid, expired, revoked or not a refresh token
+    """
+    from db import db
+    from models import User
+
+    payload = JwtUtils.decode_jwt(refresh_token)
+    if payload.get('type') != REFRESH:
+        raise ValueError("Invalid token.")
+    check_not_revoked(payload)
+
+    user = db.session.get(User, uuid.UUID(payload['user_id']))
+    if user is None or (user.token_version or 0) != payload.get('ver'):
+        raise ValueError("Token has been revoked.")
+
+    # A concurrent refresh with the same token may have revoked it since the check above
+    if not revoke_token(payload):
+        raise ValueError("Token has been revoked.")
+    tokens = issue_tokens(user)
+    db.session.commit()
+    return tokens
+
+
+def revoke_token(payload: dict) -> bool:
+    """
+    Revoke a single token in the current transaction without committing.
+
+    Returns:
+        bool: False if the token was revoked already
+
+    Raises:
+        ValueError: If the token has no jti, i.e. was issued before tokens could be revoked one by one
+    """
+    from db import db
+    from models import TokenRevocation
+
+    if not payload.get('jti') or 'exp' not in payload:
+        raise ValueError("Token cannot be revoked, log out from all devices instead.")
+
+    user_id = uuid.UUID(payload['user_id'])
+    inserted = db.session.execute(
+        pg_insert(TokenRevocation).values(
+            revocation_id=uuid.uuid4(),
+            user_id=user_id,
+            jti=payload['jti'],
+            expires_at=datetime.fromtimestamp(payload['exp'], tz=timezone.utc)
+        ).on_conflict_do_nothing(index_elements=[TokenRevocation.jti])
+    ).rowcount
+    _stage(db.session, user_id, payload['jti'], None)
+    return inserted > 0
+
+
+def revoke_user_tokens(connection, session, user_id, min_version: int) -> None:
+    """
+    Revoke all tokens of a user issued below min_version.
+
+    Meant for mapper events, so the row is written on the flushing connection.
+    It is kept for REFRESH_TOKEN_TTL, the lifetime of the longest-lived token.
+    """
+    from models import TokenRevocation
+
+    connection.execute(insert(TokenRevocation).values(
+        revocation_id=uuid.uuid4(),
+        user_id=user_id,
+        min_token_version=min_version,
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=current_app.config['REFRESH_TOKEN_TTL'])
+    ))
+    _stage(session, user_id, None, min_version)
+
+
+def purge_expired() -> int:
+    """Delete revocations whose tokens have expired, without committing."""
+    from db import db
+    from models import TokenRevocation
+
+    return db.session.execute(
+        delete(TokenRevocation).where(TokenRevocation.expires_at < datetime.now(timezone.utc))
+    ).rowcount
+
+
+def get_metrics() -> dict:
+    with _lock:
+        return {'denied_jtis': len(_denied_jtis), 'revoked_users': len(_min_versions)}
+
+
+def _reload_if_stale() -> None:
+    interval = current_app.config['TOKEN_REVOCATION_REFRESH_SECONDS']
+    if _loaded_at is not None and time.monotonic() - _loaded_at < interval:
+        return
+
+    # Until the first load every request waits; afterwards one thread reloads
+    # while the others keep using the current list
+    if not _reload_lock.acquire(blocking=_loaded_at is None):
+        return
+    try:
+        if _loaded_at is None or time.monotonic() - _loaded_at >= interval:
+            _reload()
+    finally:
+        _reload_lock.release()
+
+
+def _reload() -> None:
+    global _denied_jtis, _min_versions, _loaded_at
+    from db import db
+    from models import TokenRevocation
+
+    loaded_at = time.monotonic()
+    rows = db.session.query(TokenRevocation.user_id, TokenRevocation.jti, TokenRevocation.min_token_version) \
+        .filter(TokenRevocation.expires_at > datetime.now(timezone.utc)) \
+        .all()
+
+    denied_jtis, min_versions = set(), {}
+    for user_id, jti, min_version in rows:
+        if jti is not None:
+            denied_jtis.add(jti)
+        if min_version is not None:
+            min_versions[user_id] = max(min_version, min_versions.get(user_id, 0))
+
+    with _lock:
+        _denied_jtis, _min_versions, _loaded_at = denied_jtis, min_versions, loaded_at
+
+
+def _apply(user_id: uuid.UUID, jti: Optional[str], min_version: Optional[int]) -> None:
+    with _lock:
+        if jti is not None:
+            _denied_jtis.add(jti)
+        if min_version is not None:
+            _min_versions[user_id] = max(min_version, _min_versions.get(user_id, 0))
+
+
+def _stage(session, user_id, jti: Optional[str], min_version: Optional[int]) -> None:
+    """Apply a revocation to this worker's list once the session commits."""
+    session.info.setdefault('token_revocations', []).append((uuid.UUID(str(user_id)), jti, min_version))
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session) -> None:
+    for revocation in session.info.pop('token_revocations', ()):
+        _apply(*revocation)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session) -> None:
+    session.info.pop('token_revocations', None)
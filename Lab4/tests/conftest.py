@@ -0,0 +1,88 @@
+import os
+import sys
+import uuid
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def app():
+    if not os.environ.get('DATABASE_URL'):
+        pytest.skip("DATABASE_URL is not set; these tests need the application's PostgreSQL database")
+    from app import app
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture(scope='session')
+def engine(app):
+    from db import db
+    with app.app_context():
+        return db.engine
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def customer(app):
+    """
+    A confirmed customer with one vehicle of four tires, two notifications per tire.
+
+    Created in its own application context, so requests made by the tests start
+    with an empty session and every lazy load would show up as a statement.
+    """
+    from sqlalchemy import delete
+    from db import db
+    from models import User, Role, Vehicle, Tire, Notification
+    from services import token_service
+
+    with app.app_context():
+        role = Role.query.filter_by(role_name='customer').one()
+        user = User(
+            name='Query Count',
+            email=f"query-count-{uuid.uuid4().hex[:12]}@example.com",
+            email_confirmed=True,
+            role_id=role.role_id
+        )
+        db.session.add(user)
+        db.session.flush()
+
+        vehicle = Vehicle(user_id=user.user_id, make='Test', model='Counter', year=2020)
+        db.session.add(vehicle)
+        db.session.flush()
+
+        for label in ('FL', 'FR', 'RL', 'RR'):
+            tire = Tire(
+                vehicle_id=vehicle.vehicle_id,
+                label=label,
+                optimal_pressure=2.4,
+                pressure_unit='bar',
+                sensor_code=Tire.generate_sensor_code()
+            )
+            db.session.add(tire)
+            db.session.flush()
+            for index in range(2):
+                db.session.add(Notification(
+                    tire_id=tire.tire_id,
+                    title=f"Notification {index}",
+                    body=f"Tire {label}"
+                ))
+        db.session.commit()
+
+        data = {
+            'user_id': user.user_id,
+            'vehicle_id': vehicle.vehicle_id,
+            'token': token_service.issue_tokens(user)['access_token']
+        }
+        db.session.remove()
+
+    yield data
+
+    with app.app_context():
+        # Vehicles, tires and notifications go with the user (ON DELETE CASCADE)
+        db.session.execute(delete(User).where(User.user_id == data['user_id']))
+        db.session.commit()
@@ -0,0 +1,60 @@
+"""
+Statement budgets of read endpoints, so N+1 regressions fail the build.
+
+Every endpoint is called once before it is measured: the first request of a
+process loads the token revocation list and reference data.
+"""
+import pytest
+
+
+@pytest.fixture
+def assert_max_queries(engine):
+    from utils import assert_max_queries
+
+    return lambda limit: assert_max_queries(limit, engine)
+
+
+def _get(client, customer, path):
+    response = client.get(path, headers={'Authorization': f"Bearer {customer['token']}"})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_notifications_single_statement(client, customer, assert_max_queries):
+    _get(client, customer, '/notifications/limit?limit=10')
+
+    with assert_max_queries(1):
+        body = _get(client, customer, '/notifications/limit?limit=10')
+
+    assert len(body['notifications']) == 8
+    assert all(n['vehicle_id'] == str(customer['vehicle_id']) for n in body['notifications'])
+
+
+def test_vehicle_tires_single_statement(client, customer, assert_max_queries):
+    path = f"/vehicle_tires/vehicle?vehicle={customer['vehicle_id']}"
+    _get(client, customer, path)
+
+    with assert_max_queries(1):
+        body = _get(client, customer, path)
+
+    assert len(body['tires']) == 4
+
+
+def test_get_user_single_statement(client, customer, assert_max_queries):
+    _get(client, customer, '/profile')
+
+    with assert_max_queries(1):
+        _get(client, customer, '/profile')
+
+
+def test_get_user_by_id_single_statement(app, customer, assert_max_queries):
+    from models import User
+
+    with app.test_request_context():
+        User.get_user_by_id(str(customer['user_id']))
+
+    with app.test_request_context(), assert_max_queries(1):
+        response, status = User.get_user_by_id(str(customer['user_id']))
+
+    assert status == 200
+    assert response.get_json()['user_id'] == str(customer['user_id'])
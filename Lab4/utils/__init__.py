@@ -1,4 +1,5 @@
 from utils.error_handler import ErrorHandler
 from utils.validators import Validator
 from utils.jwt_utils import JwtUtils
+from utils.query_counter import QueryCounter, assert_max_queries
 from utils.auth_decorator import auth_required, role_required
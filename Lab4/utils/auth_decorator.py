@@ -1,11 +1,11 @@
 from functools import wraps
 from flask import request
-from utils import ErrorHandler, JwtUtils
+from utils import ErrorHandler
 from flask_login import current_user
+from services import token_service
 
 
 def auth_required(f):
-    from models import User
     @wraps(f)
     def decorated(*args, **kwargs):
         # Check if a token is provided (JWT)
@@ -16,13 +16,12 @@ def auth_required(f):
                 if token.startswith("Bearer "):
                     token = token.split(" ")[1]
 
-                # Decode the token and extract the payload
-                payload = JwtUtils.decode_jwt(token)
-                user = User.query.get(payload['user_id'])
+                # Authorize from the token claims, checked against the revocation list
+                user = token_service.authenticate(token)
                 if not user:
                     return ErrorHandler.handle_error(
                         None,
-                        message=f"User with ID '{payload['user_id']}' not found.",
+                        message="User of the token not found.",
                         status_code=404
                     )
 
@@ -54,7 +53,6 @@ def auth_required(f):
     return decorated
 
 def role_required(roles):
-    from models import User
     def decorator(f):
         @wraps(f)
         def decorated(*args, **kwargs):
@@ -65,16 +63,15 @@ def role_required(roles):
                     if token.startswith("Bearer "):
                         token = token.split(" ")[1]
 
-                    payload = JwtUtils.decode_jwt(token)
-                    user = User.query.get(payload['user_id'])
+                    user = token_service.authenticate(token)
                     if not user:
                         return ErrorHandler.handle_error(
                             None,
-                            message=f"User with ID '{payload['user_id']}' not found.",
+                            message="User of the token not found.",
                             status_code=404
                         )
 
-                    if user.role.role_name not in roles:
+                    if user.role_name not in roles:
                         return ErrorHandler.handle_error(
                             None,
                             message=f"User does not have the required role. Required roles: {roles}",
@@ -93,7 +90,7 @@ def role_required(roles):
                 return f(*args, **kwargs)
 
             if current_user.is_authenticated:
-                if current_user.role.role_name not in roles:
+                if current_user.role_name not in roles:
                     return ErrorHandler.handle_error(
                         None,
                         message=f"User does not have the required role. Required roles: {roles}",
@@ -1,4 +1,5 @@
 import jwt
+import uuid
 from flask import current_app
 from datetime import datetime, timedelta, timezone
 
@@ -7,8 +8,11 @@ class JwtUtils:
 
     @staticmethod
     def generate_jwt(payload, expires_in=3600):
-        expiration = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
-        payload['exp'] = expiration
+        now = datetime.now(timezone.utc)
+        payload['iat'] = now
+        payload['exp'] = now + timedelta(seconds=expires_in)
+        # Unique token ID, lets a single token be revoked
+        payload.setdefault('jti', str(uuid.uuid4()))
         token = jwt.encode(payload, current_app.config['SECRET_KEY'], algorithm='HS256')
         return token
 
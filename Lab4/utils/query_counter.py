@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """
+    Count the SQL statements executed on an engine while the context is active.
+
+    Example:
+        with app.app_context(), QueryCounter() as counter:
+            client.get('/vehicle_tires/vehicle?vehicle=...')
+        print(counter.count, counter.statements)
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self) -> 'QueryCounter':
+        if self.engine is None:
+            from db import db
+            self.engine = db.engine
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+
+@contextmanager
+def assert_max_queries(limit: int, engine=None):
+    """
+    Fail with AssertionError if the block executes more than limit SQL statements.
+
+    Meant for guarding endpoints against N+1 regressions, e.g.
+
+        with assert_max_queries(3):
+            client.get('/notifications/limit?limit=10')
+    """
+    with QueryCounter(engine) as counter:
+        yield counter
+    if counter.count > limit:
+        statements = "\n".join(f"  {i}. {s}" for i, s in enumerate(counter.statements, start=1))
+        raise AssertionError(f"Expected at most {limit} SQL statements, got {counter.count}:\n{statements}")
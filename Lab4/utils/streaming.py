@@ -0,0 +1,54 @@
+import json
+from typing import Any, Callable, Iterable, Optional
+from flask import Response, current_app, stream_with_context
+
+
+def wants_stream(value: Optional[str]) -> bool:
+    """Interpret a 'stream' query parameter ('1', 'true', 'yes')."""
+    return str(value or '').lower() in ('1', 'true', 'yes')
+
+
+def stream_json(envelope: dict, key: str, rows: Iterable, serialize: Callable[[Any], dict],
+                count_key: Optional[str] = None, status: int = 200) -> Response:
+    """
+    Send {**envelope, key: [serialize(row), ...]} as a chunked JSON response.
+
+    Rows are serialized one by one and flushed every STREAM_CHUNK_ROWS rows,
+    so memory stays bounded by the chunk size and the first bytes go out
+    before the whole result is read. Pass a query with yield_per() as rows to
+    fetch them through a server-side cursor. Since the length is only known
+    at the end, the count (if count_key is given) is written after the list.
+
+    Errors raised while streaming can no longer change the status code, so
+    run anything that may fail (validation, the query itself) beforehand.
+    """
+    chunk_rows = current_app.config['STREAM_CHUNK_ROWS']
+    head = json.dumps(envelope)[:-1] + (', ' if envelope else '') + json.dumps(key) + ': ['
+
+    def generate():
+        yield head
+        count = 0
+        chunk = []
+        for row in rows:
+            chunk.append(json.dumps(serialize(row)))
+            if len(chunk) >= chunk_rows:
+                yield (', ' if count else '') + ', '.join(chunk)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            yield (', ' if count else '') + ', '.join(chunk)
+            count += len(chunk)
+        yield ']' + (f', {json.dumps(count_key)}: {count}' if count_key else '') + '}'
+
+    return Response(stream_with_context(generate()), status=status, mimetype='application/json')
+
+
+def sse_message(data: dict, event: Optional[str] = None, event_id: Any = None) -> str:
+    """Format one Server-Sent Events message carrying data as JSON."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
@@ -1,5 +1,6 @@
+import math
 import re
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 
@@ -60,6 +61,42 @@ class Validator:
                 raise
             raise ValueError("Invalid birthday format. Use YYYY-MM-DD")
 
+    @staticmethod
+    def validate_timestamp(value: Optional[str]) -> Optional[datetime]:
+        """Parse an ISO 8601 timestamp, treating naive values as UTC."""
+        if value is None:
+            return None
+
+        try:
+            timestamp = datetime.fromisoformat(str(value))
+        except ValueError:
+            raise ValueError("Invalid timestamp format. Use ISO 8601")
+
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        try:
+            # Fails for the extremes of the datetime range, e.g. 0001-01-01T00:00:00+01:00
+            timestamp.astimezone(timezone.utc)
+        except OverflowError:
+            raise ValueError("Timestamp out of range")
+        return timestamp
+
+    @staticmethod
+    def validate_timestamp_window(timestamp: datetime, max_ahead: timedelta,
+                                  max_age: Optional[timedelta] = None) -> datetime:
+        """
+        Check that a timestamp is at most max_ahead in the future and, if given, at most max_age old.
+
+        Raises:
+            ValueError: If the timestamp is outside the window
+        """
+        now = datetime.now(timezone.utc)
+        if timestamp > now + max_ahead:
+            raise ValueError(f"Timestamp is more than {int(max_ahead.total_seconds())} seconds in the future")
+        if max_age is not None and timestamp < now - max_age:
+            raise ValueError(f"Timestamp is more than {max_age.days} days old")
+        return timestamp
+
     @staticmethod
     def validate_pressure(value: float | str, unit: str, desired_unit: str) -> float:
         """
@@ -80,8 +117,13 @@ class Validator:
             pressure = float(value)
         except (ValueError, TypeError):
             raise ValueError("Pressure must be a valid number")
+        if not math.isfinite(pressure):
+            raise ValueError("Pressure must be a valid number")
 
         if unit is None or desired_unit is None:
+            # Pressures are stored as Numeric(5, 2)
+            if not 0 < round(pressure, 2) < 1000:
+                raise ValueError("Pressure must be between 0 and 999.99")
             return pressure
 
         unit = unit.lower()
@@ -107,6 +149,8 @@ class Validator:
         if pressure_in_bar <= 0 or pressure_in_bar > 99.99:
             raise ValueError(f"Pressure in {unit} must be between 0 and 99.99 when converted to bar")
 
-        # Convert from bar to desired unit
+        # Convert from bar to desired unit; pressures are stored as Numeric(5, 2)
         converted_pressure = pressure_in_bar * from_bar[desired_unit]
+        if round(converted_pressure, 2) >= 1000:
+            raise ValueError(f"Pressure must be below 1000 when converted to {desired_unit}")
         return converted_pressure